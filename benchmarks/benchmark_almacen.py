@@ -0,0 +1,72 @@
+# Benchmark del almacén de datos: tiempo de carga del CSV con pd.read_csv contra
+# el Parquet del almacén (completo y proyectado a pocas columnas) a medida que
+# crece la historia, usando datos sintéticos con las columnas del dataset real.
+#
+# Ejecutar desde la raíz del repositorio:
+#   python -m benchmarks.benchmark_almacen [--filas 100 10000 100000]
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from servicios.almacen_datos import AlmacenDatos, nombre_dataset
+from servicios.registro_modelos import MODELOS_DIR
+
+DATASET = "dataset_LIMPIO_original.csv"
+
+# Columnas de un gráfico típico (fecha y dos variables)
+PROYECCION = ["Fecha", "RENTABILIDAD", "DOLAR OFICIAL $/US$"]
+
+
+def dataset_sintetico(n, semilla=0):
+    """Remuestrea el dataset real hasta n filas diarias, con ruido para que no se repita"""
+    rng = np.random.default_rng(semilla)
+    base = pd.read_csv(os.path.join(MODELOS_DIR, DATASET))
+    df = base.iloc[rng.integers(0, len(base), n)].reset_index(drop=True)
+    numericas = df.select_dtypes("number").columns
+    df[numericas] = df[numericas] * rng.normal(1, 0.01, (n, len(numericas)))
+    df["Fecha"] = pd.date_range("1950-01-01", periods=n, freq="D").strftime("%Y-%m-%d")
+    return df
+
+
+def medir(funcion, repeticiones=3):
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CSV contra almacén Parquet")
+    parser.add_argument("--filas", type=int, nargs="+", default=[100, 10000, 100000])
+    args = parser.parse_args()
+
+    print(f"{'Filas':>8} | {'CSV (KB)':>9} | {'Parquet (KB)':>12} | {'read_csv (ms)':>13} | "
+          f"{'Parquet todo (ms)':>17} | {'Parquet 3 col (ms)':>18}")
+    print("-" * 94)
+    for n in args.filas:
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta_csv = os.path.join(directorio, DATASET)
+            dataset_sintetico(n).to_csv(ruta_csv, index=False)
+            almacen = AlmacenDatos(os.path.join(directorio, "datos"), directorio)
+            almacen.asegurar(DATASET)
+            nombre = nombre_dataset(DATASET)
+
+            t_csv = medir(lambda: pd.read_csv(ruta_csv))
+            # Un almacén nuevo en cada medición: el almacén guarda las tablas ya leídas
+            datos_dir = os.path.join(directorio, "datos")
+            t_todo = medir(lambda: AlmacenDatos(datos_dir, directorio).leer(nombre))
+            t_proyectado = medir(lambda: AlmacenDatos(datos_dir, directorio).leer(nombre, PROYECCION))
+            tamaño_parquet = almacen.info(nombre).tamaño_bytes
+
+            print(f"{n:>8} | {os.path.getsize(ruta_csv) / 1024:>9.0f} | {tamaño_parquet / 1024:>12.0f} | "
+                  f"{t_csv * 1000:>13.1f} | {t_todo * 1000:>17.1f} | {t_proyectado * 1000:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
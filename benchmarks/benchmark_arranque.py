@@ -0,0 +1,122 @@
+# Benchmark de arranque en frío: tiempo de importación del primer render de la app.
+# Corre main.py una vez con AppTest en un proceso nuevo bajo `python -X importtime`
+# y suma el tiempo propio de cada módulo importado durante ese render (los que ya
+# trae el arnés de pruebas de Streamlit quedan afuera). Falla si se supera el
+# presupuesto guardado o si aparece alguna librería prohibida en el arranque.
+#
+# Ejecutar desde la raíz del repositorio:
+#   python -m benchmarks.benchmark_arranque [--repeticiones 3] [--actualizar-presupuesto]
+import argparse
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+ARCHIVO_PRESUPUESTO = os.path.join(os.path.dirname(__file__), "presupuesto_arranque.json")
+
+# Se imprime entre el arnés y el render para separar sus importaciones
+MARCA = "@@MILKCAST_INICIO_RENDER@@"
+
+SCRIPT_RENDER = f"""
+import sys
+from streamlit.testing.v1 import AppTest
+sys.stderr.write("{MARCA}\\n")
+sys.stderr.flush()
+at = AppTest.from_file("main.py", default_timeout=300).run()
+sys.exit(1 if at.exception else 0)
+"""
+
+PRESUPUESTO_POR_DEFECTO = {
+    # Tiempo total de importación permitido para el primer render y margen por ruido
+    "total_ms": None,
+    "tolerancia": 0.25,
+    # Librerías que no deben cargarse para mostrar la app
+    "prohibidos": ["matplotlib", "seaborn"],
+}
+
+
+def medir_importaciones(raiz="."):
+    """Devuelve {módulo: tiempo propio en ms} de las importaciones del primer render"""
+    entorno = dict(os.environ, PYTHONPATH=os.path.abspath(raiz))
+    proceso = subprocess.run([sys.executable, "-X", "importtime", "-c", SCRIPT_RENDER],
+                             cwd=raiz, env=entorno, capture_output=True, text=True)
+    if proceso.returncode != 0:
+        raise RuntimeError(f"El render de la app falló:\n{proceso.stderr[-2000:]}")
+
+    lineas = proceso.stderr.splitlines()
+    if MARCA not in lineas:
+        raise RuntimeError("No se encontró la marca de inicio del render en la salida")
+
+    modulos = {}
+    for linea in lineas[lineas.index(MARCA) + 1:]:
+        if not linea.startswith("import time:") or "cumulative" in linea:
+            continue
+        propio, _, nombre = linea[len("import time:"):].split("|", 2)
+        modulos[nombre.strip()] = int(propio) / 1000
+    return modulos
+
+
+def por_paquete(modulos):
+    """Tiempo propio agregado por paquete de primer nivel"""
+    totales = defaultdict(float)
+    for nombre, ms in modulos.items():
+        totales[nombre.split(".")[0]] += ms
+    return dict(sorted(totales.items(), key=lambda item: -item[1]))
+
+
+def leer_presupuesto():
+    try:
+        with open(ARCHIVO_PRESUPUESTO, encoding="utf-8") as f:
+            return {**PRESUPUESTO_POR_DEFECTO, **json.load(f)}
+    except (OSError, ValueError):
+        return dict(PRESUPUESTO_POR_DEFECTO)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Presupuesto de importaciones del arranque en frío")
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--actualizar-presupuesto", action="store_true",
+                        help="guarda la medición actual como nuevo presupuesto")
+    args = parser.parse_args()
+
+    # Se toma la repetición más rápida: el ruido solo suma tiempo
+    mediciones = [medir_importaciones() for _ in range(args.repeticiones)]
+    modulos = min(mediciones, key=lambda m: sum(m.values()))
+    total_ms = sum(modulos.values())
+    paquetes = por_paquete(modulos)
+
+    print(f"Módulos importados en el primer render: {len(modulos)}")
+    print(f"Tiempo total de importación: {total_ms:.0f} ms (mejor de {args.repeticiones})")
+    print("Paquetes más costosos:")
+    for paquete, ms in list(paquetes.items())[:10]:
+        print(f"  {paquete:<24} {ms:>8.0f} ms")
+
+    presupuesto = leer_presupuesto()
+    if args.actualizar_presupuesto:
+        presupuesto["total_ms"] = round(total_ms)
+        with open(ARCHIVO_PRESUPUESTO, "w", encoding="utf-8") as f:
+            json.dump(presupuesto, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        print(f"✅ Presupuesto actualizado: {presupuesto['total_ms']} ms")
+        return 0
+
+    errores = []
+    prohibidos = [p for p in presupuesto["prohibidos"] if p in paquetes]
+    if prohibidos:
+        errores.append(f"se importan librerías prohibidas en el arranque: {', '.join(prohibidos)}")
+    if presupuesto["total_ms"]:
+        limite = presupuesto["total_ms"] * (1 + presupuesto["tolerancia"])
+        if total_ms > limite:
+            errores.append(f"{total_ms:.0f} ms supera el presupuesto de {presupuesto['total_ms']} ms "
+                           f"(+{presupuesto['tolerancia']:.0%} = {limite:.0f} ms)")
+
+    for error in errores:
+        print(f"❌ {error}")
+    if not errores:
+        print("✅ Arranque dentro del presupuesto")
+    return 1 if errores else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,307 @@
+# Benchmark de carga: varias sesiones simuladas de la app con AppTest, sin navegador.
+# Cada sesión recorre las pestañas en un orden al azar y en cada una hace lo que haría
+# un productor: completa las entradas con valores al azar y pulsa sus botones (predecir,
+# sensibilidad, pronosticar), pasa de página en las tablas de datos o cambia el modelo
+# de lotes. Cada acción es un rerun completo de main.py, como en el servidor.
+#
+# AppTest no admite reruns simultáneos en un mismo proceso (reemplaza globales de
+# Streamlit en cada corrida), así que dentro de un proceso las sesiones se intercalan
+# de a una acción por turno, compartiendo cachés y modelos como en una instancia real;
+# con --procesos se corren varias instancias a la vez que compiten por la CPU.
+#
+# Mide la latencia de cada rerun (p50/p95/p99 por acción), el rendimiento (reruns por
+# segundo de todas las instancias), la memoria propia que agrega cada sesión y las
+# etapas más lentas de la telemetría. Los resultados se guardan por commit en
+# benchmarks/resultados_carga/ y se comparan con la corrida anterior.
+#
+# Ejecutar desde la raíz del repositorio:
+#   python -m benchmarks.benchmark_carga [--sesiones 8] [--procesos 1] [--pensamiento 30]
+#                                        [--comparar <commit o archivo>] [--no-guardar]
+import argparse
+import datetime
+import glob
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+DIRECTORIO_RESULTADOS = os.path.join(os.path.dirname(__file__), "resultados_carga")
+
+CUANTILES = (0.5, 0.95, 0.99)
+
+SCRIPT_INSTANCIA = """
+import json, sys
+from benchmarks.benchmark_carga import simular_instancia
+print(json.dumps(simular_instancia(int(sys.argv[1]), int(sys.argv[2]))))
+"""
+
+
+def memoria_kb():
+    """Memoria anónima (propia) del proceso en KB"""
+    with open("/proc/self/status") as f:
+        for linea in f:
+            if linea.startswith("RssAnon:"):
+                return int(linea.split()[1])
+    return 0
+
+
+def plan_sesion(at, rng):
+    """Acciones de una sesión: las pestañas de la app en orden al azar"""
+    pestañas = [tab.label for tab in at.tabs]
+    return [pestañas[i] for i in rng.permutation(len(pestañas))]
+
+
+def acciones_pestaña(at, etiqueta, rng):
+    """Genera (acción, función que prepara el rerun) para los widgets de la pestaña"""
+    pestaña = next(tab for tab in at.tabs if tab.label == etiqueta)
+    entradas = [n for n in pestaña.number_input if not (n.key or "").startswith("pagina_")]
+    botones = [b.key for b in pestaña.button]
+    if botones:
+        for clave in botones:
+            def preparar(at, clave=clave, claves_entradas=[n.key for n in entradas]):
+                # Entradas nuevas en cada envío: las predicciones no salen de la caché
+                for clave_entrada in claves_entradas:
+                    entrada = at.number_input(key=clave_entrada)
+                    valor = round(float(rng.uniform(1, 1000)), 2)
+                    if entrada.min is not None:
+                        valor = max(valor, entrada.min)
+                    if entrada.max is not None:
+                        valor = min(valor, entrada.max)
+                    entrada.set_value(valor)
+                at.button(key=clave).click()
+            yield clave.replace("boton_", ""), preparar
+    elif any((n.key or "").startswith("pagina_") for n in pestaña.number_input):
+        for n in pestaña.number_input:
+            if (n.key or "").startswith("pagina_") and (n.max or 1) > 1:
+                def preparar(at, clave=n.key):
+                    entrada = at.number_input(key=clave)
+                    entrada.set_value(int(rng.integers(1, (entrada.max or 1) + 1)))
+                yield "pagina_tabla", preparar
+    elif pestaña.selectbox:
+        def preparar(at, clave=pestaña.selectbox[0].key):
+            selector = at.selectbox(key=clave)
+            selector.select_index(int(rng.integers(len(selector.options))))
+        yield f"cambiar_{pestaña.selectbox[0].key}", preparar
+
+
+def simular_instancia(sesiones, semilla):
+    """Corre las sesiones intercaladas en este proceso y devuelve sus mediciones"""
+    from streamlit.testing.v1 import AppTest
+    from servicios.telemetria import obtener_telemetria
+
+    rng = np.random.default_rng(semilla)
+    memoria_inicial = memoria_kb()
+
+    # Primera sesión: importaciones, lectura de datos, modelos y figuras del proceso
+    inicio = time.perf_counter()
+    calentamiento = AppTest.from_file("main.py", default_timeout=300).run()
+    arranque_s = time.perf_counter() - inicio
+    memoria_base = memoria_kb()
+    obtener_telemetria().reiniciar()
+
+    latencias = {}
+    errores = {}
+
+    def rerun(at, accion, preparar=None):
+        if preparar:
+            preparar(at)
+        inicio = time.perf_counter()
+        at.run()
+        latencias.setdefault(accion, []).append(time.perf_counter() - inicio)
+        if at.exception:
+            errores[accion] = errores.get(accion, 0) + 1
+
+    inicio_carga = time.perf_counter()
+    apps = []
+    for _ in range(sesiones):
+        at = AppTest.from_file("main.py", default_timeout=300)
+        rerun(at, "primer_render")
+        apps.append(at)
+    pendientes = [plan_sesion(at, rng) for at in apps]
+
+    # Una acción por sesión y por turno hasta que todas recorren todas las pestañas
+    while any(pendientes):
+        for at, plan in zip(apps, pendientes):
+            if plan:
+                for accion, preparar in list(acciones_pestaña(at, plan.pop(0), rng)):
+                    rerun(at, accion, preparar)
+    duracion_s = time.perf_counter() - inicio_carga
+
+    # La sesión de calentamiento sigue viva: la diferencia es solo de las sesiones simuladas
+    memoria_sesiones = memoria_kb() - memoria_base
+    etapas = sorted(obtener_telemetria().resumen(), key=lambda r: -r.suma_s)[:10]
+    return {
+        "arranque_s": arranque_s,
+        "duracion_s": duracion_s,
+        "latencias_s": latencias,
+        "errores": errores,
+        "memoria_base_kb": memoria_base - memoria_inicial,
+        "memoria_sesiones_kb": memoria_sesiones,
+        "sesiones": sesiones,
+        "etapas": [{"etapa": r.etapa, "etiquetas": r.etiquetas, "total": r.total, "suma_s": r.suma_s,
+                    "p95_ms": r.p95 * 1000} for r in etapas],
+    }
+
+
+def medir(sesiones, procesos, raiz="."):
+    """Arranca las instancias a la vez y devuelve sus mediciones"""
+    entorno = dict(os.environ, PYTHONPATH=os.path.abspath(raiz))
+    instancias = [subprocess.Popen([sys.executable, "-c", SCRIPT_INSTANCIA, str(sesiones), str(semilla)],
+                                   cwd=raiz, env=entorno, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+                  for semilla in range(procesos)]
+    resultados = []
+    for instancia in instancias:
+        salida, error = instancia.communicate()
+        if instancia.returncode != 0:
+            raise RuntimeError(f"Una instancia de la app falló:\n{error[-2000:]}")
+        resultados.append(json.loads(salida.strip().splitlines()[-1]))
+    return resultados
+
+
+def percentiles_ms(latencias):
+    return dict(zip(("p50", "p95", "p99"), (float(v) * 1000 for v in np.quantile(latencias, CUANTILES))))
+
+
+def resumir(resultados, pensamiento_s):
+    """Agrega las mediciones de todas las instancias"""
+    por_accion = {}
+    for resultado in resultados:
+        for accion, latencias in resultado["latencias_s"].items():
+            por_accion.setdefault(accion, []).extend(latencias)
+    todas = [l for accion, latencias in por_accion.items() if accion != "primer_render" for l in latencias]
+    reruns = sum(len(latencias) for latencias in por_accion.values())
+    # Las instancias corren a la vez: el rendimiento se toma sobre la más lenta
+    duracion_s = max(r["duracion_s"] for r in resultados)
+    rendimiento = reruns / duracion_s
+    sesiones = sum(r["sesiones"] for r in resultados)
+    errores = {}
+    for resultado in resultados:
+        for accion, cantidad in resultado["errores"].items():
+            errores[accion] = errores.get(accion, 0) + cantidad
+    return {
+        "reruns": reruns,
+        "duracion_s": duracion_s,
+        "reruns_por_s": rendimiento,
+        # Ley de Little: usuarios que sostiene la máquina si cada uno hace una acción cada
+        # pensamiento_s segundos (con las CPU saturadas; la latencia crece antes de llegar)
+        "usuarios_estimados": rendimiento * pensamiento_s,
+        "latencia_ms": percentiles_ms(todas),
+        "por_accion": {accion: {"n": len(latencias), **percentiles_ms(latencias)}
+                       for accion, latencias in sorted(por_accion.items())},
+        "arranque_s": float(np.median([r["arranque_s"] for r in resultados])),
+        "memoria_base_mb": float(np.median([r["memoria_base_kb"] for r in resultados])) / 1024,
+        "memoria_por_sesion_mb": sum(r["memoria_sesiones_kb"] for r in resultados) / sesiones / 1024,
+        "errores": errores,
+        "etapas": resultados[0]["etapas"],
+    }
+
+
+def commit_actual():
+    """Commit corto (con '+' si hay cambios sin commitear)"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                check=True).stdout.strip()
+        cambios = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"],
+                                 capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "sin-git"
+    return commit + ("+" if cambios else "")
+
+
+def guardar(resultado):
+    os.makedirs(DIRECTORIO_RESULTADOS, exist_ok=True)
+    ruta = os.path.join(DIRECTORIO_RESULTADOS, f"{resultado['commit']}.json")
+    with open(ruta, "w", encoding="utf-8") as f:
+        json.dump(resultado, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+    return ruta
+
+
+def anterior(referencia, commit):
+    """Resultado guardado a comparar: el indicado o el más reciente de otro commit"""
+    if referencia:
+        ruta = referencia if os.path.exists(referencia) else os.path.join(DIRECTORIO_RESULTADOS, f"{referencia}.json")
+        with open(ruta, encoding="utf-8") as f:
+            return json.load(f)
+    guardados = []
+    for ruta in glob.glob(os.path.join(DIRECTORIO_RESULTADOS, "*.json")):
+        with open(ruta, encoding="utf-8") as f:
+            guardado = json.load(f)
+        if guardado.get("commit") != commit:
+            guardados.append(guardado)
+    return max(guardados, key=lambda g: g["fecha"], default=None)
+
+
+def imprimir(resultado, previo):
+    r = resultado["resumen"]
+    print(f"Commit {resultado['commit']}: {resultado['sesiones']} sesiones × {resultado['procesos']} instancias, "
+          f"{r['reruns']} reruns en {r['duracion_s']:.1f} s")
+    print(f"\n{'Acción':<28} | {'n':>4} | {'p50 (ms)':>9} | {'p95 (ms)':>9} | {'p99 (ms)':>9}")
+    print("-" * 71)
+    for accion, m in r["por_accion"].items():
+        print(f"{accion:<28} | {m['n']:>4} | {m['p50']:>9.0f} | {m['p95']:>9.0f} | {m['p99']:>9.0f}")
+    print("\nEtapas con más tiempo acumulado (primera instancia):")
+    for etapa in r["etapas"][:5]:
+        detalle = ", ".join(f"{k}={v}" for k, v in etapa["etiquetas"].items())
+        print(f"  {etapa['etapa']:<16} {detalle:<34} {etapa['suma_s']:>7.2f} s  p95 {etapa['p95_ms']:>7.1f} ms")
+    if r["errores"]:
+        print(f"\n❌ Reruns con excepción: {r['errores']}")
+
+    filas = [
+        ("Latencia p50 (ms)", r["latencia_ms"]["p50"], lambda g: g["latencia_ms"]["p50"]),
+        ("Latencia p95 (ms)", r["latencia_ms"]["p95"], lambda g: g["latencia_ms"]["p95"]),
+        ("Latencia p99 (ms)", r["latencia_ms"]["p99"], lambda g: g["latencia_ms"]["p99"]),
+        ("Reruns por segundo", r["reruns_por_s"], lambda g: g["reruns_por_s"]),
+        (f"Usuarios ({resultado['pensamiento_s']:.0f} s entre acciones)", r["usuarios_estimados"],
+         lambda g: g["usuarios_estimados"]),
+        ("Memoria por sesión (MB)", r["memoria_por_sesion_mb"], lambda g: g["memoria_por_sesion_mb"]),
+        ("Memoria de la instancia (MB)", r["memoria_base_mb"], lambda g: g["memoria_base_mb"]),
+        ("Arranque (s)", r["arranque_s"], lambda g: g["arranque_s"]),
+    ]
+    print(f"\n{'Métrica':<32} | {'Actual':>10} | {'Anterior':>10} | {'Cambio':>8}")
+    print("-" * 70)
+    for nombre, valor, de_previo in filas:
+        if previo:
+            valor_previo = de_previo(previo["resumen"])
+            cambio = f"{(valor / valor_previo - 1):+.0%}" if valor_previo else "-"
+            print(f"{nombre:<32} | {valor:>10.2f} | {valor_previo:>10.2f} | {cambio:>8}")
+        else:
+            print(f"{nombre:<32} | {valor:>10.2f} | {'-':>10} | {'-':>8}")
+    if previo:
+        print(f"(anterior: commit {previo['commit']}, {previo['sesiones']} sesiones × {previo['procesos']} instancias)")
+        if (previo["sesiones"], previo["procesos"]) != (resultado["sesiones"], resultado["procesos"]):
+            print("⚠️ La corrida anterior usó otra cantidad de sesiones o instancias: las cifras no son comparables")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sesiones simuladas de la app: latencia, rendimiento y memoria")
+    parser.add_argument("--sesiones", type=int, default=8, help="sesiones por instancia")
+    parser.add_argument("--procesos", type=int, default=1, help="instancias de la app corriendo a la vez")
+    parser.add_argument("--pensamiento", type=float, default=30.0,
+                        help="segundos entre acciones de un usuario (para estimar usuarios soportados)")
+    parser.add_argument("--comparar", help="commit o archivo de resultados contra el cual comparar")
+    parser.add_argument("--no-guardar", action="store_true")
+    args = parser.parse_args()
+
+    resultados = medir(args.sesiones, args.procesos)
+    resultado = {
+        "commit": commit_actual(),
+        "fecha": datetime.datetime.now().isoformat(timespec="seconds"),
+        "sesiones": args.sesiones,
+        "procesos": args.procesos,
+        "pensamiento_s": args.pensamiento,
+        "maquina": {"cpus": os.cpu_count(), "python": platform.python_version(), "sistema": platform.platform()},
+        "resumen": resumir(resultados, args.pensamiento),
+    }
+    imprimir(resultado, anterior(args.comparar, resultado["commit"]))
+    if not args.no_guardar:
+        print(f"\n💾 Resultados guardados en {guardar(resultado)}")
+    return 1 if resultado["resumen"]["errores"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+# Benchmark del formato de los modelos: carga de los nueve modelos en un proceso
+# nuevo desde los .pkl (pickle + sklearn) contra el formato nativo (JSON + .npy en
+# memory map). Mide el tiempo total de carga con las importaciones que arrastra,
+# la memoria anónima (propia de cada proceso) y la respaldada por archivo (páginas
+# compartidas entre los procesos que abren los mismos .npy), y si se importó sklearn.
+#
+# Ejecutar desde la raíz del repositorio (con los modelos convertidos:
+# python -m servicios.formato_modelos):
+#   python -m benchmarks.benchmark_formato_modelos [--repeticiones 3]
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+SCRIPT_CARGA = """
+import json, sys, time
+
+def memoria():
+    campos = {}
+    with open("/proc/self/status") as f:
+        for linea in f:
+            clave, _, valor = linea.partition(":")
+            if clave in ("RssAnon", "RssFile"):
+                campos[clave] = int(valor.split()[0])
+    return campos
+
+antes = memoria()
+inicio = time.perf_counter()
+from servicios.registro_modelos import CATALOGO_MODELOS, RegistroModelos
+from servicios.motor_prediccion import MotorPrediccion
+registro = RegistroModelos(usar_nativo=sys.argv[1] == "nativo")
+for modelo_id in CATALOGO_MODELOS:
+    motor = MotorPrediccion.desde_modelo(modelo_id, registro.obtener(modelo_id))
+    motor.predecir_lote([[1.0] * len(motor.features)])
+duracion = time.perf_counter() - inicio
+despues = memoria()
+print(json.dumps({
+    "tiempo_ms": duracion * 1000,
+    "anonima_kb": despues["RssAnon"] - antes["RssAnon"],
+    "archivo_kb": despues["RssFile"] - antes["RssFile"],
+    "sklearn": "sklearn" in sys.modules,
+    "formatos": sorted({e.formato for e in registro.estadisticas()}),
+}))
+"""
+
+
+def medir(formato, raiz="."):
+    """Carga los nueve modelos y arma sus motores en un proceso nuevo"""
+    entorno = dict(os.environ, PYTHONPATH=os.path.abspath(raiz))
+    proceso = subprocess.run([sys.executable, "-c", SCRIPT_CARGA, formato], cwd=raiz, env=entorno,
+                             capture_output=True, text=True)
+    if proceso.returncode != 0:
+        raise RuntimeError(f"La carga con formato {formato} falló:\n{proceso.stderr[-2000:]}")
+    return json.loads(proceso.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Carga de modelos: pickle contra formato nativo")
+    parser.add_argument("--repeticiones", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'Formato':<8} | {'Carga (ms)':>10} | {'Anónima (KB)':>12} | {'Archivo (KB)':>12} | {'sklearn':>7} | Leídos como")
+    print("-" * 78)
+    for formato in ("pickle", "nativo"):
+        # Se informa la mediana de las repeticiones
+        mediciones = sorted((medir(formato) for _ in range(args.repeticiones)), key=lambda m: m["tiempo_ms"])
+        m = mediciones[len(mediciones) // 2]
+        print(f"{formato:<8} | {m['tiempo_ms']:>10.0f} | {m['anonima_kb']:>12,} | {m['archivo_kb']:>12,} | "
+              f"{'sí' if m['sklearn'] else 'no':>7} | {', '.join(m['formatos'])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+# Benchmark de memoria y latencia con varias réplicas en la misma máquina:
+#   pickle: cada proceso deserializa los nueve .pkl (como el @st.cache_resource original)
+#   nativo: cada proceso abre el formato nativo en memory map (páginas compartidas)
+#   host:   un único proceso carga los modelos y las réplicas predicen por socket Unix
+# Cada réplica carga los modelos, hace predicciones de una fila con entradas al azar
+# y, con todas las réplicas vivas a la vez, informa su PSS (memoria residente con las
+# páginas compartidas repartidas entre los procesos que las usan). En modo host se
+# suma el PSS del host.
+#
+# Ejecutar desde la raíz del repositorio:
+#   python -m benchmarks.benchmark_host_modelos [--replicas 1 2 4 8] [--predicciones 300]
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+SOCKET_BENCHMARK = "/tmp/milkcast-benchmark-host.sock"
+
+SCRIPT_REPLICA = """
+import json, sys, time
+import numpy as np
+
+modo, predicciones = sys.argv[1], int(sys.argv[2])
+inicio = time.perf_counter()
+from servicios.registro_modelos import CATALOGO_MODELOS, RegistroModelos
+from servicios.motor_prediccion import MotorPrediccion
+registro = RegistroModelos(usar_nativo=modo != "pickle", host=sys.argv[3] if modo == "host" else None)
+motores = [MotorPrediccion.desde_modelo(m, registro.obtener(m)) for m in CATALOGO_MODELOS]
+carga_s = time.perf_counter() - inicio
+
+# Predicciones de una fila sin pasar por la caché (entradas siempre distintas)
+rng = np.random.default_rng()
+latencias = []
+for i in range(predicciones):
+    motor = motores[i % len(motores)]
+    fila = rng.uniform(1, 100, size=(1, len(motor.features)))
+    t = time.perf_counter()
+    motor.predecir_lote(fila)
+    latencias.append(time.perf_counter() - t)
+
+print("listo", flush=True)
+sys.stdin.readline()
+from benchmarks.benchmark_host_modelos import pss_kb
+print(json.dumps({"carga_ms": carga_s * 1000, "latencia_us": float(np.median(latencias)) * 1e6,
+                  "pss_kb": pss_kb("self")}), flush=True)
+"""
+
+
+def pss_kb(pid):
+    """PSS del proceso en KB (/proc/<pid>/smaps_rollup)"""
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for linea in f:
+            if linea.startswith("Pss:"):
+                return int(linea.split()[1])
+    return 0
+
+
+def iniciar_host(raiz, entorno):
+    host = subprocess.Popen([sys.executable, "-m", "servicios.host_modelos", "--socket", SOCKET_BENCHMARK],
+                            cwd=raiz, env=entorno, stdout=subprocess.PIPE, text=True)
+    # El host imprime una línea cuando terminó de cargar los modelos
+    if not host.stdout.readline():
+        raise RuntimeError("El host de modelos no pudo iniciarse")
+    return host
+
+
+def medir(modo, replicas, predicciones, raiz="."):
+    """Arranca las réplicas a la vez y devuelve sus mediciones (y el PSS del host)"""
+    entorno = dict(os.environ, PYTHONPATH=os.path.abspath(raiz))
+    entorno.pop("MILKCAST_HOST_MODELOS", None)
+    host = iniciar_host(raiz, entorno) if modo == "host" else None
+    try:
+        procesos = [subprocess.Popen([sys.executable, "-c", SCRIPT_REPLICA, modo, str(predicciones), SOCKET_BENCHMARK],
+                                     cwd=raiz, env=entorno, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+                    for _ in range(replicas)]
+        for proceso in procesos:
+            if proceso.stdout.readline().strip() != "listo":
+                raise RuntimeError(f"Una réplica en modo {modo} falló")
+        # Todas vivas: se mide la memoria a la vez
+        pss_host = pss_kb(host.pid) if host else 0
+        for proceso in procesos:
+            proceso.stdin.write("medir\n")
+            proceso.stdin.flush()
+        resultados = [json.loads(proceso.stdout.readline()) for proceso in procesos]
+        for proceso in procesos:
+            proceso.wait()
+        return resultados, pss_host
+    finally:
+        if host:
+            host.terminate()
+            host.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Modelos por proceso contra host compartido")
+    parser.add_argument("--replicas", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--predicciones", type=int, default=300)
+    args = parser.parse_args()
+
+    print(f"{'Modo':<7} | {'Réplicas':>8} | {'PSS réplica (MB)':>16} | {'PSS host (MB)':>13} | "
+          f"{'PSS total (MB)':>14} | {'Carga (ms)':>10} | {'Predicción (µs)':>15}")
+    print("-" * 103)
+    for modo in ("pickle", "nativo", "host"):
+        for replicas in args.replicas:
+            inicio = time.perf_counter()
+            resultados, pss_host = medir(modo, replicas, args.predicciones)
+            pss_replica = sum(r["pss_kb"] for r in resultados) / replicas / 1024
+            carga = sorted(r["carga_ms"] for r in resultados)[replicas // 2]
+            latencia = sorted(r["latencia_us"] for r in resultados)[replicas // 2]
+            print(f"{modo:<7} | {replicas:>8} | {pss_replica:>16.1f} | {pss_host / 1024:>13.1f} | "
+                  f"{pss_replica * replicas + pss_host / 1024:>14.1f} | {carga:>10.0f} | {latencia:>15.0f}"
+                  f"   ({time.perf_counter() - inicio:.1f} s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# Benchmark de lectura de CSV con líneas mal formadas: la cascada anterior de
+# cargar_csv_seguro (lectura normal que falla, separador automático con el motor
+# python, reintento con comillas) contra la lectura en una pasada de lector_csv.
+#
+# Ejecutar desde la raíz del repositorio:
+#   python -m benchmarks.benchmark_lector_csv [--filas 10000 200000] [--malas 3]
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from servicios.lector_csv import leer_csv
+
+
+def csv_con_lineas_malas(ruta, filas, malas, semilla=0):
+    """CSV con algunas líneas con campos de más"""
+    rng = np.random.default_rng(semilla)
+    pd.DataFrame(rng.random((filas, 8))).round(4).to_csv(ruta, index=False)
+    with open(ruta, encoding='utf-8') as f:
+        lineas = f.read().splitlines()
+    for i in rng.choice(np.arange(1, filas), malas, replace=False):
+        lineas[i] += ',1,2'
+    with open(ruta, 'w', encoding='utf-8') as f:
+        f.write("\n".join(lineas) + "\n")
+
+
+def cascada_anterior(ruta):
+    """Los intentos que hacía cargar_csv_seguro hasta obtener un DataFrame"""
+    try:
+        return pd.read_csv(ruta)
+    except pd.errors.ParserError:
+        pass
+    try:
+        return pd.read_csv(ruta, sep=None, engine='python', on_bad_lines='skip')
+    except Exception:
+        pass
+    return pd.read_csv(ruta, sep=',', on_bad_lines='skip', quoting=1)
+
+
+def medir(funcion):
+    inicio = time.perf_counter()
+    resultado = funcion()
+    return resultado, time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cascada de carga contra lectura en una pasada")
+    parser.add_argument("--filas", type=int, nargs="+", default=[10000, 200000])
+    parser.add_argument("--malas", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'Filas':>8} | {'Cascada (ms)':>12} | {'Una pasada (ms)':>15} | {'Filas leídas':>12} | {'Cuarentena':>10}")
+    print("-" * 70)
+    for n in args.filas:
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = os.path.join(directorio, "datos.csv")
+            csv_con_lineas_malas(ruta, n, args.malas)
+            _, t_cascada = medir(lambda: cascada_anterior(ruta))
+            resultado, t_pasada = medir(lambda: leer_csv(ruta))
+            print(f"{n:>8} | {t_cascada * 1000:>12.0f} | {t_pasada * 1000:>15.0f} | "
+                  f"{len(resultado.df):>12} | {len(resultado.descartadas):>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# Benchmark del gráfico "Evolución de la Rentabilidad" (componente_eda).
+# Mide el tiempo de armado de la figura y el tamaño del JSON que se envía al
+# navegador para distintas cantidades de meses, comparando la versión actual
+# (una traza de barras coloreada por máscara) con la anterior (un shape por mes).
+#
+# Ejecutar desde la raíz del repositorio:
+#   python -m benchmarks.benchmark_rentabilidad [--filas 100 10000 100000] [--max-filas-legacy 100]
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from componentes.componente_eda import construir_figura_rentabilidad
+
+# La versión con un shape por mes crece en forma cuadrática (cada add_shape
+# revalida la lista completa): con 500 meses ya tarda más de un minuto
+MAX_FILAS_LEGACY = 100
+
+
+def figura_legacy(meses, rentabilidad):
+    """Versión anterior: la figura actual sin la traza de barras y un add_shape por mes"""
+    fig = construir_figura_rentabilidad(meses, rentabilidad)
+    fig.data = fig.data[1:]
+    valores = np.asarray(rentabilidad, dtype=float)
+    for i in range(len(valores)):
+        color = 'rgba(46, 139, 87, 0.1)' if valores[i] >= 0 else 'rgba(220, 20, 60, 0.1)'
+        fig.add_shape(type="rect", x0=i - 0.4, x1=i + 0.4, y0=0, y1=valores[i],
+                      fillcolor=color, line=dict(width=0), layer="below")
+    return fig
+
+
+def datos_sinteticos(n, semilla=0):
+    """Serie mensual de rentabilidad con tramos positivos y negativos"""
+    rng = np.random.default_rng(semilla)
+    meses = pd.date_range("1900-01-01", periods=n, freq="D").strftime("%Y-%m-%d")
+    rentabilidad = np.sin(np.arange(n) / 6) * 0.3 + rng.normal(0, 0.1, n)
+    return meses, rentabilidad
+
+
+def medir(constructor, meses, rentabilidad):
+    inicio = time.perf_counter()
+    fig = constructor(meses, rentabilidad)
+    tiempo_armado = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    payload = fig.to_json()
+    tiempo_json = time.perf_counter() - inicio
+    return tiempo_armado, tiempo_json, len(payload.encode("utf-8"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--filas", type=int, nargs="+", default=[100, 10000, 100000])
+    parser.add_argument("--max-filas-legacy", type=int, default=MAX_FILAS_LEGACY)
+    args = parser.parse_args()
+
+    # Calentar imports de plotly/scipy para no medirlos en la primera fila
+    construir_figura_rentabilidad(*datos_sinteticos(10)).to_json()
+
+    print(f"{'Filas':>8} | {'Versión':<8} | {'Armado (ms)':>12} | {'to_json (ms)':>12} | {'Payload (KB)':>12}")
+    print("-" * 66)
+    for n in args.filas:
+        meses, rentabilidad = datos_sinteticos(n)
+        versiones = [("actual", construir_figura_rentabilidad)]
+        if n <= args.max_filas_legacy:
+            versiones.append(("legacy", figura_legacy))
+        for nombre, constructor in versiones:
+            armado, json_s, tamaño = medir(constructor, meses, rentabilidad)
+            print(f"{n:>8} | {nombre:<8} | {armado * 1000:>12.1f} | {json_s * 1000:>12.1f} | {tamaño / 1024:>12.1f}")
+        if n > args.max_filas_legacy:
+            print(f"{n:>8} | {'legacy':<8} | {'omitido (crece en forma cuadrática)':>42}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# Benchmark de la tabla paginada: bytes que se envían al navegador mostrando el
+# dataset completo (como hacía st.dataframe) contra una página con las columnas
+# por defecto, y tiempo de la consulta ordenada y filtrada en el servidor.
+#
+# Ejecutar desde la raíz del repositorio:
+#   python -m benchmarks.benchmark_tabla [--filas 100 10000 100000]
+import argparse
+import time
+
+import pyarrow as pa
+
+from benchmarks.benchmark_almacen import dataset_sintetico
+from servicios.tabla_paginada import FiltroRango, consultar_pagina
+
+COLUMNAS_VISIBLES = 8
+
+
+def bytes_arrow(df):
+    """Tamaño del DataFrame serializado en Arrow IPC (el formato que usa st.dataframe)"""
+    sumidero = pa.BufferOutputStream()
+    tabla = pa.Table.from_pandas(df, preserve_index=False)
+    with pa.ipc.new_stream(sumidero, tabla.schema) as escritor:
+        escritor.write_table(tabla)
+    return sumidero.getvalue().size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tabla completa contra página servida")
+    parser.add_argument("--filas", type=int, nargs="+", default=[100, 10000, 100000])
+    args = parser.parse_args()
+
+    print(f"{'Filas':>8} | {'Completa (KB)':>13} | {'Página (KB)':>11} | {'Orden (ms)':>10} | {'Orden + filtro (ms)':>19}")
+    print("-" * 74)
+    for n in args.filas:
+        df = dataset_sintetico(n)
+        df["Fecha"] = df["Fecha"].astype("datetime64[ns]")
+        tabla = pa.Table.from_pandas(df, preserve_index=False)
+        columnas = tabla.column_names[:COLUMNAS_VISIBLES]
+
+        inicio = time.perf_counter()
+        pagina = consultar_pagina(tabla, columnas, orden="Fecha", descendente=True)
+        t_orden = time.perf_counter() - inicio
+        filtro = FiltroRango("RENTABILIDAD", 0.0, float(df["RENTABILIDAD"].max()))
+        inicio = time.perf_counter()
+        consultar_pagina(tabla, columnas, orden="Fecha", descendente=True, filtro=filtro, pagina=2)
+        t_filtro = time.perf_counter() - inicio
+
+        print(f"{n:>8} | {bytes_arrow(df) / 1024:>13.0f} | {bytes_arrow(pagina.datos) / 1024:>11.1f} | "
+              f"{t_orden * 1000:>10.1f} | {t_filtro * 1000:>19.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+def C_metricas_backtest(modelo_id):
+    import streamlit as st
+    from servicios.backtest import info_backtest, leer_resultados
+
+    # Métricas fuera de muestra del último backtest (python -m servicios.backtest)
+    resultado = leer_resultados().get(modelo_id)
+    if resultado is None:
+        st.write("**R² (backtest):** sin calcular")
+        st.caption("Ejecute `python -m servicios.backtest` para medir el modelo con origen móvil.")
+        return
+
+    st.write(f"**R² (backtest):** {resultado.r2:.6f}")
+    st.write(f"**MAE (backtest):** {resultado.mae:,.4f} · **MAPE:** {resultado.mape:.2f}%")
+    st.caption(
+        f"Origen móvil: {resultado.pliegues} meses ({resultado.desde} a {resultado.hasta}) predichos por el modelo "
+        f"reajustado solo con los meses anteriores · {info_backtest().get('fecha', '')}"
+    )
@@ -1,13 +1,20 @@
 def C_clasificacion(model2):
     import streamlit as st
-    import numpy as np
-    import pickle
+    from servicios.motor_prediccion import obtener_motor
+    from componentes.componente_backtest import C_metricas_backtest
 
     st.header("Prediccion en base a precio Leche Entera, Queso y Yogur")
 
     # Descripción
     st.write("Introducir el valor de Leche Entera, Queso y Yogur para predecir el valor del litro de leche, intente introducir un valor que cuente con decimales.")
 
+    # Información del modelo
+    with st.expander("ℹ️ Información del Modelo"):
+        st.write("**Tipo de modelo:** Regresión Lineal")
+        st.write("**Variables utilizadas:** Leche Entera, Queso y Yogur")
+        st.write("**Variable objetivo:** Precio/litro Nacional - SIGLeA")
+        C_metricas_backtest("productos")
+
     # Crear dos columnas para el input
     col1, col2, col3 = st.columns(3)
 
@@ -44,13 +51,10 @@ def C_clasificacion(model2):
         if  LECHE_COMUN < 0 or QUESO < 0 or YOGUR < 0:
             st.error("Por favor, ingrese valores válidos (positivos) para IPC y Dólar.")
         else:
-            # Preparar los datos para el modelo
-            datos_entrada = np.array([[LECHE_COMUN, QUESO, YOGUR]])  # Los valores deben estar en un array bidimensional
-
-            # Hacer la predicción
+            # Hacer la predicción con el motor compartido
             try:
-                prediccion = model2.predict(datos_entrada)  # Hacer la predicción usando el modelo
-                st.success(f"🔮 El precio predicho de la leche es: **${prediccion[0]:,.2f}**")
+                prediccion = obtener_motor("productos", model2).predecir([LECHE_COMUN, QUESO, YOGUR])
+                st.success(f"🔮 El precio predicho de la leche es: **${prediccion:,.2f}**")
             except Exception as e:
                 st.error(f"Error en la predicción: {e}")
 
@@ -1,7 +1,8 @@
 def C_costos(model_B):
     import streamlit as st
-    import numpy as np
-    import pandas as pd
+    from servicios.motor_prediccion import obtener_motor
+    from componentes.componente_sensibilidad import C_sensibilidad
+    from componentes.componente_backtest import C_metricas_backtest
     
     st.header("💰 Predicción de Costos")
     
@@ -12,7 +13,7 @@ def C_costos(model_B):
     with st.expander("ℹ️ Información del Modelo"):
         st.write("**Tipo de Modelo:** RandomForest")
         st.write("**Preprocesamiento:** Datos Originales (sin estandarización)")
-        st.write("**R² Esperado:** 0.999726")
+        C_metricas_backtest("B")
         st.write("**Variables utilizadas:**")
         st.write("- Promedio del sector")
         st.write("- RELACION LECHE/MAIZ") 
@@ -80,32 +81,12 @@ def C_costos(model_B):
             help="IPC con cobertura nacional"
         )
     
-    # Función para hacer predicción con manejo correcto del scaler
-    def hacer_prediccion_costos(modelo_completo, valores):
-        # Crear DataFrame con nombres de columnas correctos
-        feature_names = ['Promedio del sector', 'RELACION LECHE/MAIZ', 'IPIM Nivel General - INDEC',
-                        'DOLAR OFICIAL $/US$', 'RELACION VAQUILLONA AL PARIR - LECHE', 'IPC - INDEC CoberNac']
-        df_entrada = pd.DataFrame([valores], columns=feature_names)
-        
-        # Aplicar preprocesamiento si es necesario
-        if modelo_completo.get('scaler') is not None:
-            st.info("✅ Aplicando preprocesamiento")
-            datos_procesados = modelo_completo['scaler'].transform(df_entrada)
-            # Convertir de vuelta a DataFrame para mantener nombres de columnas
-            datos_procesados = pd.DataFrame(datos_procesados, columns=feature_names)
-        else:
-            st.info("✅ Usando datos originales (sin preprocesamiento - no se estandarizan ni se normalizan)")
-            datos_procesados = df_entrada
-        
-        # Hacer predicción
-        prediccion = modelo_completo['modelo'].predict(datos_procesados)
-        return prediccion[0]
+    # Valores en el orden de las variables del modelo
+    valores = [promedio_sector, relacion_leche_maiz, ipim_general, dolar_oficial, relacion_vaquillona_leche, ipc_cobernac]
     
     # Botón para realizar predicción
     if st.button("🔮 Predecir Costos", key="boton_costos"):
         # Validar que no haya valores negativos
-        valores = [promedio_sector, relacion_leche_maiz, ipim_general, dolar_oficial, relacion_vaquillona_leche, ipc_cobernac]
-        
         if any(v < 0 for v in valores):
             st.error("❌ Por favor, ingrese solo valores positivos.")
         elif any(v == 0 for v in valores):
@@ -115,7 +96,12 @@ def C_costos(model_B):
                 # Verificar si el modelo es el formato completo PKL o solo el modelo sklearn
                 if isinstance(model_B, dict) and 'modelo' in model_B:
                     # Es el formato completo PKL
-                    prediccion = hacer_prediccion_costos(model_B, valores)
+                    motor = obtener_motor("B", model_B)
+                    if motor.escalado:
+                        st.info("✅ Aplicando preprocesamiento")
+                    else:
+                        st.info("✅ Usando datos originales (sin preprocesamiento - no se estandarizan ni se normalizan)")
+                    prediccion = motor.predecir(valores)
                     st.success(f"💰 **Costo Predicho: ${prediccion:.6f}**")
                     
                     # Mostrar detalles adicionales
@@ -135,9 +121,8 @@ def C_costos(model_B):
                 else:
                     # Es solo el modelo sklearn (formato antiguo)
                     st.warning("⚠️ Modelo en formato legacy. Aplicando predicción directa.")
-                    datos_entrada = np.array([valores])
-                    prediccion = model_B.predict(datos_entrada)
-                    st.success(f"💰 **Costo Predicho: ${prediccion[0]:.6f}**")
+                    prediccion = obtener_motor("B", model_B).predecir(valores)
+                    st.success(f"💰 **Costo Predicho: ${prediccion:.6f}**")
                 
                 # Interpretación de resultados
                 st.subheader("📈 Interpretación")
@@ -163,6 +148,9 @@ def C_costos(model_B):
                     st.write("**Tipo de modelo:**", type(model_B))
                     st.write("**Detalles del error:**", str(e))
     
+    # Sensibilidad alrededor de los valores ingresados
+    C_sensibilidad("B", model_B, valores)
+    
     # Mostrar información adicional
     st.subheader("💡 Consejos de Uso")
     st.info("""
@@ -1,19 +1,33 @@
-def C_visualizacion(df, df2):
+def C_visualizacion(df, df2, imagenes=None, huella_datos=None, datasets=("archivo", "dataset_LIMPIO_original")):
+    # Solo lo que se usa en cada render: las figuras importan plotly al armarse (y
+    # solo si no están en la caché), así el primer render no paga matplotlib ni seaborn
     import os
     import streamlit as st
-    import pandas as pd
-    import pickle
-    import numpy as np
-    import plotly.express as px
-    import matplotlib.pyplot as plt
-    import plotly.graph_objects as go
-    import seaborn as sns
-    from sklearn.preprocessing import MinMaxScaler
-    from scipy import interpolate
-    from scipy.ndimage import uniform_filter1d
+    from servicios.cache_figuras import huella_dataframes, obtener_cache_figuras
+    from servicios.telemetria import obtener_telemetria
+    from componentes.componente_tabla import C_tabla_paginada
 
     imagenes_dir = "imagenes"
 
+    # Las figuras se arman una vez por versión de los datos que usan y se comparten
+    # entre sesiones: si cambia un solo dataset, solo se rearman sus figuras
+    cache_figuras = obtener_cache_figuras()
+    telemetria = obtener_telemetria()
+    huellas = huella_datos or (huella_dataframes(df), huella_dataframes(df2))
+    figuras_mostradas = []
+
+    def mostrar_figura(nombre, constructor, *datos):
+        usados = [i for i, d in enumerate((df, df2)) if any(d is x for x in datos)]
+        huella = "".join(huellas[i] for i in usados)
+        # Todas las figuras muestran la historia completa de sus datasets
+        dependencias = {datasets[i]: None for i in usados}
+        with telemetria.medir("figura.obtener", figura=nombre):
+            cacheada, desde_cache = cache_figuras.obtener(nombre, huella, constructor, dependencias)
+        figuras_mostradas.append((nombre, cacheada, desde_cache))
+        # Serialización de la figura para el navegador
+        with telemetria.medir("figura.enviar", figura=nombre):
+            st.plotly_chart(cacheada.figura, use_container_width=True)
+
     st.header("Visualización de Datos sobre la Producción Lechera")
 
     st.markdown(
@@ -44,22 +58,24 @@ def C_visualizacion(df, df2):
     )
 
     st.header("Datos Iniciales:")
-    # Mostrar datos más recientes primero - ordenados por índice descendente
-    df_sorted = df.iloc[::-1].reset_index(drop=True)
-    
-    # Configurar altura fija para mantener consistencia visual
-    st.dataframe(df_sorted, height=400, use_container_width=True)
+    # Solo la página visible y las columnas elegidas se envían al navegador;
+    # orden y filtro se resuelven en el servidor sobre el almacén (más recientes primero)
+    with telemetria.medir("tabla.pagina", tabla="datos_iniciales"):
+        C_tabla_paginada(datasets[0], df, clave="datos_iniciales")
 
     st.header("Gráficos Ilustrativos:")
 
     # Mostrar las imágenes en columnas (una al lado de la otra)
     col1, col2 = st.columns(2)
 
+    # Si el arranque ya leyó las imágenes a memoria, usarlas sin volver a abrir los archivos
+    imagenes = imagenes or {}
+
     with col1:
-        st.image(os.path.join(imagenes_dir, "mapa.png"), caption="Mapa de Unidades Productivas", use_container_width=True)
+        st.image(imagenes.get("mapa.png", os.path.join(imagenes_dir, "mapa.png")), caption="Mapa de Unidades Productivas", use_container_width=True)
 
     with col2:
-        st.image(os.path.join(imagenes_dir, "grafico.png"), caption="Gráfico de Barras", use_container_width=True)
+        st.image(imagenes.get("grafico.png", os.path.join(imagenes_dir, "grafico.png")), caption="Gráfico de Barras", use_container_width=True)
 
     st.markdown(
         '''
@@ -79,52 +95,8 @@ def C_visualizacion(df, df2):
         unsafe_allow_html=True
     )
 
-    # Variables específicas
-    x = df['Mes']
-    y = df['EXPORTACIONES             toneladas/mes']
-
-    # Ordenar por Mes si es necesario (opcional)
-    # df = df.sort_values('Mes')  
-
-    # Calcular promedio móvil (suavizado)
-    smoothed_y = uniform_filter1d(y, size=3)  # Puedes ajustar el tamaño de la ventana
-
-    # Crear figura
-    fig = go.Figure()
-
-    # Barras
-    fig.add_trace(go.Bar(
-        x=x,
-        y=y,
-        name="Exportaciones",
-        marker_color='blue',
-        width=0.6  # Opcional: controla el ancho de barras
-    ))
-
-    # Línea suavizada
-    fig.add_trace(go.Scatter(
-        x=x,
-        y=smoothed_y,
-        mode='lines',
-        name='Tendencia (Promedio Móvil)',
-        line=dict(color='red', width=2)
-    ))
-
-    # Layout
-    fig.update_layout(
-        title=dict(
-            text="Exportaciones por Mes",
-            x=0.5,
-            xanchor='center'
-        ),
-        xaxis=dict(title="Mes"),
-        yaxis=dict(title="Toneladas Exportadas"),
-        bargap=0.2,
-        template="plotly_white"
-    )
-
-    # Mostrar en Streamlit
-    st.plotly_chart(fig, use_container_width=True)
+    # Gráfico de exportaciones (armado una sola vez por versión de los datos)
+    mostrar_figura("exportaciones", lambda: construir_figura_exportaciones(df['Mes'], df['EXPORTACIONES             toneladas/mes']), df)
 
     st.markdown(
         '''
@@ -168,89 +140,10 @@ def C_visualizacion(df, df2):
     
     if rentabilidad_col and dataset_usado is not None:
         # Crear el gráfico de rentabilidad
-        fig_rentabilidad = go.Figure()
-        
-        # Línea principal de rentabilidad
-        fig_rentabilidad.add_trace(go.Scatter(
-            x=dataset_usado[mes_col] if isinstance(mes_col, str) else mes_col,
-            y=dataset_usado[rentabilidad_col],
-            mode='lines+markers',
-            name='Rentabilidad',
-            line=dict(color='#2E8B57', width=3),
-            marker=dict(size=6, color='#2E8B57'),
-            hovertemplate='<b>Mes:</b> %{x}<br><b>Rentabilidad:</b> %{y:.4f}<extra></extra>'
-        ))
-        
-        # Línea de referencia en 0 (punto de equilibrio)
-        fig_rentabilidad.add_hline(
-            y=0, 
-            line_dash="dash", 
-            line_color="red", 
-            annotation_text="Punto de Equilibrio",
-            annotation_position="bottom right"
-        )
-        
-        # Calcular promedio móvil para suavizar
-        try:
-            rentabilidad_suavizada = uniform_filter1d(dataset_usado[rentabilidad_col], size=3)
-            fig_rentabilidad.add_trace(go.Scatter(
-                x=dataset_usado[mes_col] if isinstance(mes_col, str) else mes_col,
-                y=rentabilidad_suavizada,
-                mode='lines',
-                name='Tendencia (Promedio Móvil)',
-                line=dict(color='#FF6B35', width=2, dash='dot'),
-                opacity=0.8
-            ))
-        except:
-            pass  # Si no se puede calcular el promedio móvil, continuar sin él
-        
-        # Configurar layout
-        fig_rentabilidad.update_layout(
-            title=dict(
-                text="Evolución de la Rentabilidad del Sector Lácteo",
-                x=0.5,
-                xanchor='center',
-                font=dict(size=16, color='#2F4F4F')
-            ),
-            xaxis=dict(
-                title="Período",
-                gridcolor='lightgray',
-                gridwidth=0.5
-            ),
-            yaxis=dict(
-                title="Rentabilidad",
-                gridcolor='lightgray',
-                gridwidth=0.5,
-                zeroline=True,
-                zerolinecolor='red',
-                zerolinewidth=1
-            ),
-            template="plotly_white",
-            height=500,
-            hovermode='x unified',
-            legend=dict(
-                orientation="h",
-                yanchor="bottom",
-                y=1.02,
-                xanchor="right",
-                x=1
-            )
-        )
-        
-        # Colorear el área según rentabilidad positiva/negativa
-        rentabilidad_values = dataset_usado[rentabilidad_col].values
-        for i in range(len(rentabilidad_values)):
-            color = 'rgba(46, 139, 87, 0.1)' if rentabilidad_values[i] >= 0 else 'rgba(220, 20, 60, 0.1)'
-            fig_rentabilidad.add_shape(
-                type="rect",
-                x0=i-0.4, x1=i+0.4,
-                y0=0, y1=rentabilidad_values[i],
-                fillcolor=color,
-                line=dict(width=0),
-                layer="below"
-            )
-        
-        st.plotly_chart(fig_rentabilidad, use_container_width=True)
+        mostrar_figura("rentabilidad", lambda: construir_figura_rentabilidad(
+            dataset_usado[mes_col] if isinstance(mes_col, str) else mes_col,
+            dataset_usado[rentabilidad_col]
+        ), dataset_usado)
         
         # Análisis estadístico de la rentabilidad
         col_stats1, col_stats2, col_stats3, col_stats4 = st.columns(4)
@@ -317,6 +210,8 @@ def C_visualizacion(df, df2):
         if 'Precio/litro Nacional - SIGLeA' in df.columns and 'COSTO' in df.columns:
             st.write("**Análisis alternativo: Relación Precio vs Costo**")
             
+            import plotly.graph_objects as go
+
             fig_alt = go.Figure()
             fig_alt.add_trace(go.Scatter(
                 x=df['Mes'],
@@ -380,81 +275,8 @@ def C_visualizacion(df, df2):
     
     if len(variables_macro_disponibles) >= 2:
         # Crear el gráfico con múltiples ejes Y
-        fig_macro = go.Figure()
-        
-        # Configurar colores y ejes
-        colors = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728']
-        y_axes = ['y', 'y2', 'y3', 'y4']
-        
-        for i, (col_name, dataset, display_name, color) in enumerate(variables_macro_disponibles[:4]):
-            mes_col = 'Mes' if 'Mes' in dataset.columns else dataset.index
-            
-            fig_macro.add_trace(go.Scatter(
-                x=dataset[mes_col] if isinstance(mes_col, str) else mes_col,
-                y=dataset[col_name],
-                mode='lines+markers',
-                name=display_name,
-                line=dict(color=color, width=2.5),
-                marker=dict(size=4),
-                yaxis=y_axes[i] if i < len(y_axes) else 'y',
-                hovertemplate=f'<b>{display_name}:</b> %{{y:.2f}}<br><b>Período:</b> %{{x}}<extra></extra>'
-            ))
-        
-        # Configurar layout con múltiples ejes Y
-        layout_config = {
-            'title': dict(
-                text="Evolución de Variables Macroeconómicas Clave",
-                x=0.5,
-                xanchor='center',
-                font=dict(size=16, color='#2F4F4F')
-            ),
-            'xaxis': dict(
-                title="Período",
-                gridcolor='lightgray',
-                gridwidth=0.5
-            ),
-            'template': "plotly_white",
-            'height': 500,
-            'hovermode': 'x unified',
-            'legend': dict(
-                orientation="h",
-                yanchor="bottom",
-                y=1.02,
-                xanchor="right",
-                x=1
-            )
-        }
-        
-        # Configurar ejes Y según el número de variables
-        if len(variables_macro_disponibles) >= 1:
-            layout_config['yaxis'] = dict(
-                title=variables_macro_disponibles[0][2],
-                side="left",
-                showgrid=True,
-                gridcolor='lightgray',
-                gridwidth=0.5
-            )
-        
-        if len(variables_macro_disponibles) >= 2:
-            layout_config['yaxis2'] = dict(
-                title=variables_macro_disponibles[1][2],
-                side="right",
-                overlaying="y",
-                showgrid=False
-            )
-        
-        if len(variables_macro_disponibles) >= 3:
-            layout_config['yaxis3'] = dict(
-                title=variables_macro_disponibles[2][2],
-                side="left",
-                overlaying="y",
-                position=0.05,
-                showgrid=False
-            )
-        
-        fig_macro.update_layout(**layout_config)
-        
-        st.plotly_chart(fig_macro, use_container_width=True)
+        mostrar_figura("macro", lambda: construir_figura_macro(variables_macro_disponibles),
+                       *[datos for _, datos, _, _ in variables_macro_disponibles])
         
         # Análisis estadístico de correlaciones simples
         st.markdown("### 🔍 Análisis de Relaciones")
@@ -535,12 +357,22 @@ def C_visualizacion(df, df2):
     else:
         st.info("ℹ️ Las variables macroeconómicas principales (IPC, Dólar, Precio de Leche) no están completamente disponibles en el dataset actual. Este análisis se mostrará cuando los datos incluyan estas variables clave.")
 
+    # Tiempo de armado de cada figura (la primera vez) y si esta visita la tomó de la caché
+    with st.expander("⏱️ Rendimiento de los gráficos"):
+        columnas_figuras = st.columns(max(len(figuras_mostradas), 1))
+        for columna, (nombre, cacheada, desde_cache) in zip(columnas_figuras, figuras_mostradas):
+            with columna:
+                st.metric(
+                    f"Armado: {nombre}",
+                    f"{cacheada.tiempo_armado_s * 1000:.1f} ms",
+                    "♻️ desde caché" if desde_cache else "🆕 armado ahora",
+                    delta_color="off"
+                )
+                st.caption(f"Datos: {cacheada.tamaño_datos / 1024:.1f} KB · usos: {cacheada.usos}")
+
     st.header("Datos Ampliados:")
-    # Mostrar datos más recientes primero - ordenados por índice descendente
-    df2_sorted = df2.iloc[::-1].reset_index(drop=True)
-    
-    # Configurar altura fija para mantener consistencia visual
-    st.dataframe(df2_sorted, height=400, use_container_width=True)
+    with telemetria.medir("tabla.pagina", tabla="datos_ampliados"):
+        C_tabla_paginada(datasets[1], df2, clave="datos_ampliados")
 
     st.markdown("""
     ## **Consideraciones**:
@@ -576,3 +408,229 @@ def C_visualizacion(df, df2):
 
 
             
+
+
+
+def construir_figura_rentabilidad(meses, rentabilidad):
+    """Gráfico de evolución de la rentabilidad con las barras de fondo coloreadas por signo"""
+    import numpy as np
+    import plotly.graph_objects as go
+
+    valores = np.asarray(rentabilidad, dtype=float)
+    fig_rentabilidad = go.Figure()
+
+    # Colorear el área según rentabilidad positiva/negativa: una sola traza de barras
+    # con el color elegido por máscara (en lugar de un shape por mes). El color va
+    # como 0/1 sobre una escala de dos colores, que plotly valida sin recorrer fila por fila
+    fig_rentabilidad.add_trace(go.Bar(
+        x=meses,
+        y=valores,
+        marker=dict(color=(valores >= 0).astype(np.int8), cmin=0, cmax=1,
+                    colorscale=[[0, 'rgba(220, 20, 60, 0.1)'], [1, 'rgba(46, 139, 87, 0.1)']],
+                    line=dict(width=0)),
+        hoverinfo='skip',
+        showlegend=False
+    ))
+
+    # Línea principal de rentabilidad
+    fig_rentabilidad.add_trace(go.Scatter(
+        x=meses,
+        y=valores,
+        mode='lines+markers',
+        name='Rentabilidad',
+        line=dict(color='#2E8B57', width=3),
+        marker=dict(size=6, color='#2E8B57'),
+        hovertemplate='<b>Mes:</b> %{x}<br><b>Rentabilidad:</b> %{y:.4f}<extra></extra>'
+    ))
+
+    # Línea de referencia en 0 (punto de equilibrio)
+    fig_rentabilidad.add_hline(
+        y=0,
+        line_dash="dash",
+        line_color="red",
+        annotation_text="Punto de Equilibrio",
+        annotation_position="bottom right"
+    )
+
+    # Calcular promedio móvil para suavizar
+    try:
+        rentabilidad_suavizada = promedio_movil(valores, ventana=3)
+        fig_rentabilidad.add_trace(go.Scatter(
+            x=meses,
+            y=rentabilidad_suavizada,
+            mode='lines',
+            name='Tendencia (Promedio Móvil)',
+            line=dict(color='#FF6B35', width=2, dash='dot'),
+            opacity=0.8
+        ))
+    except Exception:
+        pass  # Si no se puede calcular el promedio móvil, continuar sin él
+
+    # Configurar layout
+    fig_rentabilidad.update_layout(
+        title=dict(
+            text="Evolución de la Rentabilidad del Sector Lácteo",
+            x=0.5,
+            xanchor='center',
+            font=dict(size=16, color='#2F4F4F')
+        ),
+        xaxis=dict(
+            title="Período",
+            gridcolor='lightgray',
+            gridwidth=0.5
+        ),
+        yaxis=dict(
+            title="Rentabilidad",
+            gridcolor='lightgray',
+            gridwidth=0.5,
+            zeroline=True,
+            zerolinecolor='red',
+            zerolinewidth=1
+        ),
+        template="plotly_white",
+        height=500,
+        hovermode='x unified',
+        bargap=0.2,
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1
+        )
+    )
+    return fig_rentabilidad
+
+
+def construir_figura_exportaciones(x, y):
+    """Gráfico de exportaciones por mes con su promedio móvil"""
+    import plotly.graph_objects as go
+
+    # Calcular promedio móvil (suavizado)
+    smoothed_y = promedio_movil(y, ventana=3)  # Puedes ajustar el tamaño de la ventana
+
+    # Crear figura
+    fig = go.Figure()
+
+    # Barras
+    fig.add_trace(go.Bar(
+        x=x,
+        y=y,
+        name="Exportaciones",
+        marker_color='blue',
+        width=0.6  # Opcional: controla el ancho de barras
+    ))
+
+    # Línea suavizada
+    fig.add_trace(go.Scatter(
+        x=x,
+        y=smoothed_y,
+        mode='lines',
+        name='Tendencia (Promedio Móvil)',
+        line=dict(color='red', width=2)
+    ))
+
+    # Layout
+    fig.update_layout(
+        title=dict(
+            text="Exportaciones por Mes",
+            x=0.5,
+            xanchor='center'
+        ),
+        xaxis=dict(title="Mes"),
+        yaxis=dict(title="Toneladas Exportadas"),
+        bargap=0.2,
+        template="plotly_white"
+    )
+
+    return fig
+
+
+def construir_figura_macro(variables_macro_disponibles):
+    """Gráfico de variables macroeconómicas con un eje Y por variable"""
+    import plotly.graph_objects as go
+
+    fig_macro = go.Figure()
+
+    # Configurar colores y ejes
+    colors = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728']
+    y_axes = ['y', 'y2', 'y3', 'y4']
+
+    for i, (col_name, dataset, display_name, color) in enumerate(variables_macro_disponibles[:4]):
+        mes_col = 'Mes' if 'Mes' in dataset.columns else dataset.index
+
+        fig_macro.add_trace(go.Scatter(
+            x=dataset[mes_col] if isinstance(mes_col, str) else mes_col,
+            y=dataset[col_name],
+            mode='lines+markers',
+            name=display_name,
+            line=dict(color=color, width=2.5),
+            marker=dict(size=4),
+            yaxis=y_axes[i] if i < len(y_axes) else 'y',
+            hovertemplate=f'<b>{display_name}:</b> %{{y:.2f}}<br><b>Período:</b> %{{x}}<extra></extra>'
+        ))
+
+    # Configurar layout con múltiples ejes Y
+    layout_config = {
+        'title': dict(
+            text="Evolución de Variables Macroeconómicas Clave",
+            x=0.5,
+            xanchor='center',
+            font=dict(size=16, color='#2F4F4F')
+        ),
+        'xaxis': dict(
+            title="Período",
+            gridcolor='lightgray',
+            gridwidth=0.5
+        ),
+        'template': "plotly_white",
+        'height': 500,
+        'hovermode': 'x unified',
+        'legend': dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1
+        )
+    }
+
+    # Configurar ejes Y según el número de variables
+    if len(variables_macro_disponibles) >= 1:
+        layout_config['yaxis'] = dict(
+            title=variables_macro_disponibles[0][2],
+            side="left",
+            showgrid=True,
+            gridcolor='lightgray',
+            gridwidth=0.5
+        )
+
+    if len(variables_macro_disponibles) >= 2:
+        layout_config['yaxis2'] = dict(
+            title=variables_macro_disponibles[1][2],
+            side="right",
+            overlaying="y",
+            showgrid=False
+        )
+
+    if len(variables_macro_disponibles) >= 3:
+        layout_config['yaxis3'] = dict(
+            title=variables_macro_disponibles[2][2],
+            side="left",
+            overlaying="y",
+            position=0.05,
+            showgrid=False
+        )
+
+    fig_macro.update_layout(**layout_config)
+    return fig_macro
+
+
+def promedio_movil(valores, ventana=3):
+    """Promedio móvil centrado con bordes reflejados (igual a scipy.ndimage.uniform_filter1d)"""
+    import numpy as np
+
+    valores = np.asarray(valores, dtype=float)
+    mitad = ventana // 2
+    extendidos = np.pad(valores, (mitad, ventana - 1 - mitad), mode='symmetric')
+    return np.convolve(extendidos, np.ones(ventana) / ventana, mode='valid')
@@ -0,0 +1,111 @@
+def C_prediccion_lote(obtener_modelo):
+    import io
+    import time
+    import streamlit as st
+    import numpy as np
+    import pandas as pd
+    from servicios.registro_modelos import CATALOGO_MODELOS, NOMBRES_MODELOS
+    from servicios.motor_prediccion import obtener_motor
+    from servicios.lector_csv import leer_csv
+
+    st.header("📦 Predicción por Lotes")
+
+    # Descripción
+    st.write("Suba un CSV con un escenario por fila para predecir todas las filas de una sola vez con el modelo elegido.")
+
+    modelo_id = st.selectbox(
+        "Modelo a utilizar",
+        options=list(CATALOGO_MODELOS),
+        format_func=lambda m: NOMBRES_MODELOS.get(m, m),
+        key="select_modelo_lote"
+    )
+
+    modelo = obtener_modelo(modelo_id)
+    if modelo is None:
+        return
+
+    # Nombres de las variables que espera el modelo
+    motor = obtener_motor(modelo_id, modelo)
+    feature_names = motor.features
+    objetivo = motor.objetivo
+
+    with st.expander("ℹ️ Columnas requeridas"):
+        for nombre in feature_names:
+            st.write(f"- {nombre}")
+        plantilla = pd.DataFrame(columns=[n.strip() for n in feature_names]).to_csv(index=False)
+        st.download_button("📄 Descargar plantilla CSV", plantilla, file_name=f"plantilla_{modelo_id}.csv",
+                           mime="text/csv", key="boton_plantilla_lote")
+
+    archivo = st.file_uploader("Archivo CSV con los escenarios", type=["csv"], key="archivo_lote")
+    if archivo is None:
+        return
+
+    try:
+        lectura = leer_csv(archivo)
+    except Exception as e:
+        st.error(f"❌ No se pudo leer el CSV: {str(e)}")
+        return
+    df_entrada = lectura.df
+    if lectura.tiene_descartadas:
+        lineas = ", ".join(str(d.linea) for d in lectura.descartadas[:20])
+        st.warning(f"⚠️ {len(lectura.descartadas)} líneas con campos de más quedaron afuera (líneas {lineas}"
+                   f"{'…' if len(lectura.descartadas) > 20 else ''}).")
+
+    # Las columnas se comparan sin espacios sobrantes (algunos nombres originales los tienen)
+    columnas_csv = {str(c).strip(): c for c in df_entrada.columns}
+    faltantes = [n for n in feature_names if n.strip() not in columnas_csv]
+    if faltantes:
+        st.error(f"❌ Faltan columnas requeridas por el modelo: {', '.join(faltantes)}")
+        return
+
+    # Matriz de entrada en el orden que espera el modelo
+    X = df_entrada[[columnas_csv[n.strip()] for n in feature_names]].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+    filas_validas = ~np.isnan(X).any(axis=1)
+    if not filas_validas.all():
+        st.warning(f"⚠️ {int((~filas_validas).sum())} filas tienen valores vacíos o no numéricos y no se predicen.")
+
+    predicciones = np.full(len(X), np.nan)
+    inicio = time.perf_counter()
+    try:
+        if filas_validas.any():
+            # Una sola transformación y una sola predicción para todo el lote
+            predicciones[filas_validas] = motor.predecir_lote(X[filas_validas])
+    except Exception as e:
+        st.error(f"❌ Error en la predicción: {str(e)}")
+        return
+    duracion = time.perf_counter() - inicio
+
+    df_resultado = df_entrada.copy()
+    df_resultado[f"{objetivo} (predicción)"] = predicciones
+
+    # Métricas del lote
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Filas procesadas", f"{int(filas_validas.sum())}/{len(df_entrada)}")
+    with col2:
+        st.metric("Tiempo de predicción", f"{duracion * 1000:.1f} ms")
+    with col3:
+        st.metric("Filas por segundo", f"{filas_validas.sum() / duracion:,.0f}" if duracion > 0 else "N/A")
+
+    st.dataframe(df_resultado.head(100), use_container_width=True)
+    if len(df_resultado) > 100:
+        st.caption(f"Mostrando 100 de {len(df_resultado)} filas. Descargue el archivo para ver todas.")
+
+    # Descarga de resultados
+    formato = st.radio("Formato de descarga", ["CSV", "Parquet"], horizontal=True, key="formato_lote")
+    if formato == "CSV":
+        datos_descarga = df_resultado.to_csv(index=False).encode("utf-8")
+        mime = "text/csv"
+    else:
+        buffer = io.BytesIO()
+        df_resultado.to_parquet(buffer, index=False)
+        datos_descarga = buffer.getvalue()
+        mime = "application/octet-stream"
+
+    st.download_button(
+        f"⬇️ Descargar resultados ({formato})",
+        datos_descarga,
+        file_name=f"predicciones_{modelo_id}.{formato.lower()}",
+        mime=mime,
+        key="boton_descarga_lote"
+    )
@@ -1,7 +1,8 @@
 def C_precio_internacional(model_E):
     import streamlit as st
-    import numpy as np
-    import pandas as pd
+    from servicios.motor_prediccion import obtener_motor
+    from componentes.componente_sensibilidad import C_sensibilidad
+    from componentes.componente_backtest import C_metricas_backtest
     
     st.header("🌍 Predicción de Precio Internacional")
     
@@ -12,7 +13,7 @@ def C_precio_internacional(model_E):
     with st.expander("ℹ️ Información del Modelo"):
         st.write("**Tipo de Modelo:** RandomForest")
         st.write("**Preprocesamiento:** Estandarización (StandardScaler)")
-        st.write("**R² Esperado:** 0.807955")
+        C_metricas_backtest("E")
         st.write("**Variables utilizadas:**")
         st.write("- Índice de Precios de los Lácteos FAO")
         st.write("- DOLAR OFICIAL $/US$") 
@@ -60,32 +61,12 @@ def C_precio_internacional(model_E):
             help="Stock total de productos lácteos"
         )
     
-    # Función para hacer predicción con manejo correcto del scaler
-    def hacer_prediccion_precio_internacional(modelo_completo, valores):
-        # Crear DataFrame con nombres de columnas correctos
-        feature_names = ['Indice de Precios de los Lácteos FAO', 'DOLAR OFICIAL $/US$', 
-                        'EXPORTACIONES toneladas/mes', 'EXISTENCIAS TOTAL']
-        df_entrada = pd.DataFrame([valores], columns=feature_names)
-        
-        # Aplicar preprocesamiento si es necesario
-        if modelo_completo.get('scaler') is not None:
-            st.info("✅ Aplicando estandarización StandardScaler")
-            datos_procesados = modelo_completo['scaler'].transform(df_entrada)
-            # Convertir de vuelta a DataFrame para mantener nombres de columnas
-            datos_procesados = pd.DataFrame(datos_procesados, columns=feature_names)
-        else:
-            st.info("✅ Usando datos originales (sin preprocesamiento - no se estandarizan ni se normalizan)")
-            datos_procesados = df_entrada
-        
-        # Hacer predicción
-        prediccion = modelo_completo['modelo'].predict(datos_procesados)
-        return prediccion[0]
+    # Valores en el orden de las variables del modelo
+    valores = [indice_fao, dolar_oficial, exportaciones, existencias_total]
     
     # Botón para realizar predicción
     if st.button("🔮 Predecir Precio Internacional", key="boton_precio_internacional"):
         # Validar que no haya valores negativos
-        valores = [indice_fao, dolar_oficial, exportaciones, existencias_total]
-        
         if any(v < 0 for v in valores):
             st.error("❌ Por favor, ingrese solo valores positivos.")
         elif any(v == 0 for v in valores):
@@ -95,7 +76,12 @@ def C_precio_internacional(model_E):
                 # Verificar si el modelo es el formato completo PKL o solo el modelo sklearn
                 if isinstance(model_E, dict) and 'modelo' in model_E:
                     # Es el formato completo PKL
-                    prediccion = hacer_prediccion_precio_internacional(model_E, valores)
+                    motor = obtener_motor("E", model_E)
+                    if motor.escalado:
+                        st.info("✅ Aplicando estandarización StandardScaler")
+                    else:
+                        st.info("✅ Usando datos originales (sin preprocesamiento - no se estandarizan ni se normalizan)")
+                    prediccion = motor.predecir(valores)
                     st.success(f"🌍 **Precio Internacional LPE GDT: USD {prediccion:.2f}/ton**")
                     
                     # Mostrar detalles adicionales
@@ -138,9 +124,8 @@ def C_precio_internacional(model_E):
                 else:
                     # Es solo el modelo sklearn (formato antiguo)
                     st.warning("⚠️ Modelo en formato legacy. Aplicando predicción directa.")
-                    datos_entrada = np.array([valores])
-                    prediccion = model_E.predict(datos_entrada)
-                    st.success(f"🌍 **Precio Internacional LPE GDT: USD {prediccion[0]:.2f}/ton**")
+                    prediccion = obtener_motor("E", model_E).predecir(valores)
+                    st.success(f"🌍 **Precio Internacional LPE GDT: USD {prediccion:.2f}/ton**")
                 
                 # Interpretación de resultados
                 st.subheader("📈 Interpretación del Precio")
@@ -191,6 +176,9 @@ def C_precio_internacional(model_E):
         - Condiciones climáticas globales
         """)
     
+    # Sensibilidad alrededor de los valores ingresados
+    C_sensibilidad("E", model_E, valores)
+    
     # Mostrar información adicional
     st.subheader("💡 Consejos de Uso")
     st.info("""
@@ -1,7 +1,8 @@
 def C_precio_novillos(model_F):
     import streamlit as st
-    import numpy as np
-    import pandas as pd
+    from servicios.motor_prediccion import obtener_motor
+    from componentes.componente_sensibilidad import C_sensibilidad
+    from componentes.componente_backtest import C_metricas_backtest
     
     st.header("🐄 Predicción de Precio de Novillos")
     
@@ -12,6 +13,7 @@ def C_precio_novillos(model_F):
     with st.expander("ℹ️ Información del Modelo"):
         st.write("**Tipo de Modelo:** Regresión Lineal")
         st.write("**Preprocesamiento:** Estandarización (StandardScaler)")
+        C_metricas_backtest("F")
         st.write("**Variables utilizadas:**")
         st.write("- Cabezas Vaquillonas")
         st.write("- DOLAR OFICIAL $/US$") 
@@ -62,31 +64,12 @@ def C_precio_novillos(model_F):
             help="Precio promedio de vaquillonas como referencia del mercado"
         )
     
-    # Función para hacer predicción con manejo correcto del scaler
-    def hacer_prediccion_precio_novillos(modelo_completo, valores):
-        # Crear DataFrame con nombres de columnas correctos
-        feature_names = ['Cabezas Vaquillonas', 'DOLAR OFICIAL $/US$', 'IPC-Mensual', 'Precio Promedio Vaquillonas']
-        df_entrada = pd.DataFrame([valores], columns=feature_names)
-        
-        # Aplicar preprocesamiento si es necesario
-        if modelo_completo.get('scaler') is not None:
-            st.info("✅ Aplicando estandarización (StandardScaler)")
-            datos_procesados = modelo_completo['scaler'].transform(df_entrada)
-            # Convertir de vuelta a DataFrame para mantener nombres de columnas
-            datos_procesados = pd.DataFrame(datos_procesados, columns=feature_names)
-        else:
-            st.info("✅ Usando datos originales (sin preprocesamiento)")
-            datos_procesados = df_entrada
-        
-        # Hacer predicción
-        prediccion = modelo_completo['modelo'].predict(datos_procesados)
-        return prediccion[0]
+    # Valores en el orden de las variables del modelo
+    valores = [cabezas_vaquillonas, dolar_oficial, ipc_mensual, precio_vaquillonas]
     
     # Botón para realizar predicción
     if st.button("🔮 Predecir Precio de Novillos", key="boton_precio_novillos"):
         # Validar que no haya valores negativos
-        valores = [cabezas_vaquillonas, dolar_oficial, ipc_mensual, precio_vaquillonas]
-        
         if any(v < 0 for v in valores):
             st.error("❌ Por favor, ingrese solo valores positivos.")
         elif any(v == 0 for v in valores):
@@ -96,7 +79,12 @@ def C_precio_novillos(model_F):
                 # Verificar si el modelo es el formato completo PKL o solo el modelo sklearn
                 if isinstance(model_F, dict) and 'modelo' in model_F:
                     # Es el formato completo PKL
-                    prediccion = hacer_prediccion_precio_novillos(model_F, valores)
+                    motor = obtener_motor("F", model_F)
+                    if motor.escalado:
+                        st.info("✅ Aplicando estandarización (StandardScaler)")
+                    else:
+                        st.info("✅ Usando datos originales (sin preprocesamiento)")
+                    prediccion = motor.predecir(valores)
                     st.success(f"🐄 **Precio de Novillos Predicho: ${prediccion:.2f}**")
                     
                     # Mostrar detalles adicionales
@@ -148,9 +136,8 @@ def C_precio_novillos(model_F):
                 else:
                     # Es solo el modelo sklearn (formato antiguo)
                     st.warning("⚠️ Modelo en formato legacy. Aplicando predicción directa.")
-                    datos_entrada = np.array([valores])
-                    prediccion = model_F.predict(datos_entrada)
-                    st.success(f"🐄 **Precio de Novillos Predicho: ${prediccion[0]:.2f}**")
+                    prediccion = obtener_motor("F", model_F).predecir(valores)
+                    st.success(f"🐄 **Precio de Novillos Predicho: ${prediccion:.2f}**")
                 
                 # Interpretación de resultados
                 st.subheader("📈 Interpretación del Precio")
@@ -203,6 +190,9 @@ def C_precio_novillos(model_F):
         - Demanda de exportación
         """)
     
+    # Sensibilidad alrededor de los valores ingresados
+    C_sensibilidad("F", model_F, valores)
+    
     # Mostrar información adicional
     st.subheader("💡 Consejos de Uso")
     st.info("""
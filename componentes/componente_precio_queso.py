@@ -1,7 +1,8 @@
 def C_precio_queso(model_D):
     import streamlit as st
-    import numpy as np
-    import pandas as pd
+    from servicios.motor_prediccion import obtener_motor
+    from componentes.componente_sensibilidad import C_sensibilidad
+    from componentes.componente_backtest import C_metricas_backtest
     
     st.header("🧀 Predicción de Precio de Queso")
     
@@ -12,7 +13,7 @@ def C_precio_queso(model_D):
     with st.expander("ℹ️ Información del Modelo"):
         st.write("**Tipo de Modelo:** LinearRegression")
         st.write("**Preprocesamiento:** Estandarización (StandardScaler)")
-        st.write("**R² Esperado:** 0.999357")
+        C_metricas_backtest("D")
         st.write("**Variables utilizadas:**")
         st.write("- Precio/litro Nacional - SIGLeA")
         st.write("- IPC-Mensual") 
@@ -70,32 +71,12 @@ def C_precio_queso(model_D):
             help="Promedio de precios del sector privado"
         )
     
-    # Función para hacer predicción con manejo correcto del scaler
-    def hacer_prediccion_precio_queso(modelo_completo, valores):
-        # Crear DataFrame con nombres de columnas correctos
-        feature_names = ['Precio/litro Nacional - SIGLeA', 'IPC-Mensual', 'IPIM Lácteos - INDEC',
-                        'ELABORACIÓN TOTAL', 'Promedio general sector privado']
-        df_entrada = pd.DataFrame([valores], columns=feature_names)
-        
-        # Aplicar preprocesamiento si es necesario
-        if modelo_completo.get('scaler') is not None:
-            st.info("✅ Aplicando estandarización StandardScaler")
-            datos_procesados = modelo_completo['scaler'].transform(df_entrada)
-            # Convertir de vuelta a DataFrame para mantener nombres de columnas
-            datos_procesados = pd.DataFrame(datos_procesados, columns=feature_names)
-        else:
-            st.info("✅ Usando datos originales (sin preprocesamiento - no se estandarizan ni se normalizan)")
-            datos_procesados = df_entrada
-        
-        # Hacer predicción
-        prediccion = modelo_completo['modelo'].predict(datos_procesados)
-        return prediccion[0]
+    # Valores en el orden de las variables del modelo
+    valores = [precio_litro, ipc_mensual, ipim_lacteos, elaboracion_total, promedio_sector_privado]
     
     # Botón para realizar predicción
     if st.button("🔮 Predecir Precio de Queso", key="boton_precio_queso"):
         # Validar que no haya valores negativos
-        valores = [precio_litro, ipc_mensual, ipim_lacteos, elaboracion_total, promedio_sector_privado]
-        
         if any(v < 0 for v in valores):
             st.error("❌ Por favor, ingrese solo valores positivos.")
         elif any(v == 0 for v in valores):
@@ -105,7 +86,12 @@ def C_precio_queso(model_D):
                 # Verificar si el modelo es el formato completo PKL o solo el modelo sklearn
                 if isinstance(model_D, dict) and 'modelo' in model_D:
                     # Es el formato completo PKL
-                    prediccion = hacer_prediccion_precio_queso(model_D, valores)
+                    motor = obtener_motor("D", model_D)
+                    if motor.escalado:
+                        st.info("✅ Aplicando estandarización StandardScaler")
+                    else:
+                        st.info("✅ Usando datos originales (sin preprocesamiento - no se estandarizan ni se normalizan)")
+                    prediccion = motor.predecir(valores)
                     st.success(f"🧀 **Precio de Queso Predicho: ${prediccion:.2f}/kg**")
                     
                     # Mostrar detalles adicionales
@@ -138,9 +124,8 @@ def C_precio_queso(model_D):
                 else:
                     # Es solo el modelo sklearn (formato antiguo)
                     st.warning("⚠️ Modelo en formato legacy. Aplicando predicción directa.")
-                    datos_entrada = np.array([valores])
-                    prediccion = model_D.predict(datos_entrada)
-                    st.success(f"🧀 **Precio de Queso Predicho: ${prediccion[0]:.2f}/kg**")
+                    prediccion = obtener_motor("D", model_D).predecir(valores)
+                    st.success(f"🧀 **Precio de Queso Predicho: ${prediccion:.2f}/kg**")
                 
                 # Interpretación de resultados
                 st.subheader("📈 Interpretación del Precio")
@@ -184,6 +169,9 @@ def C_precio_queso(model_D):
         - Demanda del mercado
         """)
     
+    # Sensibilidad alrededor de los valores ingresados
+    C_sensibilidad("D", model_D, valores)
+    
     # Mostrar información adicional
     st.subheader("💡 Consejos de Uso")
     st.info("""
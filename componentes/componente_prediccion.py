@@ -1,13 +1,20 @@
 def C_prediccion(model1):
     import streamlit as st
-    import numpy as np
-    import pickle
+    from servicios.motor_prediccion import obtener_motor
+    from componentes.componente_backtest import C_metricas_backtest
 
     st.header("Prediccion en base a IPC y valor del dolar")
 
     # Descripción
     st.write("Introducir el valor del IPC y del dolar para predecir el valor del litro de leche, intente introducir un valor que cuente con decimales.")
 
+    # Información del modelo
+    with st.expander("ℹ️ Información del Modelo"):
+        st.write("**Tipo de modelo:** Regresión Lineal")
+        st.write("**Variables utilizadas:** IPC y Dólar")
+        st.write("**Variable objetivo:** Precio/litro Nacional - SIGLeA")
+        C_metricas_backtest("ipc_dolar")
+
     st.markdown("### Instrucciones para ingresar el IPC como variable predictora")
 
     st.info("""
@@ -49,13 +56,10 @@ def C_prediccion(model1):
         if ipc < 0 or dolar < 0:
             st.error("Por favor, ingrese valores válidos (positivos) para IPC y Dólar.")
         else:
-            # Preparar los datos para el modelo
-            datos_entrada = np.array([[ipc, dolar]])  # Los valores deben estar en un array bidimensional
-
-            # Hacer la predicción
+            # Hacer la predicción con el motor compartido
             try:
-                prediccion = model1.predict(datos_entrada)  # Hacer la predicción usando el modelo
-                st.success(f"🔮 El precio predicho de la leche es: **${prediccion[0]:,.2f}**")
+                prediccion = obtener_motor("ipc_dolar", model1).predecir([ipc, dolar])
+                st.success(f"🔮 El precio predicho de la leche es: **${prediccion:,.2f}**")
             except Exception as e:
                 st.error(f"Error en la predicción: {e}")
 
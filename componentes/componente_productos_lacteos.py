@@ -1,7 +1,8 @@
 def C_productos_lacteos(model_H):
     import streamlit as st
-    import numpy as np
-    import pandas as pd
+    from servicios.motor_prediccion import obtener_motor
+    from componentes.componente_sensibilidad import C_sensibilidad
+    from componentes.componente_backtest import C_metricas_backtest
     
     st.header("🥛 Predicción con Productos Lácteos Específicos")
     
@@ -12,7 +13,7 @@ def C_productos_lacteos(model_H):
     with st.expander("ℹ️ Información del Modelo"):
         st.write("**Tipo de Modelo:** RandomForest")
         st.write("**Preprocesamiento:** Datos Originales (sin estandarización)")
-        st.write("**R² Esperado:** 0.999820")
+        C_metricas_backtest("H")
         st.write("**Variables utilizadas:**")
         st.write("- LECHE COMUN ENTERA $/litro")
         st.write("- QUESO TIPO CUARTIROLO $/kg")
@@ -81,31 +82,12 @@ def C_productos_lacteos(model_H):
             - Indicador de productos premium
             """)
     
-    # Función para hacer predicción con manejo correcto del scaler
-    def hacer_prediccion_productos_lacteos(modelo_completo, valores):
-        # Crear DataFrame con nombres de columnas correctos
-        feature_names = ['LECHE COMUN ENTERA $/litro', 'QUESO TIPO CUARTIROLO $/kg', 'YOGUR para beber sachet $/1000 grs']
-        df_entrada = pd.DataFrame([valores], columns=feature_names)
-        
-        # Aplicar preprocesamiento si es necesario
-        if modelo_completo.get('scaler') is not None:
-            st.info("✅ Aplicando preprocesamiento")
-            datos_procesados = modelo_completo['scaler'].transform(df_entrada)
-            # Convertir de vuelta a DataFrame para mantener nombres de columnas
-            datos_procesados = pd.DataFrame(datos_procesados, columns=feature_names)
-        else:
-            st.info("✅ Usando datos originales (sin preprocesamiento - no se estandarizan ni se normalizan)")
-            datos_procesados = df_entrada
-        
-        # Hacer predicción
-        prediccion = modelo_completo['modelo'].predict(datos_procesados)
-        return prediccion[0]
+    # Valores en el orden de las variables del modelo
+    valores = [leche_entera, queso_cuartirolo, yogur_sachet]
     
     # Botón para realizar predicción
     if st.button("🔮 Predecir Precio con Productos Lácteos", key="boton_productos_lacteos"):
         # Validar que no haya valores negativos
-        valores = [leche_entera, queso_cuartirolo, yogur_sachet]
-        
         if any(v < 0 for v in valores):
             st.error("❌ Por favor, ingrese solo valores positivos.")
         elif any(v == 0 for v in valores):
@@ -115,7 +97,12 @@ def C_productos_lacteos(model_H):
                 # Verificar si el modelo es el formato completo PKL o solo el modelo sklearn
                 if isinstance(model_H, dict) and 'modelo' in model_H:
                     # Es el formato completo PKL
-                    prediccion = hacer_prediccion_productos_lacteos(model_H, valores)
+                    motor = obtener_motor("H", model_H)
+                    if motor.escalado:
+                        st.info("✅ Aplicando preprocesamiento")
+                    else:
+                        st.info("✅ Usando datos originales (sin preprocesamiento - no se estandarizan ni se normalizan)")
+                    prediccion = motor.predecir(valores)
                     st.success(f"🥛 **Precio de Leche Predicho: ${prediccion:.6f}/litro**")
                     
                     # Mostrar detalles adicionales
@@ -186,9 +173,8 @@ def C_productos_lacteos(model_H):
                 else:
                     # Es solo el modelo sklearn (formato antiguo)
                     st.warning("⚠️ Modelo en formato legacy. Aplicando predicción directa.")
-                    datos_entrada = np.array([valores])
-                    prediccion = model_H.predict(datos_entrada)
-                    st.success(f"🥛 **Precio de Leche Predicho: ${prediccion[0]:.6f}/litro**")
+                    prediccion = obtener_motor("H", model_H).predecir(valores)
+                    st.success(f"🥛 **Precio de Leche Predicho: ${prediccion:.6f}/litro**")
                 
                 # Interpretación de resultados
                 st.subheader("📊 Interpretación del Precio")
@@ -268,6 +254,9 @@ def C_productos_lacteos(model_H):
         - Competencia en góndola
         """)
     
+    # Sensibilidad alrededor de los valores ingresados
+    C_sensibilidad("H", model_H, valores)
+    
     # Mostrar información adicional
     st.subheader("💡 Consejos de Uso")
     st.info("""
@@ -0,0 +1,98 @@
+def C_pronostico():
+    import streamlit as st
+    import pandas as pd
+    import plotly.graph_objects as go
+    from servicios.pronostico import (HORIZONTES, MAX_HORIZONTE, MODELOS_PRONOSTICO, SERIES_PRONOSTICO,
+                                      obtener_pronosticador)
+
+    st.header("🔮 Pronóstico de Precios")
+
+    # Descripción
+    st.write("Proyecta la serie elegida varios meses hacia adelante a partir de su historia mensual, "
+             "con un intervalo de predicción que se ensancha con el horizonte.")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        nombre_serie = st.selectbox("Serie a pronosticar", options=list(SERIES_PRONOSTICO), key="serie_pronostico")
+        modelo = st.selectbox(
+            "Modelo",
+            options=MODELOS_PRONOSTICO,
+            format_func=lambda m: {
+                "SARIMAX": "SARIMAX (estacionalidad anual)",
+                "ETS": "ETS (tendencia amortiguada)",
+                "Rezagos": "Rezagos (serie, dólar e IPC de los últimos meses)",
+            }[m],
+            key="modelo_pronostico"
+        )
+    with col2:
+        horizonte = st.slider("Horizonte (meses)", min_value=max(HORIZONTES), max_value=MAX_HORIZONTE,
+                              value=max(HORIZONTES), key="horizonte_pronostico")
+        nivel = st.select_slider("Nivel de confianza del intervalo", options=[0.5, 0.8, 0.9, 0.95], value=0.8,
+                                 format_func=lambda n: f"{n:.0%}", key="nivel_pronostico")
+
+    if st.button("🔮 Pronosticar", key="boton_pronostico"):
+        columna = SERIES_PRONOSTICO[nombre_serie]
+        try:
+            with st.spinner("Ajustando el modelo (solo la primera vez para estos datos)..."):
+                pronostico = obtener_pronosticador().pronosticar(columna, modelo, horizonte, nivel)
+        except Exception as e:
+            st.error(f"❌ Error en el pronóstico: {str(e)}")
+            return
+
+        # Valores a 3, 6 y 12 meses
+        columnas_horizonte = st.columns(len(HORIZONTES))
+        for columna_metrica, meses in zip(columnas_horizonte, HORIZONTES):
+            valor, inferior, superior = pronostico.en(meses)
+            with columna_metrica:
+                st.metric(
+                    f"En {meses} meses ({pronostico.fechas[meses - 1]:%m/%Y})",
+                    f"{valor:,.2f}",
+                    f"{valor / pronostico.historia.iloc[-1] - 1:+.1%} vs último dato"
+                )
+                st.caption(f"Intervalo {nivel:.0%}: {inferior:,.2f} – {superior:,.2f}")
+
+        # Historia, pronóstico e intervalo
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(x=pronostico.historia.index, y=pronostico.historia.to_numpy(),
+                                 mode='lines', name='Historia', line=dict(color='#1f77b4')))
+        fig.add_trace(go.Scatter(
+            x=list(pronostico.fechas) + list(pronostico.fechas[::-1]),
+            y=list(pronostico.superior) + list(pronostico.inferior[::-1]),
+            fill='toself', fillcolor='rgba(255, 127, 14, 0.2)', line=dict(color='rgba(0,0,0,0)'),
+            hoverinfo='skip', name=f'Intervalo {nivel:.0%}'
+        ))
+        fig.add_trace(go.Scatter(x=pronostico.fechas, y=pronostico.media, mode='lines+markers',
+                                 name='Pronóstico', line=dict(color='#ff7f0e', dash='dash')))
+        fig.update_layout(
+            title=f"{nombre_serie}: pronóstico a {horizonte} meses ({modelo})",
+            xaxis_title="Fecha",
+            yaxis_title=nombre_serie,
+            hovermode='x unified',
+            height=450
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+        with st.expander("📋 Pronóstico mes a mes"):
+            st.dataframe(pd.DataFrame({
+                "Mes": pronostico.fechas.strftime("%Y-%m"),
+                "Pronóstico": pronostico.media.round(2),
+                "Inferior": pronostico.inferior.round(2),
+                "Superior": pronostico.superior.round(2),
+            }), hide_index=True, use_container_width=True)
+
+        st.caption(
+            f"{'♻️ Pronóstico desde caché (calculado' if pronostico.desde_cache else '🆕 Pronóstico calculado'} en "
+            f"{pronostico.tiempo_pronostico_s * 1000:.1f} ms{')' if pronostico.desde_cache else ''} · "
+            f"ajuste del modelo: {pronostico.tiempo_ajuste_s * 1000:.0f} ms (una vez por versión de los datos)"
+        )
+        if pronostico.aviso:
+            st.caption(f"⚠️ Aviso del ajuste: {pronostico.aviso}")
+
+    # Consejos de uso
+    st.markdown("### 💡 Consejos de Uso")
+    st.info("""
+    - **SARIMAX** repite el patrón estacional de cada año; **ETS** prolonga la tendencia reciente amortiguándola.
+    - **Rezagos** usa también el dólar y el IPC de los últimos meses: reacciona más a una aceleración de la inflación.
+    - El pronóstico es la mediana: con precios que crecen con la inflación, el intervalo es asimétrico.
+    - Cuanto más lejano el horizonte, más ancho el intervalo: a 12 meses tómelo como un rango de escenarios.
+    """)
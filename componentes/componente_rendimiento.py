@@ -0,0 +1,75 @@
+def C_rendimiento():
+    import streamlit as st
+    import pandas as pd
+    import plotly.graph_objects as go
+    from servicios.telemetria import TAMAÑO_BUFFER, obtener_telemetria
+    from servicios.registro_modelos import obtener_registro
+
+    st.header("🛠️ Rendimiento por Etapa")
+
+    # Descripción
+    st.write("Tiempos de cada etapa en este proceso (todas las sesiones): carga de datos y modelos, "
+             "transformación y predicción, armado y envío de figuras y render de cada pestaña.")
+
+    telemetria = obtener_telemetria()
+    if st.button("🧹 Reiniciar mediciones", key="boton_reiniciar_telemetria"):
+        telemetria.reiniciar()
+        st.success("✅ Mediciones reiniciadas")
+
+    # Modelos con error (memorizado hasta recargarlos) o con avisos en la carga
+    registro = obtener_registro()
+    problemas = [e for e in registro.estadisticas() if e.error or e.aviso]
+    if problemas:
+        st.subheader("⚠️ Carga de modelos")
+        st.dataframe(pd.DataFrame([{
+            "Modelo": e.modelo_id,
+            "Formato": e.formato,
+            "Estado": f"❌ {e.error}" if e.error else f"⚠️ {e.aviso}",
+        } for e in problemas]), hide_index=True, use_container_width=True)
+        con_error = [e.modelo_id for e in problemas if e.error]
+        if con_error and st.button("🔄 Reintentar la carga de los modelos con error", key="boton_recargar_modelos"):
+            for modelo_id in con_error:
+                registro.recargar(modelo_id)
+            st.rerun()
+
+    resumenes = telemetria.resumen()
+    if not resumenes:
+        st.info("ℹ️ Todavía no hay mediciones en este proceso.")
+        return
+
+    tabla = pd.DataFrame([{
+        "Etapa": r.etapa,
+        "Detalle": ", ".join(f"{k}={v}" for k, v in r.etiquetas.items()),
+        "Mediciones": r.total,
+        "p50 (ms)": round(r.p50 * 1000, 3),
+        "p95 (ms)": round(r.p95 * 1000, 3),
+        "p99 (ms)": round(r.p99 * 1000, 3),
+        "Máx. (ms)": round(r.maximo * 1000, 3),
+        "Total (s)": round(r.suma_s, 3),
+    } for r in resumenes])
+
+    # Etapas filtrables (por defecto todas)
+    etapas = sorted(tabla["Etapa"].unique())
+    elegidas = st.multiselect("Etapas", options=etapas, default=etapas, key="etapas_rendimiento")
+    tabla = tabla[tabla["Etapa"].isin(elegidas)]
+    st.dataframe(tabla, hide_index=True, use_container_width=True)
+    st.caption(f"Percentiles sobre las últimas {TAMAÑO_BUFFER:,} mediciones de cada serie; "
+               "'Mediciones' y 'Total' cuentan desde el arranque del proceso.")
+
+    # Las 15 series con mayor p95
+    principales = tabla.nlargest(15, "p95 (ms)").iloc[::-1]
+    etiquetas = principales["Etapa"] + principales["Detalle"].map(lambda d: f" ({d})" if d else "")
+    fig = go.Figure()
+    for columna, color in (("p50 (ms)", "#2ca02c"), ("p95 (ms)", "#ff7f0e"), ("p99 (ms)", "#d62728")):
+        fig.add_trace(go.Bar(y=etiquetas, x=principales[columna], name=columna.split()[0],
+                             orientation='h', marker_color=color))
+    fig.update_layout(title="Series más lentas (p95)", xaxis_title="ms", barmode='group',
+                      height=max(300, 40 * len(principales)))
+    st.plotly_chart(fig, use_container_width=True)
+
+    with st.expander("📤 Exportación Prometheus"):
+        texto = telemetria.prometheus()
+        st.code(texto, language="text")
+        st.download_button("Descargar métricas", texto, file_name="metrics.txt", mime="text/plain",
+                           key="descargar_prometheus")
+        st.caption("La API (`uvicorn servicios.api:app`) expone las métricas de su proceso en `GET /metrics`.")
@@ -1,7 +1,8 @@
 def C_rentabilidad(model_A):
     import streamlit as st
-    import numpy as np
-    import pandas as pd
+    from servicios.motor_prediccion import obtener_motor
+    from componentes.componente_sensibilidad import C_sensibilidad
+    from componentes.componente_backtest import C_metricas_backtest
     
     st.header("🎯 Predicción de Rentabilidad")
     
@@ -12,7 +13,7 @@ def C_rentabilidad(model_A):
     with st.expander("ℹ️ Información del Modelo"):
         st.write("**Tipo de Modelo:** RandomForest")
         st.write("**Preprocesamiento:** Estandarización (StandardScaler)")
-        st.write("**R² Esperado:** 0.831300")
+        C_metricas_backtest("A")
         st.write("**Variables utilizadas:**")
         st.write("- COSTO")
         st.write("- Precio/litro Nacional - SIGLeA") 
@@ -80,32 +81,12 @@ def C_rentabilidad(model_A):
             help="Promedio general del sector lácteo"
         )
     
-    # Función para hacer predicción con manejo correcto del scaler
-    def hacer_prediccion_rentabilidad(modelo_completo, valores):
-        # Crear DataFrame con nombres de columnas correctos
-        feature_names = ['COSTO', 'Precio/litro Nacional - SIGLeA', 'DOLAR OFICIAL $/US$', 
-                        'IPC-Mensual', 'IPIM Nivel General - INDEC', 'Promedio del sector']
-        df_entrada = pd.DataFrame([valores], columns=feature_names)
-        
-        # Aplicar preprocesamiento si es necesario
-        if modelo_completo.get('scaler') is not None:
-            st.info("✅ Aplicando estandarización StandardScaler")
-            datos_procesados = modelo_completo['scaler'].transform(df_entrada)
-            # Convertir de vuelta a DataFrame para mantener nombres de columnas
-            datos_procesados = pd.DataFrame(datos_procesados, columns=feature_names)
-        else:
-            st.info("✅ Usando datos originales (sin preprocesamiento - no se estandarizan ni se normalizan)")
-            datos_procesados = df_entrada
-        
-        # Hacer predicción
-        prediccion = modelo_completo['modelo'].predict(datos_procesados)
-        return prediccion[0]
+    # Valores en el orden de las variables del modelo
+    valores = [costo, precio_litro, dolar_oficial, ipc_mensual, ipim, promedio_sector]
     
     # Botón para realizar predicción
     if st.button("🔮 Predecir Rentabilidad", key="boton_rentabilidad"):
         # Validar que no haya valores negativos
-        valores = [costo, precio_litro, dolar_oficial, ipc_mensual, ipim, promedio_sector]
-        
         if any(v < 0 for v in valores):
             st.error("❌ Por favor, ingrese solo valores positivos.")
         elif any(v == 0 for v in valores):
@@ -115,7 +96,12 @@ def C_rentabilidad(model_A):
                 # Verificar si el modelo es el formato completo PKL o solo el modelo sklearn
                 if isinstance(model_A, dict) and 'modelo' in model_A:
                     # Es el formato completo PKL
-                    prediccion = hacer_prediccion_rentabilidad(model_A, valores)
+                    motor = obtener_motor("A", model_A)
+                    if motor.escalado:
+                        st.info("✅ Aplicando estandarización StandardScaler")
+                    else:
+                        st.info("✅ Usando datos originales (sin preprocesamiento - no se estandarizan ni se normalizan)")
+                    prediccion = motor.predecir(valores)
                     st.success(f"🎯 **Rentabilidad Predicha: {prediccion:.6f}**")
                     
                     # Mostrar detalles adicionales
@@ -135,9 +121,8 @@ def C_rentabilidad(model_A):
                 else:
                     # Es solo el modelo sklearn (formato antiguo)
                     st.warning("⚠️ Modelo en formato legacy. Aplicando predicción directa.")
-                    datos_entrada = np.array([valores])
-                    prediccion = model_A.predict(datos_entrada)
-                    st.success(f"🎯 **Rentabilidad Predicha: {prediccion[0]:.6f}**")
+                    prediccion = obtener_motor("A", model_A).predecir(valores)
+                    st.success(f"🎯 **Rentabilidad Predicha: {prediccion:.6f}**")
                 
                 # Interpretación de resultados
                 st.subheader("📈 Interpretación")
@@ -157,6 +142,9 @@ def C_rentabilidad(model_A):
                     st.write("**Tipo de modelo:**", type(model_A))
                     st.write("**Detalles del error:**", str(e))
     
+    # Sensibilidad alrededor de los valores ingresados
+    C_sensibilidad("A", model_A, valores)
+    
     # Mostrar información adicional
     st.subheader("💡 Consejos de Uso")
     st.info("""
@@ -0,0 +1,71 @@
+def C_sensibilidad(modelo_id, modelo, valores):
+    import streamlit as st
+    import plotly.graph_objects as go
+    from servicios.motor_prediccion import obtener_motor
+    from servicios.sensibilidad import MAX_PUNTOS_GRILLA, evaluar_sensibilidad
+
+    with st.expander("🧪 Análisis de Sensibilidad"):
+        st.write("Varía una o dos variables alrededor de los valores ingresados y predice toda la grilla de una sola vez.")
+
+        try:
+            motor = obtener_motor(modelo_id, modelo)
+        except Exception as e:
+            st.error(f"❌ El modelo no está disponible para el análisis de sensibilidad: {str(e)}")
+            return
+        nombres = [f.strip() for f in motor.features]
+
+        variables = st.multiselect(
+            "Variables a variar (una o dos)",
+            options=nombres,
+            max_selections=2,
+            key=f"variables_sensibilidad_{modelo_id}"
+        )
+
+        col1, col2 = st.columns(2)
+        with col1:
+            variacion = st.slider("Variación (±%)", min_value=5, max_value=100, value=30, step=5,
+                                  key=f"variacion_sensibilidad_{modelo_id}")
+        with col2:
+            puntos = st.select_slider("Puntos por variable", options=[11, 21, 51, 101, 201, 301],
+                                      value=101 if len(variables) > 1 else 201,
+                                      key=f"puntos_sensibilidad_{modelo_id}")
+
+        if st.button("📊 Calcular Sensibilidad", key=f"boton_sensibilidad_{modelo_id}"):
+            base = dict(zip(nombres, valores))
+            if not variables:
+                st.warning("⚠️ Elija al menos una variable para variar.")
+            elif any(base[v] <= 0 for v in variables):
+                st.warning("⚠️ Ingrese un valor mayor a cero en las variables elegidas: la grilla se arma como porcentaje de ese valor.")
+            elif puntos ** len(variables) > MAX_PUNTOS_GRILLA:
+                st.warning(f"⚠️ La grilla tendría {puntos ** len(variables):,} puntos. Reduzca los puntos por variable.")
+            else:
+                try:
+                    resultado = evaluar_sensibilidad(motor, valores, variables, variacion / 100, puntos)
+
+                    col_met1, col_met2, col_met3 = st.columns(3)
+                    with col_met1:
+                        st.metric("Puntos evaluados", f"{resultado.n_puntos:,}")
+                    with col_met2:
+                        st.metric("Tiempo de predicción", f"{resultado.tiempo_s * 1000:.1f} ms")
+                    with col_met3:
+                        st.metric("Predicción en el punto base", f"{resultado.prediccion_base:,.4f}")
+
+                    if len(resultado.variables) == 1:
+                        fig = go.Figure(go.Scatter(x=resultado.ejes[0], y=resultado.predicciones, mode='lines',
+                                                   name=motor.objetivo))
+                        fig.add_trace(go.Scatter(x=[base[resultado.variables[0]]], y=[resultado.prediccion_base],
+                                                 mode='markers', marker=dict(size=10, color='red'), name="Valor ingresado"))
+                        fig.update_layout(xaxis_title=resultado.variables[0], yaxis_title=motor.objetivo)
+                    else:
+                        # Filas = segunda variable (eje Y), columnas = primera variable (eje X)
+                        fig = go.Figure(go.Heatmap(x=resultado.ejes[0], y=resultado.ejes[1], z=resultado.predicciones.T,
+                                                   colorscale="Viridis", colorbar=dict(title="Predicción")))
+                        fig.add_trace(go.Scatter(x=[base[resultado.variables[0]]], y=[base[resultado.variables[1]]],
+                                                 mode='markers', marker=dict(size=10, color='red', symbol='x'),
+                                                 name="Valor ingresado"))
+                        fig.update_layout(xaxis_title=resultado.variables[0], yaxis_title=resultado.variables[1])
+
+                    fig.update_layout(title=f"Sensibilidad de {motor.objetivo} (±{variacion}%)", template="plotly_white")
+                    st.plotly_chart(fig, use_container_width=True)
+                except Exception as e:
+                    st.error(f"❌ Error en el análisis de sensibilidad: {str(e)}")
@@ -0,0 +1,110 @@
+def C_tabla_paginada(nombre, df=None, clave=None, columnas_iniciales=8):
+    import streamlit as st
+    import pyarrow as pa
+    from servicios.almacen_datos import columna_fecha, obtener_almacen
+    from servicios.esquema_datos import aplicar_esquema
+    from servicios.tabla_paginada import FILAS_POR_PAGINA, FiltroRango, consultar_pagina, rango_columna
+
+    clave = clave or nombre
+
+    # Tabla del almacén Parquet (memory map); si el dataset no se convirtió, la del DataFrame
+    almacen = obtener_almacen()
+    if almacen.existe(nombre):
+        tabla = almacen.leer_tabla(nombre)
+    else:
+        tabla = pa.Table.from_pandas(df, preserve_index=False)
+    todas = tabla.column_names
+    fecha = columna_fecha(todas)
+
+    col1, col2, col3 = st.columns([4, 2, 1])
+    with col1:
+        columnas = st.multiselect(
+            "Columnas visibles",
+            options=todas,
+            default=todas[:columnas_iniciales],
+            key=f"columnas_{clave}"
+        )
+    with col2:
+        orden = st.selectbox(
+            "Ordenar por",
+            options=todas,
+            index=todas.index(fecha) if fecha else 0,
+            key=f"orden_{clave}"
+        )
+    with col3:
+        # Por defecto los datos más recientes primero
+        descendente = st.toggle("Descendente", value=True, key=f"descendente_{clave}")
+
+    # Filtro por rango sobre una columna numérica o de fecha
+    filtrables = [c for c in todas if pa.types.is_integer(tabla.schema.field(c).type)
+                  or pa.types.is_floating(tabla.schema.field(c).type)
+                  or pa.types.is_timestamp(tabla.schema.field(c).type)]
+    col_filtro1, col_filtro2 = st.columns([2, 4])
+    with col_filtro1:
+        columna_filtro = st.selectbox(
+            "Filtrar por",
+            options=["(sin filtro)"] + filtrables,
+            key=f"filtro_{clave}"
+        )
+    filtro = None
+    if columna_filtro != "(sin filtro)":
+        rango = rango_columna(tabla, columna_filtro)
+        with col_filtro2:
+            if rango is None or rango[0] == rango[1]:
+                st.caption("La columna tiene un solo valor: no hay rango para filtrar.")
+            else:
+                # Cien pasos entre los extremos en las columnas decimales
+                paso = (rango[1] - rango[0]) / 100 if isinstance(rango[0], float) else None
+                minimo, maximo = st.slider(
+                    f"Rango de {columna_filtro}",
+                    min_value=rango[0],
+                    max_value=rango[1],
+                    value=rango,
+                    step=paso,
+                    key=f"rango_{clave}_{columna_filtro}"
+                )
+                filtro = FiltroRango(columna_filtro, minimo, maximo)
+
+    col_pagina1, col_pagina2 = st.columns([1, 3])
+    with col_pagina1:
+        filas_por_pagina = st.selectbox("Filas por página", options=FILAS_POR_PAGINA, key=f"filas_{clave}")
+
+    if not columnas:
+        st.info("ℹ️ Elija al menos una columna para mostrar.")
+        return
+
+    try:
+        pagina_actual = st.session_state.get(f"pagina_{clave}", 1)
+        resultado = consultar_pagina(tabla, columnas, orden, descendente, filtro, pagina_actual, filas_por_pagina)
+    except Exception as e:
+        st.error(f"❌ Error consultando la tabla: {str(e)}")
+        return
+
+    with col_pagina2:
+        # La página se guarda antes de crear el widget: si el filtro deja menos
+        # páginas se ajusta a la última y no vuelve a 1 cuando cambia el máximo
+        st.session_state[f"pagina_{clave}"] = resultado.pagina
+        st.number_input(
+            "Página",
+            min_value=1,
+            max_value=resultado.paginas,
+            step=1,
+            key=f"pagina_{clave}"
+        )
+
+    datos = aplicar_esquema(nombre, resultado.datos)
+    st.dataframe(datos, use_container_width=True, hide_index=True, column_config=columnas_fecha(datos))
+    st.caption(
+        f"Página {resultado.pagina} de {resultado.paginas} · "
+        f"Filas {resultado.primera_fila}–{resultado.ultima_fila} de {resultado.filas_filtradas:,}"
+        f"{f' (filtradas de {resultado.filas_totales:,})' if filtro else ''} · "
+        f"{len(columnas)} de {len(todas)} columnas · consulta en {resultado.duracion_s * 1000:.1f} ms"
+    )
+
+
+def columnas_fecha(df):
+    """Formato de solo fecha para las columnas datetime (el almacén guarda 'Mes'/'Fecha' como datetime64)"""
+    import streamlit as st
+
+    return {columna: st.column_config.DateColumn(columna, format="YYYY-MM-DD")
+            for columna in df.columns if str(df[columna].dtype).startswith("datetime64")}
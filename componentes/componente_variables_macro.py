@@ -1,7 +1,8 @@
 def C_variables_macro(model_G):
     import streamlit as st
-    import numpy as np
-    import pandas as pd
+    from servicios.motor_prediccion import obtener_motor
+    from componentes.componente_sensibilidad import C_sensibilidad
+    from componentes.componente_backtest import C_metricas_backtest
     
     st.header("📊 Predicción con Variables Macroeconómicas")
     
@@ -12,7 +13,7 @@ def C_variables_macro(model_G):
     with st.expander("ℹ️ Información del Modelo"):
         st.write("**Tipo de Modelo:** RandomForest")
         st.write("**Preprocesamiento:** Datos Originales (sin estandarización)")
-        st.write("**R² Esperado:** 0.999706")
+        C_metricas_backtest("G")
         st.write("**Variables utilizadas:**")
         st.write("- IPC-Mensual")
         st.write("- DOLAR OFICIAL $/US$")
@@ -61,31 +62,12 @@ def C_variables_macro(model_G):
             - Afecta competitividad exportadora
             """)
     
-    # Función para hacer predicción con manejo correcto del scaler
-    def hacer_prediccion_variables_macro(modelo_completo, valores):
-        # Crear DataFrame con nombres de columnas correctos
-        feature_names = ['IPC-Mensual', 'DOLAR OFICIAL $/US$']
-        df_entrada = pd.DataFrame([valores], columns=feature_names)
-        
-        # Aplicar preprocesamiento si es necesario
-        if modelo_completo.get('scaler') is not None:
-            st.info("✅ Aplicando preprocesamiento")
-            datos_procesados = modelo_completo['scaler'].transform(df_entrada)
-            # Convertir de vuelta a DataFrame para mantener nombres de columnas
-            datos_procesados = pd.DataFrame(datos_procesados, columns=feature_names)
-        else:
-            st.info("✅ Usando datos originales (sin preprocesamiento - no se estandarizan ni se normalizan)")
-            datos_procesados = df_entrada
-        
-        # Hacer predicción
-        prediccion = modelo_completo['modelo'].predict(datos_procesados)
-        return prediccion[0]
+    # Valores en el orden de las variables del modelo
+    valores = [ipc_mensual, dolar_oficial]
     
     # Botón para realizar predicción
     if st.button("🔮 Predecir Precio con Variables Macro", key="boton_variables_macro"):
         # Validar que no haya valores negativos
-        valores = [ipc_mensual, dolar_oficial]
-        
         if any(v < 0 for v in valores):
             st.error("❌ Por favor, ingrese solo valores positivos.")
         elif any(v == 0 for v in valores):
@@ -95,7 +77,12 @@ def C_variables_macro(model_G):
                 # Verificar si el modelo es el formato completo PKL o solo el modelo sklearn
                 if isinstance(model_G, dict) and 'modelo' in model_G:
                     # Es el formato completo PKL
-                    prediccion = hacer_prediccion_variables_macro(model_G, valores)
+                    motor = obtener_motor("G", model_G)
+                    if motor.escalado:
+                        st.info("✅ Aplicando preprocesamiento")
+                    else:
+                        st.info("✅ Usando datos originales (sin preprocesamiento - no se estandarizan ni se normalizan)")
+                    prediccion = motor.predecir(valores)
                     st.success(f"🥛 **Precio de Leche Predicho: ${prediccion:.6f}/litro**")
                     
                     # Mostrar detalles adicionales
@@ -152,9 +139,8 @@ def C_variables_macro(model_G):
                 else:
                     # Es solo el modelo sklearn (formato antiguo)
                     st.warning("⚠️ Modelo en formato legacy. Aplicando predicción directa.")
-                    datos_entrada = np.array([valores])
-                    prediccion = model_G.predict(datos_entrada)
-                    st.success(f"🥛 **Precio de Leche Predicho: ${prediccion[0]:.6f}/litro**")
+                    prediccion = obtener_motor("G", model_G).predecir(valores)
+                    st.success(f"🥛 **Precio de Leche Predicho: ${prediccion:.6f}/litro**")
                 
                 # Interpretación de resultados
                 st.subheader("📊 Interpretación del Precio")
@@ -208,12 +194,15 @@ def C_variables_macro(model_G):
     st.subheader("✨ Ventajas del Modelo Macroeconómico")
     st.success("""
     **🎯 Simplicidad:** Solo 2 variables fáciles de obtener
-    **📊 Alta Precisión:** R² > 0.999 con variables básicas
+    **📊 Alta Precisión:** Buen ajuste fuera de muestra con variables básicas (ver backtest)
     **🔄 Actualización Rápida:** Datos disponibles mensualmente
     **📈 Interpretación Clara:** Relación directa inflación-precios
     **🌐 Visión Macro:** Se enfoca en tendencias económicas generales
     """)
     
+    # Sensibilidad alrededor de los valores ingresados
+    C_sensibilidad("G", model_G, valores)
+    
     # Mostrar información adicional
     st.subheader("💡 Consejos de Uso")
     st.info("""
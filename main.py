@@ -1,9 +1,21 @@
 # Librerías
 import streamlit as st
 import pandas as pd
-import pickle
 import os
-import gdown
+import time
+
+# Inicio del rerun (el tiempo total se registra al final del script)
+inicio_rerun = time.perf_counter()
+
+# Servicios
+from servicios.registro_modelos import obtener_registro, ErrorCargaModelo
+from servicios.arranque import obtener_estado_arranque
+from servicios.cache_predicciones import obtener_cache
+from servicios.cache_figuras import huella_archivos
+from servicios.almacen_datos import nombre_dataset, obtener_almacen
+from servicios.lector_csv import ErrorLecturaCSV, leer_csv
+from servicios.esquema_datos import aplicar_esquema, reporte_memoria
+from servicios.telemetria import obtener_telemetria
 
 # Componentes
 from componentes.componente_prediccion import C_prediccion
@@ -17,6 +29,9 @@ from componentes.componente_precio_internacional import C_precio_internacional
 from componentes.componente_precio_novillos import C_precio_novillos
 from componentes.componente_variables_macro import C_variables_macro
 from componentes.componente_productos_lacteos import C_productos_lacteos
+from componentes.componente_lote import C_prediccion_lote
+from componentes.componente_pronostico import C_pronostico
+from componentes.componente_rendimiento import C_rendimiento
 
 # Configuración de la página
 st.set_page_config(page_title="MilkCast", layout="wide")
@@ -35,8 +50,15 @@ st.markdown("""
 
 st.markdown("<h1 style='font-size: 50px;'>ML en el sector agropecuario</h1>", unsafe_allow_html=True)
 
+# Tiempos por etapa compartidos por todas las sesiones del proceso
+telemetria = obtener_telemetria()
+
+# La pestaña de rendimiento solo se muestra si el servidor se inició con MILKCAST_ADMIN=1
+# (no se habilita desde la URL: cualquier visitante podría reiniciar mediciones o recargar modelos)
+modo_admin = os.environ.get("MILKCAST_ADMIN") == "1"
+
 # Creación de pestañas
-tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8, tab9, tab10 = st.tabs([
+pestañas = st.tabs([
     "📊 Datos y Gráficos", 
     "💱 IPC y Dólar", 
     "🥛 Productos Básicos",
@@ -46,111 +68,17 @@ tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8, tab9, tab10 = st.tabs([
     "🌍 Internacional", 
     "🐄 Novillos", 
     "📊 Variables Macro", 
-    "🥛 Productos H"
-])
-
-# URLs de los modelos y archivos en Google Drive (usando el formato adecuado para gdown)
-# IMPORTANTE: Para que las descargas funcionen correctamente:
-# 1. Los archivos en Google Drive deben ser públicos (compartir con "cualquier persona con el enlace")
-# 2. Usar el formato: https://drive.google.com/file/d/ID_DEL_ARCHIVO
-# 3. Si hay errores de descarga, verificar permisos en Google Drive
-files_to_download = {
-    # Modelos ya usados en la app
-    "https://drive.google.com/file/d/16ZqjF63HtFxV7fIVqJY-EQgIP0nGBgSA": "modelo_regresion-Precio-IPC-Dolar.pkl",
-    "https://drive.google.com/file/d/1lp3kmeGeTPVx8-QZu6HFcSPqJFbU2zya": "modelo_regresion-Precio-ComEnt-Queso-Yogur.pkl",
-
-    # Modelos OCLA (REEMPLAZAR con los IDs/URLs reales)
-    "https://drive.google.com/file/d/1HVDxaJpuWk3rUIPOlXBsIFyWW32syuRi": "modelo_A_rentabilidad.pkl",
-    "https://drive.google.com/file/d/1kRIzujwRxQzJ9b738D_oBPMJVNeU9DLZ": "modelo_B_costos.pkl",
-    "https://drive.google.com/file/d/1r5PDqxLNQOD2QKQXJd5XFfKg5K72V_Jm": "modelo_D_precio_queso.pkl",
-    "https://drive.google.com/file/d/1BjwGFe_djZ3c3W6XuedKQkorDB4cp4Yk": "modelo_E_precio_internacional.pkl",
-    "https://drive.google.com/file/d/1VprLKVHthzzGnt7MB14KyTPmL9qUsGvt": "modelo_F_precio_novillos.pkl",
-    "https://drive.google.com/file/d/1qcHUmGB9DKe9lrmzkfUZrvBPGQF7Sedh": "modelo_G_variables_macroeconomicas.pkl",
-    "https://drive.google.com/file/d/1plMbfsdqBAZAJxy9ziQdflrsD39_Fi13": "modelo_H_productos_lacteos.pkl",
-
-    # CSVs usados por la app (REEMPLAZAR con IDs/URLs reales)
-    "https://drive.google.com/file/d/1oa0iGxqlGgOmWpfLWO7pMeYjGuv4AFzV": "archivo.csv",
-    "https://drive.google.com/file/d/1Xr7IbFcIdZvbrCsqKzv7fR-XW8zhdZ2I": "dataset_LIMPIO_original.csv",
-}
-
-# Directorio donde se guardarán los modelos
-modelos_dir = "modelos"
-os.makedirs(modelos_dir, exist_ok=True)
-
-# Función para verificar si un archivo PKL es válido
-def verificar_archivo_pkl(path):
-    """Verifica si un archivo PKL es válido y no está corrupto"""
-    try:
-        with open(path, 'rb') as f:
-            # Leer los primeros bytes para verificar que no sea HTML
-            primeros_bytes = f.read(100)
-            f.seek(0)  # Volver al inicio
-            
-            # Si empieza con '<', probablemente es HTML (error de Google Drive)
-            if primeros_bytes.startswith(b'<'):
-                return False, "El archivo parece ser HTML en lugar de un modelo PKL"
-            
-            # Intentar cargar el pickle para verificar que es válido
-            pickle.load(f)
-            return True, "Archivo PKL válido"
-    except Exception as e:
-        return False, f"Error validando PKL: {str(e)}"
-
-# Función para descargar un archivo si no existe
-def descargar_modelo(url, path):
-    archivo_existe = os.path.exists(path)
-    archivo_valido = False
-    
-    if archivo_existe:
-        if path.endswith('.pkl'):
-            archivo_valido, mensaje = verificar_archivo_pkl(path)
-            if not archivo_valido:
-                print(f"⚠️ {os.path.basename(path)} existe pero está corrupto: {mensaje}")
-                print(f"🔄 Re-descargando {os.path.basename(path)}...")
-                os.remove(path)  # Eliminar archivo corrupto
-                archivo_existe = False
-        else:
-            archivo_valido = True  # Para CSVs e imágenes, asumir que están bien si existen
-    
-    if not archivo_existe or not archivo_valido:
-        print(f"📥 Descargando {os.path.basename(path)}...")
-        try:
-            # Utilizamos gdown para descargar el archivo
-            # gdown acepta tanto URLs tipo /file/d/ID como /uc?id=ID
-            gdown.download(url, path, quiet=False)
-            
-            # Verificar que el archivo descargado sea válido (solo para PKL)
-            if path.endswith('.pkl'):
-                es_valido, mensaje = verificar_archivo_pkl(path)
-                if es_valido:
-                    print(f"✅ {os.path.basename(path)} descargado y validado correctamente.")
-                else:
-                    print(f"❌ {os.path.basename(path)} descargado pero no es válido: {mensaje}")
-                    print("💡 Verifica que la URL de Google Drive sea pública y correcta.")
-            else:
-                print(f"✅ {os.path.basename(path)} descargado correctamente.")
-                
-        except Exception as e:
-            print(f"❌ Error en la descarga de {os.path.basename(path)}: {e}")
-            print("💡 Verifica que la URL de Google Drive sea pública y accesible.")
-    else:
-        print(f"✅ {os.path.basename(path)} ya existe y es válido.")
-
-# Descargar todos los archivos listados en files_to_download (si no existen)
-st.info("🔄 Verificando y descargando archivos necesarios...")
-archivos_descargados = []
-archivos_con_error = []
-
-for url, filename in files_to_download.items():
-    target_path = os.path.join(modelos_dir, filename)
-    try:
-        descargar_modelo(url, target_path)
-        if os.path.exists(target_path):
-            archivos_descargados.append(filename)
-        else:
-            archivos_con_error.append(filename)
-    except Exception as e:
-        archivos_con_error.append(f"{filename} (Error: {str(e)})")
+    "🥛 Productos H",
+    "📦 Lotes",
+    "🔮 Pronóstico"
+] + (["🛠️ Rendimiento"] if modo_admin else []))
+tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8, tab9, tab10, tab11, tab12 = pestañas[:12]
+
+# Fase de arranque: descarga/verificación de archivos, imágenes y listado de la carpeta
+# modelos. Se ejecuta una sola vez por proceso; los reruns solo leen el estado guardado.
+estado_arranque = obtener_estado_arranque()
+archivos_descargados = estado_arranque.archivos_descargados
+archivos_con_error = estado_arranque.archivos_con_error
 
 # Mostrar resumen de descargas
 if archivos_descargados:
@@ -176,76 +104,23 @@ if archivos_con_error:
            - Verificar que los archivos PKL no estén corruptos en Google Drive
         """)
 
-# Función para cargar los modelos en caché usando st.cache_resource
-@st.cache_resource
-def cargar_modelo(path):
-    with open(path, 'rb') as file:
-        return pickle.load(file)
+# Registro de modelos compartido por todas las sesiones del proceso
+registro_modelos = obtener_registro()
 
 # Función para cargar modelos locales (DESDE CARPETA MODELOS)
-@st.cache_resource
-def cargar_modelo_local(nombre_modelo):
-    """Carga modelos desde la carpeta modelos con validación robusta"""
+def cargar_modelo_local(modelo_id):
+    """Obtiene un modelo del registro (se deserializa solo la primera vez que se pide)"""
     try:
-        # Ruta hacia la carpeta modelos
-        ruta = os.path.join(modelos_dir, f"{nombre_modelo}.pkl")
-        
-        if not os.path.exists(ruta):
-            st.error(f"❌ No se encontró el modelo: {ruta}")
-            return None
-        
-        # Verificar tamaño del archivo
-        tamaño_archivo = os.path.getsize(ruta)
-        if tamaño_archivo < 1000:  # Menos de 1KB probablemente está corrupto
-            st.error(f"❌ {nombre_modelo}: Archivo muy pequeño ({tamaño_archivo} bytes), probablemente corrupto")
-            return None
-        
-        # Verificar que no sea HTML (error de Google Drive)
-        with open(ruta, 'rb') as f:
-            primeros_bytes = f.read(100)
-            if primeros_bytes.startswith(b'<'):
-                st.error(f"❌ {nombre_modelo}: El archivo descargado es HTML en lugar de un modelo PKL")
-                st.info("💡 La URL de Google Drive podría no ser pública o estar mal configurada")
-                return None
-        
-        # Cargar el modelo
-        with open(ruta, 'rb') as f:
-            modelo = pickle.load(f)
-            st.success(f"✅ {nombre_modelo} cargado correctamente")
-            return modelo
-            
-    except pickle.UnpicklingError as e:
-        st.error(f"❌ {nombre_modelo}: Error de deserialización - {str(e)}")
-        st.info("💡 El archivo PKL podría estar corrupto o ser incompatible")
+        with telemetria.medir("modelo.obtener", modelo=modelo_id):
+            return registro_modelos.obtener(modelo_id)
+    except ErrorCargaModelo as e:
+        st.error(f"❌ {str(e)}")
+        st.info("💡 El archivo PKL podría estar corrupto, ser incompatible o la URL de Google Drive no ser pública")
         return None
     except Exception as e:
-        st.error(f"❌ Error cargando {nombre_modelo}: {str(e)}")
+        st.error(f"❌ Error cargando {modelo_id}: {str(e)}")
         return None
 
-# Cargar los modelos existentes (se cargan solo una vez)
-model1 = cargar_modelo(os.path.join(modelos_dir, "modelo_regresion-Precio-IPC-Dolar.pkl"))
-model2 = cargar_modelo(os.path.join(modelos_dir, "modelo_regresion-Precio-ComEnt-Queso-Yogur.pkl"))
-
-# Cargar los nuevos modelos OCLA (PARA DESARROLLO LOCAL)
-try:
-    model_A = cargar_modelo_local("modelo_A_rentabilidad")
-    model_B = cargar_modelo_local("modelo_B_costos") 
-    model_D = cargar_modelo_local("modelo_D_precio_queso")
-    model_E = cargar_modelo_local("modelo_E_precio_internacional")
-    model_F = cargar_modelo_local("modelo_F_precio_novillos")
-    model_G = cargar_modelo_local("modelo_G_variables_macroeconomicas") 
-    model_H = cargar_modelo_local("modelo_H_productos_lacteos")
-    
-    modelos_ocla_cargados = True
-    st.success("✅ Todos los modelos OCLA cargados correctamente")
-    
-except Exception as e:
-    modelos_ocla_cargados = False
-    st.warning(f"⚠️ Algunos modelos OCLA no pudieron cargarse: {e}")
-    
-    # Crear modelos dummy para evitar errores
-    model_A = model_B = model_D = model_E = model_F = model_G = model_H = None
-
 # Función para mostrar tipo y verificar método 'predict' en los modelos
 def mostrar_info_modelo(model, nombre_modelo):
     tipo_modelo = type(model)
@@ -257,65 +132,52 @@ def mostrar_info_modelo(model, nombre_modelo):
 
 # Mostrar la información sobre los modelos cargados
 with st.expander("Información de los Modelos"):
-    mostrar_info_modelo(model2, "Modelo de Predicción")
-    mostrar_info_modelo(model1, "Modelo de Clasificación")
-    
-    # Información adicional sobre archivos descargados
+    mostrar_info_modelo(cargar_modelo_local("productos"), "Modelo de Predicción")
+    mostrar_info_modelo(cargar_modelo_local("ipc_dolar"), "Modelo de Clasificación")
+
+    # Tiempo y memoria de carga de cada modelo (solo los ya cargados por alguna pestaña)
+    st.markdown("### ⏱️ Carga de modelos en este proceso:")
+    estadisticas_carga = registro_modelos.estadisticas()
+    if estadisticas_carga:
+        st.dataframe(pd.DataFrame([{
+            "Modelo": e.modelo_id,
+            "Archivo": e.archivo,
+            "Formato": e.formato,
+            "Tiempo de carga (ms)": round(e.tiempo_s * 1000, 2),
+            "Memoria (KB)": round(e.memoria_bytes / 1024, 1),
+            "Tamaño archivo (KB)": round(e.tamaño_archivo / 1024, 1),
+            "Estado": e.error or (f"⚠️ {e.aviso}" if e.aviso else "✅ Cargado"),
+        } for e in estadisticas_carga]), hide_index=True, use_container_width=True)
+
+    # Efectividad de la caché de predicciones (compartida por todas las sesiones)
+    st.markdown("### 🧠 Caché de predicciones:")
+    estadisticas_cache = obtener_cache().estadisticas()
+    col_cache1, col_cache2, col_cache3, col_cache4 = st.columns(4)
+    col_cache1.metric("Aciertos", f"{estadisticas_cache.aciertos:,}")
+    col_cache2.metric("Fallos", f"{estadisticas_cache.fallos:,}")
+    col_cache3.metric("Tasa de aciertos", f"{estadisticas_cache.tasa_aciertos:.1%}")
+    col_cache4.metric("Entradas", f"{estadisticas_cache.entradas:,}/{estadisticas_cache.max_entradas:,}")
+    st.caption(f"Vencidas: {estadisticas_cache.vencidas:,} · Desalojadas: {estadisticas_cache.desalojadas:,} · "
+               f"Vida de cada entrada: {estadisticas_cache.ttl_s / 60:.0f} min")
+
+    # Información adicional sobre archivos descargados (calculada en el arranque)
     st.markdown("### 📁 Estado de archivos en carpeta modelos:")
-    try:
-        archivos_modelos = os.listdir(modelos_dir)
-        for archivo in sorted(archivos_modelos):
-            if archivo.endswith('.pkl'):
-                ruta_completa = os.path.join(modelos_dir, archivo)
-                tamaño = os.path.getsize(ruta_completa) / 1024  # KB
-                
-                # Verificar si es un archivo válido
-                if tamaño < 1:
-                    estado = "❌ Muy pequeño (corrupto)"
-                else:
-                    try:
-                        with open(ruta_completa, 'rb') as f:
-                            primeros_bytes = f.read(10)
-                            if primeros_bytes.startswith(b'<'):
-                                estado = "❌ HTML (error de Drive)"
-                            else:
-                                estado = "✅ Formato correcto"
-                    except:
-                        estado = "❌ Error al leer"
-                
-                st.write(f"- **{archivo}** ({tamaño:.2f} KB) - {estado}")
-    except Exception as e:
-        st.write(f"Error listando archivos: {e}")
-
-# URLs de las imágenes en Google Drive (en formato adecuado)
-url_mapa_unidades = "https://drive.google.com/uc?id=1PgVHUgz2u9iOgDUcF4UL4JgVc9DUJj4u"
-url_grafico_barras = "https://drive.google.com/uc?id=1Ht0_HTgXLnOLwoPUFL6AMyakgz40S2tq"
-
-# Directorio donde se guardarán las imágenes
-imagenes_dir = "imagenes"
-os.makedirs(imagenes_dir, exist_ok=True)
-
-# Función para descargar una imagen si no existe
-def descargar_imagen(url, path):
-    if not os.path.exists(path):
-        print(f"Descargando {os.path.basename(path)}...")
-        try:
-            # Utilizamos gdown para descargar la imagen
-            gdown.download(url, path, quiet=False)
-            print(f"Imagen descargada y guardada en {path}.")
-        except Exception as e:
-            print(f"Error en la descarga de la imagen: {e}")
-    else:
-        print(f"La imagen {os.path.basename(path)} ya existe.")
-
-# Descargar las imágenes si no existen
-descargar_imagen(url_mapa_unidades, os.path.join(imagenes_dir, "mapa.png"))
-descargar_imagen(url_grafico_barras, os.path.join(imagenes_dir, "grafico.png"))
+    if estado_arranque.error_listado:
+        st.write(f"Error listando archivos: {estado_arranque.error_listado}")
+    for archivo in estado_arranque.archivos:
+        if archivo.nombre.endswith('.pkl'):
+            st.write(f"- **{archivo.nombre}** ({archivo.tamaño_kb:.2f} KB) - {archivo.estado}")
+    for archivo, estado_dataset in estado_arranque.datasets.items():
+        st.write(f"- **{archivo}** → Parquet - {estado_dataset}")
+    st.caption(f"🚀 Arranque del servidor: {estado_arranque.fecha} ({estado_arranque.duracion_s:.2f} s)")
+
+    # Se completa al final del script, con todo lo que dejaron las pestañas en la sesión
+    contenedor_memoria = st.container()
 
 # Función para cargar CSVs con manejo robusto de errores
 @st.cache_data
-def cargar_csv_seguro(ruta_archivo, nombre_archivo):
-    """Carga un CSV con manejo robusto de errores"""
+def cargar_csv_seguro(ruta_archivo, nombre_archivo, huella=None):
+    """Carga un CSV en una sola pasada, apartando las líneas que no se pueden parsear"""
     try:
         # Verificar que el archivo existe
         if not os.path.exists(ruta_archivo):
@@ -326,50 +188,56 @@ def cargar_csv_seguro(ruta_archivo, nombre_archivo):
         file_size = os.path.getsize(ruta_archivo) / (1024 * 1024)  # MB
         st.info(f"📄 Cargando {nombre_archivo} ({file_size:.2f} MB)")
         
-        # Intentar carga normal primero
-        df = pd.read_csv(ruta_archivo)
-        st.success(f"✅ {nombre_archivo} cargado correctamente ({df.shape[0]} filas, {df.shape[1]} columnas)")
-        return df
-        
-    except pd.errors.ParserError as e:
-        st.warning(f"⚠️ Error de parsing en {nombre_archivo}: {str(e)}")
-        st.info("🔧 Intentando métodos alternativos de carga...")
-        
-        # Método 1: Intentar con sep=None y engine='python'
-        try:
-            df = pd.read_csv(ruta_archivo, sep=None, engine='python', on_bad_lines='skip')
-            st.info(f"✅ {nombre_archivo} cargado con separador automático ({df.shape[0]} filas, {df.shape[1]} columnas)")
-            return df
-        except Exception:
-            pass
+        # Delimitador y comillas detectados en una muestra; una sola pasada de parseo
+        with telemetria.medir("csv.cargar", archivo=nombre_archivo):
+            resultado = leer_csv(ruta_archivo)
+            df = aplicar_esquema(nombre_dataset(nombre_archivo), resultado.df)
+        st.success(f"✅ {nombre_archivo} cargado correctamente ({df.shape[0]} filas, {df.shape[1]} columnas, "
+                   f"{resultado.duracion_s * 1000:.0f} ms)")
         
-        # Método 2: Intentar con delimitador de coma y manejo de errores
-        try:
-            df = pd.read_csv(ruta_archivo, sep=',', on_bad_lines='skip', quoting=1)
-            st.info(f"✅ {nombre_archivo} cargado omitiendo líneas problemáticas ({df.shape[0]} filas, {df.shape[1]} columnas)")
-            return df
-        except Exception:
-            pass
-        
-        # Método 3: Intentar leyendo solo las primeras líneas para diagnóstico
-        try:
-            df_sample = pd.read_csv(ruta_archivo, nrows=10, on_bad_lines='skip')
-            st.warning(f"⚠️ Solo se pudieron cargar las primeras 10 filas de {nombre_archivo}")
-            st.info(f"📊 Muestra: {df_sample.shape[0]} filas, {df_sample.shape[1]} columnas")
-            return df_sample
-        except Exception:
-            pass
+        if resultado.tiene_descartadas:
+            st.warning(f"⚠️ {len(resultado.descartadas)} líneas de {nombre_archivo} quedaron en cuarentena "
+                       f"(delimitador {resultado.formato.delimitador!r})")
+            st.dataframe(pd.DataFrame([(d.linea, d.motivo) for d in resultado.descartadas],
+                                      columns=["Línea", "Motivo"]), hide_index=True)
+        return df
         
-        st.error(f"❌ No se pudo cargar {nombre_archivo} con ningún método")
+    except ErrorLecturaCSV as e:
+        st.error(f"❌ {str(e)}")
         return pd.DataFrame()
         
     except Exception as e:
         st.error(f"❌ Error inesperado cargando {nombre_archivo}: {str(e)}")
         return pd.DataFrame()
 
-# Cargar los archivos CSV con manejo robusto de errores
-df = cargar_csv_seguro("modelos/archivo.csv", "archivo.csv")
-df2 = cargar_csv_seguro("modelos/dataset_LIMPIO_original.csv", "dataset_LIMPIO_original.csv")
+almacen_datos = obtener_almacen()
+
+@st.cache_data(max_entries=8)
+def leer_dataset(nombre, huella):
+    """Lee un dataset del almacén Parquet (la huella cambia cuando cambian sus archivos)"""
+    with telemetria.medir("dataset.leer", dataset=nombre):
+        df = aplicar_esquema(nombre, almacen_datos.leer(nombre))
+    st.success(f"✅ {nombre} cargado desde Parquet ({df.shape[0]} filas, {df.shape[1]} columnas)")
+    return df
+
+def huella_dataset(archivo_csv):
+    """Huella de los archivos de los que se leen los datos (Parquet o, si no existe, el CSV)"""
+    partes = almacen_datos.partes(nombre_dataset(archivo_csv))
+    return huella_archivos(partes or [os.path.join("modelos", archivo_csv)])
+
+def cargar_dataset(archivo_csv):
+    """Carga un dataset desde el almacén Parquet, o desde el CSV si no se pudo convertir"""
+    nombre = nombre_dataset(archivo_csv)
+    if almacen_datos.existe(nombre):
+        return leer_dataset(nombre, huella_dataset(archivo_csv))
+    return cargar_csv_seguro(os.path.join("modelos", archivo_csv), archivo_csv, huella_dataset(archivo_csv))
+
+# Cargar los datasets (convertidos a Parquet en el arranque). La huella de cada uno
+# hace que, al agregarle meses, se vuelva a leer (solo las partes nuevas) y se
+# rearmen solo sus gráficos; mientras no cambie, todo sale de la caché
+df = cargar_dataset("archivo.csv")
+df2 = cargar_dataset("dataset_LIMPIO_original.csv")
+huella_datos = (huella_dataset("archivo.csv"), huella_dataset("dataset_LIMPIO_original.csv"))
 
 # Función para limpiar el estado cuando se cambia de tab
 def limpiar_estado_tab_actual(tab_seleccionado):
@@ -397,22 +265,18 @@ with tab1:
         # Mostrar información de debugging
         with st.expander("🔍 Información de Debugging"):
             st.write("**Archivos en la carpeta modelos:**")
-            try:
-                archivos_modelos = os.listdir("modelos")
-                for archivo in archivos_modelos:
-                    ruta_completa = os.path.join("modelos", archivo)
-                    if os.path.isfile(ruta_completa):
-                        tamaño = os.path.getsize(ruta_completa) / 1024  # KB
-                        st.write(f"- {archivo} ({tamaño:.2f} KB)")
-            except Exception as e:
-                st.write(f"Error listando archivos: {e}")
+            if estado_arranque.error_listado:
+                st.write(f"Error listando archivos: {estado_arranque.error_listado}")
+            for archivo in estado_arranque.archivos:
+                st.write(f"- {archivo.nombre} ({archivo.tamaño_kb:.2f} KB)")
                 
         st.info("💡 **Solución temporal:** La aplicación continuará funcionando con las otras pestañas (modelos de ML).")
     
     else:
         # Solo ejecutar visualizaciones si ambos DataFrames están disponibles
         try:
-            C_visualizacion(df, df2)
+            with telemetria.medir("pestaña.render", pestaña="Datos y Gráficos"):
+                C_visualizacion(df, df2, imagenes=estado_arranque.imagenes, huella_datos=huella_datos)
         except Exception as e:
             st.error(f"❌ Error en visualizaciones: {str(e)}")
             st.info("📊 Las visualizaciones no están disponibles temporalmente.")
@@ -450,74 +314,119 @@ with tab1:
     )
 
 # Contenido de la pestaña 2: Prediccion con IPC y dolar
-with tab2:
+with tab2, telemetria.medir("pestaña.render", pestaña="IPC y Dólar"):
     limpiar_estado_tab_actual("Prediccion con IPC y dolar")  # Limpiar las otras pestañas al entrar a esta
-    C_prediccion(model1)
+    model1 = cargar_modelo_local("ipc_dolar")
+    if model1 is not None:
+        C_prediccion(model1)
 
 # Contenido de la pestaña 3: Prediccion con productos
-with tab3:
+with tab3, telemetria.medir("pestaña.render", pestaña="Productos Básicos"):
     limpiar_estado_tab_actual("Prediccion con productos")  # Limpiar las otras pestañas al entrar a esta
-    C_clasificacion(model2)
+    model2 = cargar_modelo_local("productos")
+    if model2 is not None:
+        C_clasificacion(model2)
 
 # Contenido de la pestaña 4: Rentabilidad (Modelo A)
-with tab4:
+with tab4, telemetria.medir("pestaña.render", pestaña="Rentabilidad"):
     limpiar_estado_tab_actual("Rentabilidad")
-    if modelos_ocla_cargados and model_A is not None:
+    model_A = cargar_modelo_local("A")
+    if model_A is not None:
         C_rentabilidad(model_A)
     else:
         st.error("❌ Modelo A (Rentabilidad) no disponible. Verifique que el archivo PKL esté en la carpeta correcta.")
         st.info("📁 Ruta esperada: modelos/modelo_A_rentabilidad.pkl")
 
 # Contenido de la pestaña 5: Costos (Modelo B)
-with tab5:
+with tab5, telemetria.medir("pestaña.render", pestaña="Costos"):
     limpiar_estado_tab_actual("Costos")
-    if modelos_ocla_cargados and model_B is not None:
+    model_B = cargar_modelo_local("B")
+    if model_B is not None:
         C_costos(model_B)
     else:
         st.error("❌ Modelo B (Costos) no disponible. Verifique que el archivo PKL esté en la carpeta correcta.")
         st.info("📁 Ruta esperada: modelos/modelo_B_costos.pkl")
 
 # Contenido de la pestaña 6: Precio Queso (Modelo D)
-with tab6:
+with tab6, telemetria.medir("pestaña.render", pestaña="Precio Queso"):
     limpiar_estado_tab_actual("Precio Queso")
-    if modelos_ocla_cargados and model_D is not None:
+    model_D = cargar_modelo_local("D")
+    if model_D is not None:
         C_precio_queso(model_D)
     else:
         st.error("❌ Modelo D (Precio Queso) no disponible. Verifique que el archivo PKL esté en la carpeta correcta.")
         st.info("📁 Ruta esperada: modelos/modelo_D_precio_queso.pkl")
 
 # Contenido de la pestaña 7: Precio Internacional (Modelo E)
-with tab7:
+with tab7, telemetria.medir("pestaña.render", pestaña="Internacional"):
     limpiar_estado_tab_actual("Internacional")
-    if modelos_ocla_cargados and model_E is not None:
+    model_E = cargar_modelo_local("E")
+    if model_E is not None:
         C_precio_internacional(model_E)
     else:
         st.error("❌ Modelo E (Precio Internacional) no disponible. Verifique que el archivo PKL esté en la carpeta correcta.")
         st.info("📁 Ruta esperada: modelos/modelo_E_precio_internacional.pkl")
 
 # Contenido de la pestaña 8: Precio Novillos (Modelo F)
-with tab8:
+with tab8, telemetria.medir("pestaña.render", pestaña="Novillos"):
     limpiar_estado_tab_actual("Novillos")
-    if modelos_ocla_cargados and model_F is not None:
+    model_F = cargar_modelo_local("F")
+    if model_F is not None:
         C_precio_novillos(model_F)
     else:
         st.error("❌ Modelo F (Precio Novillos) no disponible. Verifique que el archivo PKL esté en la carpeta correcta.")
         st.info("📁 Ruta esperada: modelos/modelo_F_precio_novillos.pkl")
 
 # Contenido de la pestaña 9: Variables Macro (Modelo G)
-with tab9:
+with tab9, telemetria.medir("pestaña.render", pestaña="Variables Macro"):
     limpiar_estado_tab_actual("Variables Macro")
-    if modelos_ocla_cargados and model_G is not None:
+    model_G = cargar_modelo_local("G")
+    if model_G is not None:
         C_variables_macro(model_G)
     else:
         st.error("❌ Modelo G (Variables Macro) no disponible. Verifique que el archivo PKL esté en la carpeta correcta.")
         st.info("📁 Ruta esperada: modelos/modelo_G_variables_macroeconomicas.pkl")
 
 # Contenido de la pestaña 10: Productos Lácteos (Modelo H)
-with tab10:
+with tab10, telemetria.medir("pestaña.render", pestaña="Productos H"):
     limpiar_estado_tab_actual("Productos H")
-    if modelos_ocla_cargados and model_H is not None:
+    model_H = cargar_modelo_local("H")
+    if model_H is not None:
         C_productos_lacteos(model_H)
     else:
         st.error("❌ Modelo H (Productos Lácteos) no disponible. Verifique que el archivo PKL esté en la carpeta correcta.")
         st.info("📁 Ruta esperada: modelos/modelo_H_productos_lacteos.pkl")
+
+# Contenido de la pestaña 11: Predicción por lotes (cualquier modelo)
+with tab11, telemetria.medir("pestaña.render", pestaña="Lotes"):
+    limpiar_estado_tab_actual("Lotes")
+    C_prediccion_lote(cargar_modelo_local)
+
+# Contenido de la pestaña 12: Pronóstico de precios a varios meses
+with tab12, telemetria.medir("pestaña.render", pestaña="Pronóstico"):
+    limpiar_estado_tab_actual("Pronóstico")
+    C_pronostico()
+
+# Memoria de esta sesión: los DataFrames (compartidos por la caché entre sesiones) y
+# lo que cada pestaña guardó en session_state
+with contenedor_memoria:
+    st.markdown("### 💾 Memoria de la sesión:")
+    estado_sesion = dict(st.session_state)
+    memoria = reporte_memoria({"df (archivo.csv)": df, "df2 (dataset_LIMPIO_original.csv)": df2,
+                               f"session_state ({len(estado_sesion)} valores)": estado_sesion})
+    # Además del total, los valores de session_state de 1 KB o más
+    memoria_detalle = [m for m in reporte_memoria({f"session_state['{k}']": v for k, v in estado_sesion.items()})
+                       if m.bytes >= 1024]
+    st.dataframe(pd.DataFrame([{
+        "Objeto": m.nombre,
+        "Tipo": m.tipo,
+        "Memoria (KB)": round(m.bytes / 1024, 1),
+        "Con tipos por defecto (KB)": round(m.bytes_original / 1024, 1) if m.bytes_original else None,
+    } for m in memoria + memoria_detalle]), hide_index=True, use_container_width=True)
+    st.caption(f"Total: {sum(m.bytes for m in memoria) / 1024:.1f} KB")
+
+# Pestaña oculta de rendimiento (con el tiempo de este rerun ya registrado)
+telemetria.registrar("script.rerun", time.perf_counter() - inicio_rerun)
+if modo_admin:
+    with pestañas[12]:
+        C_rendimiento()
@@ -0,0 +1,416 @@
+# Almacén columnar de los datasets: cada CSV se convierte una sola vez a Parquet
+# (columnas tipadas y fechas como datetime) y después se lee con memory map y solo
+# las columnas que se piden, sin volver a parsear texto en cada proceso.
+#
+# Estructura en disco:
+#   modelos/datos/<nombre>/parte-00000.parquet   conversión completa del CSV
+#   modelos/datos/<nombre>/parte-00001.parquet   meses agregados después (solo se agregan)
+#   modelos/datos/<nombre>/_fuente.json          huella y SHA-256 del CSV de origen
+#   modelos/datos/<nombre>/_reemplazadas/        partes agregadas que el CSV ya incluye
+#
+# Los meses agregados viven solo en el disco de esta instalación: modelos/datos/ está
+# en .gitignore y no se sube a Drive. Si el CSV cambia, la conversión rehace
+# parte-00000 y conserva las partes agregadas con fechas posteriores al CSV; las que
+# el CSV ya cubre se mueven a _reemplazadas/ (nunca se borran). Para que un mes
+# sobreviva a una instalación nueva hay que agregarlo también al CSV de origen.
+#
+# Conversión manual y carga de meses nuevos (CSV con las mismas columnas):
+#   python -m servicios.almacen_datos
+#   python -m servicios.almacen_datos --agregar nuevos_meses.csv --dataset dataset_LIMPIO_original
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+
+from servicios.cache_figuras import huella_archivos
+from servicios.descargas import calcular_sha256
+from servicios.lector_csv import leer_csv
+from servicios.registro_modelos import MODELOS_DIR
+
+# Directorio del almacén
+DATOS_DIR = os.path.join(MODELOS_DIR, "datos")
+
+# CSVs que se convierten al arrancar
+DATASETS = ("archivo.csv", "dataset_LIMPIO_original.csv")
+
+# Columnas con la fecha de cada fila (se guardan como datetime64)
+COLUMNAS_FECHA = ("Fecha", "Mes")
+
+# Metadatos de la conversión (el prefijo '_' evita que se tome como parte de datos)
+ARCHIVO_FUENTE = "_fuente.json"
+PREFIJO_PARTE = "parte-"
+DIRECTORIO_REEMPLAZADAS = "_reemplazadas"
+
+
+class ErrorIngesta(Exception):
+    """Filas nuevas que no respetan el esquema o el orden del dataset"""
+
+
+@dataclass
+class ResultadoIngesta:
+    """Filas agregadas a un dataset y rango de fechas que cubren"""
+    nombre: str
+    filas: int
+    desde: object
+    hasta: object
+    parte: str
+
+
+@dataclass
+class InfoDataset:
+    """Resumen de un dataset del almacén"""
+    nombre: str
+    filas: int
+    columnas: int
+    partes: int
+    tamaño_bytes: int
+
+
+def nombre_dataset(archivo_csv):
+    """Nombre del dataset en el almacén a partir del archivo CSV ('archivo.csv' -> 'archivo')"""
+    return os.path.splitext(os.path.basename(archivo_csv))[0]
+
+
+def columna_fecha(columnas):
+    """Primera columna de fecha del dataset (None si no tiene)"""
+    return next((c for c in columnas if c in COLUMNAS_FECHA), None)
+
+
+def numero_parte(parte):
+    """Número de una parte a partir de su nombre ('parte-00003.parquet' -> 3)"""
+    return int(os.path.basename(parte)[len(PREFIJO_PARTE):-len(".parquet")])
+
+
+def tipar_columnas(df):
+    """Convierte las columnas de fecha a datetime y las columnas de texto numérico a números"""
+    import pandas as pd
+
+    df = df.copy()
+    for columna in df.columns:
+        if columna in COLUMNAS_FECHA:
+            df[columna] = pd.to_datetime(df[columna], errors='coerce')
+        elif df[columna].dtype == object:
+            numerica = pd.to_numeric(df[columna], errors='coerce')
+            # Solo si todo lo que no estaba vacío se pudo convertir
+            if numerica.notna().sum() == df[columna].notna().sum():
+                df[columna] = numerica
+    return df
+
+
+class AlmacenDatos:
+    """Datasets en Parquet con lectura proyectada y memory map"""
+
+    def __init__(self, directorio=DATOS_DIR, origen_dir=MODELOS_DIR):
+        self.directorio = directorio
+        self.origen_dir = origen_dir
+        self._lock = threading.Lock()
+        # Tablas ya leídas por (nombre, columnas): al agregar partes solo se leen las nuevas
+        self._tablas = {}
+        # Funciones a llamar con (nombre, desde, hasta) cuando cambian los datos
+        self._suscriptores = []
+
+    def suscribir(self, funcion):
+        """Registra una función que se llama con (nombre, desde, hasta) al cambiar un dataset"""
+        if funcion not in self._suscriptores:
+            self._suscriptores.append(funcion)
+
+    def _notificar(self, nombre, desde=None, hasta=None):
+        for funcion in list(self._suscriptores):
+            try:
+                funcion(nombre, desde, hasta)
+            except Exception as e:
+                print(f"⚠️ Error invalidando cachés de {nombre}: {e}")
+
+    def ruta(self, nombre):
+        return os.path.join(self.directorio, nombre)
+
+    def partes(self, nombre):
+        """Archivos Parquet del dataset, en orden de escritura"""
+        ruta = self.ruta(nombre)
+        if not os.path.isdir(ruta):
+            return []
+        return [os.path.join(ruta, f) for f in sorted(os.listdir(ruta))
+                if f.startswith(PREFIJO_PARTE) and f.endswith(".parquet")]
+
+    def existe(self, nombre):
+        return bool(self.partes(nombre))
+
+    def huella(self, nombre):
+        """Huella de los archivos Parquet (cambia si se agregan o reescriben partes)"""
+        return huella_archivos(self.partes(nombre))
+
+    def _leer_fuente(self, nombre):
+        try:
+            with open(os.path.join(self.ruta(nombre), ARCHIVO_FUENTE), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _guardar_fuente(self, nombre, fuente):
+        path = os.path.join(self.ruta(nombre), ARCHIVO_FUENTE)
+        temporal = f"{path}.tmp"
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump(fuente, f, indent=2, ensure_ascii=False)
+        os.replace(temporal, path)
+
+    def esta_actualizado(self, archivo_csv):
+        """True si el dataset existe y se convirtió desde la versión actual del CSV"""
+        nombre = nombre_dataset(archivo_csv)
+        if not self.existe(nombre):
+            return False
+        ruta_csv = os.path.join(self.origen_dir, archivo_csv)
+        if not os.path.exists(ruta_csv):
+            # Sin CSV de origen el almacén es la única copia de los datos
+            return True
+        fuente = self._leer_fuente(nombre)
+        huella = huella_archivos([ruta_csv])
+        if fuente.get("huella_csv") == huella:
+            return True
+        # La huella cambia con solo tocar el archivo (checkout nuevo, descarga repetida):
+        # si el contenido es el mismo se actualiza la huella sin reconvertir
+        if fuente.get("sha256_csv") and fuente["sha256_csv"] == calcular_sha256(ruta_csv):
+            fuente["huella_csv"] = huella
+            with self._lock:
+                self._guardar_fuente(nombre, fuente)
+            return True
+        return False
+
+    def convertir(self, archivo_csv, df=None):
+        """Escribe el dataset completo a Parquet desde el CSV (o desde un DataFrame ya leído)
+
+        Las partes agregadas con fechas posteriores al CSV se conservan; las que el CSV
+        ya cubre (o que no encajan con sus columnas) se mueven a _reemplazadas/
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        nombre = nombre_dataset(archivo_csv)
+        ruta_csv = os.path.join(self.origen_dir, archivo_csv)
+        inicio = time.perf_counter()
+        if df is None:
+            resultado = leer_csv(ruta_csv)
+            df = resultado.df
+            for descartada in resultado.descartadas:
+                print(f"⚠️ {archivo_csv}, línea {descartada.linea} en cuarentena: {descartada.motivo}")
+        tabla = pa.Table.from_pandas(tipar_columnas(df), preserve_index=False)
+
+        with self._lock:
+            ruta = self.ruta(nombre)
+            os.makedirs(ruta, exist_ok=True)
+            destino = os.path.join(ruta, f"{PREFIJO_PARTE}00000.parquet")
+            temporal = f"{destino}.tmp"
+            pq.write_table(tabla, temporal, compression="zstd")
+            conservadas, reemplazadas = self._reaplicar_partes(nombre, tabla, destino)
+            os.replace(temporal, destino)
+            existe_csv = os.path.exists(ruta_csv)
+            self._guardar_fuente(nombre, {
+                "archivo_csv": archivo_csv,
+                "huella_csv": huella_archivos([ruta_csv]) if existe_csv else None,
+                "sha256_csv": calcular_sha256(ruta_csv) if existe_csv else None,
+                "filas": tabla.num_rows,
+                "columnas": tabla.num_columns,
+                "partes_conservadas": conservadas,
+                "partes_reemplazadas": reemplazadas,
+                "duracion_s": round(time.perf_counter() - inicio, 4),
+            })
+            self._olvidar_tablas(nombre)
+        # Conversión completa: cambia todo el rango
+        self._notificar(nombre)
+        return tabla
+
+    def _reaplicar_partes(self, nombre, tabla, destino):
+        """Conserva las partes agregadas que siguen al CSV nuevo y aparta las demás"""
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.parquet as pq
+
+        fecha = columna_fecha(tabla.schema.names)
+        ultima = pc.max(tabla.column(fecha)).as_py() if fecha is not None else None
+        conservadas, reemplazadas = [], []
+        for parte in self.partes(nombre):
+            if parte == destino:
+                continue
+            agregada = pq.read_table(parte)
+            motivo = None
+            if not agregada.schema.equals(tabla.schema):
+                try:
+                    # Mismas columnas con otro tipo (el CSV cambió de tipos): se reescribe la parte
+                    agregada = agregada.cast(tabla.schema)
+                    temporal = f"{parte}.tmp"
+                    pq.write_table(agregada, temporal, compression="zstd")
+                    os.replace(temporal, parte)
+                except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError, ValueError):
+                    motivo = "sus columnas o tipos no coinciden con los del CSV"
+            if motivo is None and ultima is not None:
+                desde = pc.min(agregada.column(fecha)).as_py()
+                if desde is not None and desde <= ultima:
+                    motivo = f"el CSV ya incluye esas fechas (hasta {ultima:%Y-%m-%d})"
+            if motivo is None:
+                conservadas.append(os.path.basename(parte))
+                continue
+            apartadas = os.path.join(self.ruta(nombre), DIRECTORIO_REEMPLAZADAS)
+            os.makedirs(apartadas, exist_ok=True)
+            os.replace(parte, os.path.join(apartadas, os.path.basename(parte)))
+            reemplazadas.append(os.path.basename(parte))
+            print(f"⚠️ {nombre}: {os.path.basename(parte)} se movió a {DIRECTORIO_REEMPLAZADAS}/ porque {motivo}")
+        return conservadas, reemplazadas
+
+    def _olvidar_tablas(self, nombre):
+        for clave in [c for c in self._tablas if c[0] == nombre]:
+            del self._tablas[clave]
+
+    def agregar(self, nombre, df_nuevo):
+        """Agrega filas nuevas como una parte más, validando columnas, tipos y orden de fechas"""
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.parquet as pq
+
+        esquema = self.esquema(nombre)
+        # Las columnas se comparan sin espacios sobrantes (algunos nombres originales los tienen)
+        nombres = {str(c).strip(): c for c in df_nuevo.columns}
+        faltantes = [c for c in esquema.names if c.strip() not in nombres]
+        sobrantes = [c for c in df_nuevo.columns if str(c).strip() not in {n.strip() for n in esquema.names}]
+        if faltantes or sobrantes:
+            detalle = []
+            if faltantes:
+                detalle.append(f"faltan {', '.join(faltantes)}")
+            if sobrantes:
+                detalle.append(f"sobran {', '.join(map(str, sobrantes))}")
+            raise ErrorIngesta(f"Las columnas no coinciden con las de '{nombre}': {'; '.join(detalle)}")
+        if df_nuevo.empty:
+            raise ErrorIngesta("No hay filas para agregar")
+
+        df_nuevo = df_nuevo[[nombres[c.strip()] for c in esquema.names]]
+        df_nuevo.columns = esquema.names
+        try:
+            tabla = pa.Table.from_pandas(tipar_columnas(df_nuevo), preserve_index=False).cast(esquema)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, ValueError) as e:
+            raise ErrorIngesta(f"Los tipos no coinciden con los de '{nombre}': {e}") from e
+
+        desde = hasta = None
+        fecha = columna_fecha(esquema.names)
+        if fecha is not None:
+            fechas = tabla.column(fecha)
+            if fechas.null_count:
+                raise ErrorIngesta(f"Hay {fechas.null_count} filas sin '{fecha}' válida")
+            desde, hasta = pc.min(fechas).as_py(), pc.max(fechas).as_py()
+            ultima = pc.max(self.leer_tabla(nombre, [fecha]).column(fecha)).as_py()
+            if ultima is not None and desde <= ultima:
+                raise ErrorIngesta(f"Solo se pueden agregar fechas posteriores a {ultima:%Y-%m-%d} "
+                                   f"(la primera nueva es {desde:%Y-%m-%d})")
+            if len(pc.unique(fechas)) != tabla.num_rows:
+                raise ErrorIngesta(f"Hay fechas repetidas en '{fecha}'")
+
+        with self._lock:
+            # Siguiente número libre (puede haber huecos si se apartaron partes)
+            numero = max(map(numero_parte, self.partes(nombre)), default=-1) + 1
+            destino = os.path.join(self.ruta(nombre), f"{PREFIJO_PARTE}{numero:05d}.parquet")
+            temporal = f"{destino}.tmp"
+            pq.write_table(tabla, temporal, compression="zstd")
+            os.replace(temporal, destino)
+
+        self._notificar(nombre, desde, hasta)
+        return ResultadoIngesta(nombre, tabla.num_rows, desde, hasta, os.path.basename(destino))
+
+    def asegurar(self, archivo_csv):
+        """Convierte el CSV si el dataset no existe o quedó desactualizado; devuelve si convirtió"""
+        if self.esta_actualizado(archivo_csv):
+            return False
+        self.convertir(archivo_csv)
+        return True
+
+    def esquema(self, nombre):
+        """Esquema Arrow del dataset (se lee del pie del primer archivo, sin leer datos)"""
+        import pyarrow.parquet as pq
+
+        partes = self.partes(nombre)
+        if not partes:
+            raise FileNotFoundError(f"No existe el dataset '{nombre}' en {self.directorio}")
+        return pq.read_schema(partes[0])
+
+    def columnas(self, nombre):
+        return list(self.esquema(nombre).names)
+
+    def leer_tabla(self, nombre, columnas=None):
+        """Tabla Arrow con las columnas pedidas (memory map, sin leer las demás)"""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        partes = self.partes(nombre)
+        if not partes:
+            raise FileNotFoundError(f"No existe el dataset '{nombre}' en {self.directorio}")
+
+        clave = (nombre, tuple(columnas) if columnas is not None else None)
+        huellas = [huella_archivos([parte]) for parte in partes]
+        leidas, tabla = self._tablas.get(clave, ([], None))
+        if huellas[:len(leidas)] != leidas:
+            # Se reescribió alguna parte ya leída (conversión completa): leer todo de nuevo
+            leidas, tabla = [], None
+        if len(leidas) < len(partes):
+            # Solo se leen las partes nuevas y se concatenan sin copiar las anteriores
+            nuevas = [pq.read_table(parte, columns=columnas, memory_map=True) for parte in partes[len(leidas):]]
+            tabla = pa.concat_tables(([tabla] if tabla is not None else []) + nuevas)
+            self._tablas[clave] = (huellas, tabla)
+        return tabla
+
+    def leer(self, nombre, columnas=None):
+        """DataFrame con las columnas pedidas (todas si no se indican)"""
+        return self.leer_tabla(nombre, columnas).to_pandas()
+
+    def info(self, nombre):
+        import pyarrow.parquet as pq
+
+        partes = self.partes(nombre)
+        metadatos = [pq.read_metadata(parte) for parte in partes]
+        return InfoDataset(
+            nombre=nombre,
+            filas=sum(m.num_rows for m in metadatos),
+            columnas=metadatos[0].num_columns if metadatos else 0,
+            partes=len(partes),
+            tamaño_bytes=sum(os.path.getsize(parte) for parte in partes),
+        )
+
+
+_almacen = None
+_almacen_lock = threading.Lock()
+
+
+def obtener_almacen():
+    """Almacén de datos compartido por todo el proceso"""
+    global _almacen
+    if _almacen is None:
+        with _almacen_lock:
+            if _almacen is None:
+                _almacen = AlmacenDatos()
+    return _almacen
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Almacén Parquet de los datasets")
+    parser.add_argument("--agregar", metavar="CSV", help="CSV con meses nuevos para agregar al dataset")
+    parser.add_argument("--dataset", default=nombre_dataset(DATASETS[1]), help="dataset al que se agregan los meses")
+    args = parser.parse_args()
+
+    almacen = obtener_almacen()
+    if args.agregar:
+        lectura = leer_csv(args.agregar)
+        for descartada in lectura.descartadas:
+            print(f"⚠️ línea {descartada.linea} en cuarentena: {descartada.motivo}")
+        try:
+            resultado = almacen.agregar(args.dataset, lectura.df)
+        except ErrorIngesta as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        rango = f" ({resultado.desde:%Y-%m-%d} a {resultado.hasta:%Y-%m-%d})" if resultado.desde else ""
+        print(f"✅ {resultado.filas} filas agregadas a {args.dataset}{rango} -> {resultado.parte}")
+        sys.exit(0)
+
+    for archivo in DATASETS:
+        convertido = almacen.asegurar(archivo)
+        info = almacen.info(nombre_dataset(archivo))
+        print(f"{'🆕' if convertido else '✅'} {archivo} -> {almacen.ruta(info.nombre)} "
+              f"({info.filas} filas, {info.columnas} columnas, {info.tamaño_bytes / 1024:.1f} KB)")
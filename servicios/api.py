@@ -0,0 +1,194 @@
+# API HTTP sin interfaz para integrar las predicciones con otros sistemas (ERP).
+# Es una aplicación ASGI mínima, sin framework, que reutiliza el registro de modelos.
+#
+# Ejecutar con:
+#   uvicorn servicios.api:app --host 0.0.0.0 --port 8000
+#
+# Endpoints:
+#   GET  /health                 -> estado y modelos cargados
+#   GET  /models                 -> modelos disponibles con sus variables de entrada
+#   POST /predict/{model_id}     -> {"datos": {...}} (una fila) o {"datos": [{...}, ...]} (lote)
+#                                   cada fila puede ser un objeto {variable: valor} o una lista
+#                                   de valores en el orden de las variables del modelo
+#   GET  /metrics                -> tiempos por etapa en formato de texto de Prometheus
+import asyncio
+import json
+import math
+
+import numpy as np
+
+from servicios.registro_modelos import CATALOGO_MODELOS, NOMBRES_MODELOS, ErrorCargaModelo, obtener_registro
+from servicios.motor_prediccion import obtener_motor
+from servicios.telemetria import obtener_telemetria
+
+# Tamaño máximo del cuerpo de una petición (5 MB)
+MAX_TAMAÑO_CUERPO = 5 * 1024 * 1024
+
+
+class ErrorPeticion(Exception):
+    """Error de la petición que se devuelve al cliente con su código HTTP"""
+
+    def __init__(self, estado, mensaje):
+        super().__init__(mensaje)
+        self.estado = estado
+        self.mensaje = mensaje
+
+
+def _fila_a_valores(fila, feature_names):
+    """Convierte una fila (objeto o lista) en la lista de valores en orden del modelo"""
+    if isinstance(fila, dict):
+        # Se aceptan los nombres con o sin espacios sobrantes
+        fila = {str(k).strip(): v for k, v in fila.items()}
+        faltantes = [n for n in feature_names if n.strip() not in fila]
+        if faltantes:
+            raise ErrorPeticion(400, f"Faltan variables: {', '.join(faltantes)}")
+        fila = [fila[n.strip()] for n in feature_names]
+    if not isinstance(fila, list) or len(fila) != len(feature_names):
+        raise ErrorPeticion(400, f"Cada fila debe tener {len(feature_names)} valores: {', '.join(feature_names)}")
+    try:
+        valores = [float(v) for v in fila]
+    except (TypeError, ValueError):
+        raise ErrorPeticion(400, "Todos los valores deben ser numéricos")
+    if not all(math.isfinite(v) for v in valores):
+        raise ErrorPeticion(400, "Los valores no pueden ser NaN ni infinitos")
+    return valores
+
+
+def predecir_peticion(modelo_id, cuerpo):
+    """Valida el cuerpo de /predict y devuelve la respuesta (se ejecuta en un hilo del pool)"""
+    if modelo_id not in CATALOGO_MODELOS:
+        raise ErrorPeticion(404, f"Modelo desconocido: {modelo_id}")
+    if not isinstance(cuerpo, dict) or "datos" not in cuerpo:
+        raise ErrorPeticion(400, "El cuerpo debe ser un objeto JSON con la clave 'datos'")
+    datos = cuerpo["datos"]
+    # Antes de buscar el modelo: una petición vacía no lo carga ni lo descarga
+    if isinstance(datos, list) and not datos:
+        raise ErrorPeticion(422, "No se enviaron filas para predecir: 'datos' es una lista vacía")
+
+    try:
+        modelo = obtener_registro().obtener(modelo_id)
+    except ErrorCargaModelo as e:
+        raise ErrorPeticion(503, str(e))
+
+    motor = obtener_motor(modelo_id, modelo)
+    es_lote = isinstance(datos, list) and isinstance(datos[0], (dict, list))
+    filas = datos if es_lote else [datos]
+
+    X = np.array([_fila_a_valores(fila, motor.features) for fila in filas], dtype=np.float64)
+
+    respuesta = {"modelo": modelo_id, "objetivo": motor.objetivo}
+    if es_lote:
+        respuesta["predicciones"] = motor.predecir_lote(X).tolist()
+    else:
+        # Una sola fila pasa por la caché de predicciones
+        respuesta["prediccion"] = motor.predecir(X[0])
+    return respuesta
+
+
+def _listar_modelos():
+    registro = obtener_registro()
+    modelos = []
+    for modelo_id in CATALOGO_MODELOS:
+        item = {"id": modelo_id, "nombre": NOMBRES_MODELOS.get(modelo_id, modelo_id), "cargado": registro.cargado(modelo_id)}
+        if registro.cargado(modelo_id):
+            motor = obtener_motor(modelo_id, registro.obtener(modelo_id))
+            item.update({"variables": motor.features, "objetivo": motor.objetivo})
+        modelos.append(item)
+    return modelos
+
+
+def cargar_todos_los_modelos():
+    """Carga todos los modelos al iniciar el servicio (devuelve los errores encontrados)"""
+    errores = {}
+    registro = obtener_registro()
+    for modelo_id in CATALOGO_MODELOS:
+        try:
+            obtener_motor(modelo_id, registro.obtener(modelo_id))
+        except (ErrorCargaModelo, ValueError) as e:
+            errores[modelo_id] = str(e)
+    return errores
+
+
+async def _leer_cuerpo(receive):
+    partes = []
+    tamaño = 0
+    while True:
+        mensaje = await receive()
+        parte = mensaje.get("body", b"")
+        tamaño += len(parte)
+        if tamaño > MAX_TAMAÑO_CUERPO:
+            raise ErrorPeticion(413, "El cuerpo de la petición es demasiado grande")
+        partes.append(parte)
+        if not mensaje.get("more_body", False):
+            return b"".join(partes)
+
+
+async def _responder(send, estado, contenido):
+    cuerpo = json.dumps(contenido, ensure_ascii=False).encode("utf-8")
+    await _enviar(send, estado, cuerpo, b"application/json; charset=utf-8")
+
+
+async def _enviar(send, estado, cuerpo, tipo):
+    await send({
+        "type": "http.response.start",
+        "status": estado,
+        "headers": [(b"content-type", tipo),
+                    (b"content-length", str(len(cuerpo)).encode())],
+    })
+    await send({"type": "http.response.body", "body": cuerpo})
+
+
+async def _lifespan(receive, send):
+    while True:
+        mensaje = await receive()
+        if mensaje["type"] == "lifespan.startup":
+            # Los modelos se cargan una sola vez, antes de aceptar peticiones
+            errores = await asyncio.get_running_loop().run_in_executor(None, cargar_todos_los_modelos)
+            for modelo_id, error in errores.items():
+                print(f"⚠️ {modelo_id} no disponible: {error}")
+            await send({"type": "lifespan.startup.complete"})
+        elif mensaje["type"] == "lifespan.shutdown":
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope, receive, send):
+    """Aplicación ASGI"""
+    if scope["type"] == "lifespan":
+        await _lifespan(receive, send)
+        return
+    if scope["type"] != "http":
+        return
+
+    metodo = scope["method"]
+    partes_ruta = [p for p in scope["path"].split("/") if p]
+    try:
+        if partes_ruta == ["health"] and metodo == "GET":
+            registro = obtener_registro()
+            cargados = [m for m in CATALOGO_MODELOS if registro.cargado(m)]
+            await _responder(send, 200, {"estado": "ok", "modelos_cargados": cargados})
+        elif partes_ruta == ["models"] and metodo == "GET":
+            await _responder(send, 200, {"modelos": _listar_modelos()})
+        elif partes_ruta == ["metrics"] and metodo == "GET":
+            await _enviar(send, 200, obtener_telemetria().prometheus().encode("utf-8"),
+                          b"text/plain; version=0.0.4; charset=utf-8")
+        elif len(partes_ruta) == 2 and partes_ruta[0] == "predict":
+            if metodo != "POST":
+                raise ErrorPeticion(405, "Use POST para predecir")
+            try:
+                cuerpo = json.loads(await _leer_cuerpo(receive) or b"null")
+            except ValueError:
+                raise ErrorPeticion(400, "El cuerpo no es JSON válido")
+            # La predicción corre en el pool de hilos para no bloquear el event loop
+            # Las rutas con modelos desconocidos comparten una serie (no una por cada id recibido)
+            etiqueta = partes_ruta[1] if partes_ruta[1] in CATALOGO_MODELOS else "desconocido"
+            with obtener_telemetria().medir("api.predecir", modelo=etiqueta):
+                respuesta = await asyncio.get_running_loop().run_in_executor(
+                    None, predecir_peticion, partes_ruta[1], cuerpo)
+            await _responder(send, 200, respuesta)
+        else:
+            raise ErrorPeticion(404, "Ruta no encontrada")
+    except ErrorPeticion as e:
+        await _responder(send, e.estado, {"error": e.mensaje})
+    except Exception as e:
+        await _responder(send, 500, {"error": f"Error interno: {str(e)}"})
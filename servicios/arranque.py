@@ -0,0 +1,136 @@
+# Fase de arranque: descarga/verificación de artefactos, imágenes y listado de la
+# carpeta de modelos. Se ejecuta una sola vez por proceso del servidor; los reruns
+# de Streamlit solo leen el estado ya calculado (sin tocar el sistema de archivos).
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from servicios.almacen_datos import DATASETS, obtener_almacen
+from servicios.cache_figuras import obtener_cache_figuras
+from servicios.descargas import preparar_artefactos
+from servicios.registro_modelos import MODELOS_DIR, verificar_cabecera_pkl
+
+# Directorio donde se guardarán las imágenes
+IMAGENES_DIR = "imagenes"
+# Copia de las imágenes incluida en el repositorio (se usa si falla la descarga)
+IMAGENES_REPO_DIR = "Imagenes"
+
+# URLs de las imágenes en Google Drive (en formato adecuado)
+IMAGENES_A_DESCARGAR = {
+    "https://drive.google.com/uc?id=1PgVHUgz2u9iOgDUcF4UL4JgVc9DUJj4u": "mapa.png",
+    "https://drive.google.com/uc?id=1Ht0_HTgXLnOLwoPUFL6AMyakgz40S2tq": "grafico.png",
+}
+
+
+@dataclass
+class InfoArchivo:
+    """Archivo de la carpeta de modelos con su tamaño y estado"""
+    nombre: str
+    tamaño_kb: float
+    estado: str
+
+
+@dataclass
+class EstadoArranque:
+    """Resultado de la fase de arranque, compartido por todas las sesiones"""
+    artefactos: list = field(default_factory=list)
+    imagenes: dict = field(default_factory=dict)
+    datasets: dict = field(default_factory=dict)
+    archivos: list = field(default_factory=list)
+    error_listado: str = None
+    duracion_s: float = 0.0
+    fecha: str = ""
+
+    @property
+    def archivos_descargados(self):
+        return [r.archivo for r in self.artefactos if r.ok]
+
+    @property
+    def archivos_con_error(self):
+        return [f"{r.archivo} (Error: {r.mensaje})" for r in self.artefactos if not r.ok]
+
+
+def _estado_archivo(ruta, tamaño_kb):
+    if not ruta.endswith('.pkl'):
+        return "✅ Disponible"
+    if tamaño_kb < 0.5:
+        return "❌ Muy pequeño (corrupto)"
+    es_valido, mensaje = verificar_cabecera_pkl(ruta)
+    if es_valido:
+        return "✅ Formato correcto"
+    if "HTML" in mensaje:
+        return "❌ HTML (error de Drive)"
+    return f"❌ {mensaje}"
+
+
+def listar_archivos(directorio=MODELOS_DIR):
+    """Lista los archivos de la carpeta con tamaño y validación de cabecera"""
+    archivos = []
+    for nombre in sorted(os.listdir(directorio)):
+        ruta = os.path.join(directorio, nombre)
+        if os.path.isfile(ruta) and not nombre.startswith('.'):
+            tamaño_kb = os.path.getsize(ruta) / 1024
+            archivos.append(InfoArchivo(nombre, tamaño_kb, _estado_archivo(ruta, tamaño_kb)))
+    return archivos
+
+
+def _cargar_imagenes(resultados):
+    """Lee las imágenes a memoria (descargadas o, si falló la descarga, las del repositorio)"""
+    imagenes = {}
+    for resultado in resultados:
+        for directorio in (IMAGENES_DIR, IMAGENES_REPO_DIR):
+            ruta = os.path.join(directorio, resultado.archivo)
+            if os.path.exists(ruta):
+                with open(ruta, 'rb') as f:
+                    imagenes[resultado.archivo] = f.read()
+                break
+    return imagenes
+
+
+def preparar_datasets():
+    """Convierte a Parquet los CSVs nuevos o modificados (devuelve un mensaje por archivo)"""
+    almacen = obtener_almacen()
+    resultados = {}
+    for archivo in DATASETS:
+        try:
+            resultados[archivo] = "✅ Convertido a Parquet" if almacen.asegurar(archivo) else "✅ Parquet al día"
+        except Exception as e:
+            resultados[archivo] = f"❌ Error convirtiendo a Parquet: {str(e)}"
+    return resultados
+
+
+def ejecutar_arranque(modelos_dir=MODELOS_DIR):
+    """Prepara artefactos e imágenes y arma el estado de arranque"""
+    inicio = time.perf_counter()
+    estado = EstadoArranque(fecha=datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+
+    estado.artefactos = preparar_artefactos(modelos_dir)
+    # Al cambiar un dataset se descartan las figuras que lo muestran
+    obtener_almacen().suscribir(obtener_cache_figuras().invalidar_datos)
+    estado.datasets = preparar_datasets()
+    resultados_imagenes = preparar_artefactos(IMAGENES_DIR, IMAGENES_A_DESCARGAR)
+    estado.imagenes = _cargar_imagenes(resultados_imagenes)
+
+    try:
+        estado.archivos = listar_archivos(modelos_dir)
+    except Exception as e:
+        estado.error_listado = str(e)
+
+    estado.duracion_s = time.perf_counter() - inicio
+    return estado
+
+
+_estado = None
+_estado_lock = threading.Lock()
+
+
+def obtener_estado_arranque():
+    """Ejecuta el arranque la primera vez y devuelve siempre el mismo estado"""
+    global _estado
+    if _estado is None:
+        with _estado_lock:
+            if _estado is None:
+                _estado = ejecutar_arranque()
+    return _estado
@@ -0,0 +1,273 @@
+# Backtest con origen móvil de todos los modelos sobre el dataset ampliado.
+# Para cada mes a partir de MESES_INICIALES se reajusta el modelo (misma clase,
+# hiperparámetros y preprocesamiento que el .pkl publicado) con todos los meses
+# anteriores y se predice ese mes, que el modelo no vio. Con las predicciones de
+# todos los orígenes se calculan MAE, MAPE y R² por modelo. Los pliegues de todos
+# los modelos se reparten en un pool de procesos.
+#
+# El resultado se guarda en modelos/backtest.json y lo muestran las pestañas de
+# cada modelo en "Información del Modelo". El modo 'publicado' evalúa los .pkl tal
+# cual (entrenados con toda la historia, así que no es fuera de muestra): solo se
+# imprime, para comparar.
+#
+# Ejecutar desde la raíz del repositorio:
+#   python -m servicios.backtest [--procesos N] [--inicial 60] [--modo reajuste|publicado] [--modelos A B ...]
+import json
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime
+
+import numpy as np
+
+from servicios.registro_modelos import CATALOGO_MODELOS, FEATURES_MODELOS, MODELOS_DIR
+
+DATASET_BACKTEST = "dataset_LIMPIO_original"
+ARCHIVO_BACKTEST = os.path.join(MODELOS_DIR, "backtest.json")
+
+# Meses con los que se entrena el primer pliegue
+MESES_INICIALES = 60
+
+# Orígenes por tarea enviada al pool (agrupa pliegues para amortizar el envío)
+ORIGENES_POR_TAREA = 8
+
+# Las regresiones originales no guardan su objetivo: predicen el precio del litro
+OBJETIVOS_LEGACY = {
+    "ipc_dolar": "Precio/litro Nacional - SIGLeA",
+    "productos": "Precio/litro Nacional - SIGLeA",
+}
+
+MODOS = ("reajuste", "publicado")
+
+
+@dataclass
+class ResultadoBacktest:
+    """Métricas fuera de muestra de un modelo"""
+    modelo_id: str
+    objetivo: str
+    mae: float
+    mape: float
+    r2: float
+    pliegues: int
+    desde: str
+    hasta: str
+    duracion_s: float
+
+
+def normalizar(nombre):
+    """Nombre de columna sin espacios repetidos ni sobrantes"""
+    return " ".join(str(nombre).split())
+
+
+def metricas(reales, predichos):
+    """(MAE, MAPE en %, R²) de las predicciones"""
+    reales, predichos = np.asarray(reales, dtype=float), np.asarray(predichos, dtype=float)
+    errores = reales - predichos
+    mae = float(np.mean(np.abs(errores)))
+    no_nulos = reales != 0
+    mape = float(np.mean(np.abs(errores[no_nulos] / reales[no_nulos])) * 100) if no_nulos.any() else float("nan")
+    total = np.sum((reales - reales.mean()) ** 2)
+    r2 = float(1 - np.sum(errores ** 2) / total) if total > 0 else float("nan")
+    return mae, mape, r2
+
+
+def objetivo_modelo(modelo_id, modelo):
+    if isinstance(modelo, dict) and modelo.get("target"):
+        return normalizar(modelo["target"])
+    return OBJETIVOS_LEGACY[modelo_id]
+
+
+def _partes_modelo(modelo):
+    """(estimador, scaler) del .pkl (los legacy no tienen scaler)"""
+    if isinstance(modelo, dict):
+        return modelo["modelo"], modelo.get("scaler")
+    return modelo, None
+
+
+def reajustar_y_predecir(modelo, X_entrenamiento, y_entrenamiento, X_prueba):
+    """Ajusta una copia sin entrenar del modelo (y de su scaler) y predice"""
+    from servicios.formato_modelos import sin_entrenar
+
+    estimador, scaler = _partes_modelo(modelo)
+    estimador = sin_entrenar(estimador)
+    if scaler is not None:
+        scaler = sin_entrenar(scaler).fit(X_entrenamiento)
+        X_entrenamiento, X_prueba = scaler.transform(X_entrenamiento), scaler.transform(X_prueba)
+    estimador.fit(X_entrenamiento, y_entrenamiento)
+    return estimador.predict(X_prueba)
+
+
+def predecir_publicado(modelo, X):
+    """Predicción del modelo publicado tal cual (entrenado con toda la historia)"""
+    estimador, scaler = _partes_modelo(modelo)
+    return estimador.predict(scaler.transform(X) if scaler is not None else X)
+
+
+def matrices_modelo(datos, modelo_id, modelo):
+    """(X, y) del modelo con las filas completas, en orden de fecha"""
+    columnas = {normalizar(c): c for c in datos.columns}
+    features = [columnas[normalizar(f)] for f in FEATURES_MODELOS[modelo_id]]
+    objetivo = columnas[objetivo_modelo(modelo_id, modelo)]
+    tabla = datos[features + [objetivo]].apply(lambda s: s.astype(float)).dropna()
+    return tabla[features].to_numpy(), tabla[objetivo].to_numpy(), tabla.index
+
+
+# Datos y modelos de cada proceso del pool (se cargan una vez por proceso)
+_datos_proceso = None
+
+
+def _inicializar_proceso(datos):
+    global _datos_proceso
+    _datos_proceso = datos
+
+
+def _ejecutar_tarea(tarea):
+    """Pliegues de un modelo: (modelo_id, [(posición, real, predicho)], segundos de cálculo)"""
+    from servicios.registro_modelos import obtener_registro
+
+    inicio = time.perf_counter()
+    modelo_id, origenes, modo = tarea
+    modelo = obtener_registro().obtener(modelo_id)
+    X, y, _ = matrices_modelo(_datos_proceso, modelo_id, modelo)
+    resultados = []
+    for origen in origenes:
+        if modo == "reajuste":
+            predicho = reajustar_y_predecir(modelo, X[:origen], y[:origen], X[origen:origen + 1])[0]
+        else:
+            predicho = predecir_publicado(modelo, X[origen:origen + 1])[0]
+        resultados.append((origen, float(y[origen]), float(predicho)))
+    return modelo_id, resultados, time.perf_counter() - inicio
+
+
+def cargar_datos():
+    """Dataset ampliado ordenado por fecha (índice = fecha)"""
+    from servicios.almacen_datos import columna_fecha, obtener_almacen
+
+    almacen = obtener_almacen()
+    almacen.asegurar(f"{DATASET_BACKTEST}.csv")
+    datos = almacen.leer(DATASET_BACKTEST)
+    fecha = columna_fecha(datos.columns)
+    return datos.set_index(fecha).sort_index()
+
+
+def ejecutar_backtest(modelos=None, meses_iniciales=MESES_INICIALES, modo="reajuste", procesos=None):
+    """Corre el backtest de los modelos pedidos y devuelve {modelo_id: ResultadoBacktest}"""
+    from servicios.registro_modelos import obtener_registro
+
+    if modo not in MODOS:
+        raise ValueError(f"Modo desconocido: {modo} (opciones: {', '.join(MODOS)})")
+    modelos = list(modelos or CATALOGO_MODELOS)
+    datos = cargar_datos()
+    registro = obtener_registro()
+
+    tareas, fechas, objetivos = [], {}, {}
+    for modelo_id in modelos:
+        modelo = registro.obtener(modelo_id)
+        X, _, indice = matrices_modelo(datos, modelo_id, modelo)
+        if len(X) <= meses_iniciales:
+            raise ValueError(f"{modelo_id}: {len(X)} meses completos, se necesitan más de {meses_iniciales}")
+        fechas[modelo_id] = indice
+        objetivos[modelo_id] = objetivo_modelo(modelo_id, modelo)
+        origenes = list(range(meses_iniciales, len(X)))
+        tareas += [(modelo_id, origenes[i:i + ORIGENES_POR_TAREA], modo)
+                   for i in range(0, len(origenes), ORIGENES_POR_TAREA)]
+
+    inicio = time.perf_counter()
+    pliegues = {modelo_id: [] for modelo_id in modelos}
+    duraciones = dict.fromkeys(modelos, 0.0)
+    with ProcessPoolExecutor(max_workers=procesos, initializer=_inicializar_proceso, initargs=(datos,)) as pool:
+        for modelo_id, resultados, duracion_s in pool.map(_ejecutar_tarea, tareas):
+            pliegues[modelo_id] += resultados
+            duraciones[modelo_id] += duracion_s
+    resultados = {}
+    for modelo_id in modelos:
+        _, reales, predichos = zip(*sorted(pliegues[modelo_id]))
+        mae, mape, r2 = metricas(reales, predichos)
+        origenes = [origen for origen, _, _ in pliegues[modelo_id]]
+        resultados[modelo_id] = ResultadoBacktest(
+            modelo_id, objetivos[modelo_id], mae, mape, r2, len(origenes),
+            f"{fechas[modelo_id][min(origenes)]:%Y-%m}", f"{fechas[modelo_id][max(origenes)]:%Y-%m}",
+            round(duraciones[modelo_id], 3),
+        )
+    return resultados, time.perf_counter() - inicio
+
+
+def guardar_resultados(resultados, meses_iniciales, duracion_s, path=ARCHIVO_BACKTEST):
+    """Escribe las métricas en modelos/backtest.json (se conservan las de los modelos no corridos)"""
+    anteriores = leer_resultados(path)
+    contenido = {
+        "fecha": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "meses_iniciales": meses_iniciales,
+        "duracion_s": round(duracion_s, 2),
+        "modelos": {**{k: asdict(v) for k, v in anteriores.items()},
+                    **{k: asdict(v) for k, v in resultados.items()}},
+    }
+    temporal = f"{path}.tmp"
+    with open(temporal, "w", encoding="utf-8") as f:
+        json.dump(contenido, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+    os.replace(temporal, path)
+
+
+_leidos = {}
+_leidos_lock = threading.Lock()
+
+
+def leer_resultados(path=ARCHIVO_BACKTEST):
+    """{modelo_id: ResultadoBacktest} del último backtest guardado (vacío si no hay)"""
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return {}
+    with _leidos_lock:
+        guardado = _leidos.get(path)
+        if guardado is not None and guardado[0] == mtime:
+            return guardado[1]
+    try:
+        with open(path, encoding="utf-8") as f:
+            contenido = json.load(f)
+        resultados = {k: ResultadoBacktest(**v) for k, v in contenido.get("modelos", {}).items()}
+    except (OSError, ValueError, TypeError):
+        return {}
+    with _leidos_lock:
+        _leidos[path] = (mtime, resultados)
+    return resultados
+
+
+def info_backtest(path=ARCHIVO_BACKTEST):
+    """Datos generales del último backtest (fecha, meses iniciales, duración)"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            contenido = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return {k: v for k, v in contenido.items() if k != "modelos"}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Backtest con origen móvil de los modelos")
+    parser.add_argument("--modelos", nargs="+", choices=list(CATALOGO_MODELOS), help="por defecto, todos")
+    parser.add_argument("--inicial", type=int, default=MESES_INICIALES, help="meses del primer entrenamiento")
+    parser.add_argument("--modo", choices=MODOS, default="reajuste",
+                        help="reajuste: reentrena en cada origen; publicado: evalúa el .pkl tal cual")
+    parser.add_argument("--procesos", type=int, default=None, help="procesos del pool (por defecto, uno por CPU)")
+    parser.add_argument("--no-guardar", action="store_true", help="no escribe modelos/backtest.json")
+    args = parser.parse_args()
+
+    resultados, duracion = ejecutar_backtest(args.modelos, args.inicial, args.modo, args.procesos)
+    print(f"{'Modelo':<10} | {'Objetivo':<32} | {'Pliegues':>8} | {'MAE':>12} | {'MAPE %':>8} | {'R²':>8}")
+    print("-" * 92)
+    for r in resultados.values():
+        print(f"{r.modelo_id:<10} | {r.objetivo[:32]:<32} | {r.pliegues:>8} | {r.mae:>12,.4f} | {r.mape:>8.2f} | {r.r2:>8.4f}")
+    print(f"\n⏱️ {sum(r.pliegues for r in resultados.values())} pliegues en {duracion:.1f} s (modo {args.modo})")
+    if args.modo == "publicado":
+        # Solo se guardan métricas fuera de muestra
+        print("ℹ️ Los modelos publicados se entrenaron con toda la historia: estas métricas no son fuera de muestra "
+              "y no se guardan.")
+    elif not args.no_guardar:
+        guardar_resultados(resultados, args.inicial, duracion)
+        print(f"✅ Métricas guardadas en {ARCHIVO_BACKTEST}")
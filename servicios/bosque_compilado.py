@@ -0,0 +1,206 @@
+# Bosques aleatorios compilados a arrays planos de NumPy.
+# Todos los árboles del bosque se concatenan en arrays contiguos de nodos
+# (variable, umbral, hijo izquierdo, hijo derecho, valor) y se recorren por niveles
+# para todas las filas y todos los árboles a la vez, sin el despacho de joblib ni
+# la validación de entrada que hace sklearn en cada llamada a predict.
+#
+# Verificación de paridad contra modelo.predict (bosque compilado y versión nativa):
+#   python -m servicios.bosque_compilado [--exportar DIRECTORIO]
+import os
+from dataclasses import dataclass
+
+import numpy as np
+
+# Filas por bloque al evaluar lotes grandes (acota la memoria de los índices)
+FILAS_POR_BLOQUE = 8192
+
+
+@dataclass
+class BosqueCompilado:
+    """Nodos de todos los árboles de un bosque en arrays contiguos"""
+    variable: np.ndarray
+    umbral: np.ndarray
+    izquierdo: np.ndarray
+    derecho: np.ndarray
+    valor: np.ndarray
+    raices: np.ndarray
+    profundidad: int
+    n_features: int
+
+    @property
+    def n_arboles(self):
+        return len(self.raices)
+
+    @property
+    def n_nodos(self):
+        return len(self.variable)
+
+    @property
+    def memoria_bytes(self):
+        return sum(a.nbytes for a in (self.variable, self.umbral, self.izquierdo, self.derecho, self.valor, self.raices))
+
+    def predecir(self, X):
+        """Predice todas las filas de X (promedio de los árboles)"""
+        # sklearn compara las variables convertidas a float32 contra umbrales float64
+        datos = np.asarray(X, dtype=np.float32)
+        if datos.ndim == 1:
+            datos = datos.reshape(1, -1)
+        if datos.shape[1] != self.n_features:
+            raise ValueError(f"Se esperaban {self.n_features} columnas y se recibieron {datos.shape[1]}")
+        if len(datos) <= FILAS_POR_BLOQUE:
+            return self._predecir_bloque(datos)
+        return np.concatenate([self._predecir_bloque(datos[i:i + FILAS_POR_BLOQUE])
+                               for i in range(0, len(datos), FILAS_POR_BLOQUE)])
+
+    def _predecir_bloque(self, datos):
+        filas = np.arange(len(datos))[:, None]
+        nodos = np.broadcast_to(self.raices, (len(datos), self.n_arboles))
+        # Las hojas apuntan a sí mismas, así que basta con bajar 'profundidad' niveles
+        for _ in range(self.profundidad):
+            va_izquierda = datos[filas, self.variable[nodos]] <= self.umbral[nodos]
+            nodos = np.where(va_izquierda, self.izquierdo[nodos], self.derecho[nodos])
+        return self.valor[nodos].mean(axis=1)
+
+    def guardar(self, path):
+        """Exporta los arrays a un archivo .npz"""
+        np.savez(path, variable=self.variable, umbral=self.umbral, izquierdo=self.izquierdo,
+                 derecho=self.derecho, valor=self.valor, raices=self.raices,
+                 profundidad=self.profundidad, n_features=self.n_features)
+
+    @classmethod
+    def cargar(cls, path):
+        """Lee un bosque exportado con guardar()"""
+        with np.load(path, allow_pickle=False) as datos:
+            return cls(datos['variable'], datos['umbral'], datos['izquierdo'], datos['derecho'],
+                       datos['valor'], datos['raices'], int(datos['profundidad']), int(datos['n_features']))
+
+
+def es_bosque_compilable(estimador):
+    """True si el estimador es un bosque de árboles de regresión con una sola salida"""
+    arboles = getattr(estimador, 'estimators_', None)
+    if not arboles or getattr(estimador, 'n_outputs_', 1) != 1:
+        return False
+    return all(hasattr(arbol, 'tree_') and arbol.tree_.n_outputs == 1 for arbol in arboles)
+
+
+def compilar_bosque(estimador):
+    """Aplana los árboles de un RandomForestRegressor entrenado en un BosqueCompilado"""
+    if not es_bosque_compilable(estimador):
+        raise ValueError("Solo se pueden compilar bosques de regresión con una salida")
+
+    variables, umbrales, izquierdos, derechos, valores, raices = [], [], [], [], [], []
+    desplazamiento = 0
+    profundidad = 0
+    for arbol in estimador.estimators_:
+        t = arbol.tree_
+        indices = np.arange(t.node_count)
+        es_hoja = t.children_left == -1
+        # Las hojas se enlazan consigo mismas y comparan la variable 0 (el resultado no importa)
+        variables.append(np.where(es_hoja, 0, t.feature))
+        umbrales.append(np.where(es_hoja, 0.0, t.threshold))
+        izquierdos.append(np.where(es_hoja, indices, t.children_left) + desplazamiento)
+        derechos.append(np.where(es_hoja, indices, t.children_right) + desplazamiento)
+        valores.append(t.value[:, 0, 0])
+        raices.append(desplazamiento)
+        desplazamiento += t.node_count
+        profundidad = max(profundidad, t.max_depth)
+
+    return BosqueCompilado(
+        variable=np.ascontiguousarray(np.concatenate(variables), dtype=np.intp),
+        umbral=np.ascontiguousarray(np.concatenate(umbrales), dtype=np.float64),
+        izquierdo=np.ascontiguousarray(np.concatenate(izquierdos), dtype=np.intp),
+        derecho=np.ascontiguousarray(np.concatenate(derechos), dtype=np.intp),
+        valor=np.ascontiguousarray(np.concatenate(valores), dtype=np.float64),
+        raices=np.array(raices, dtype=np.intp),
+        profundidad=int(profundidad),
+        n_features=int(estimador.n_features_in_),
+    )
+
+
+def verificar_paridad(dataset="dataset_LIMPIO_original.csv", directorio_exportacion=None, tolerancia=1e-9):
+    """Compara modelo.predict del .pkl contra el bosque compilado y la versión nativa de cada bosque"""
+    import pickle
+    import time
+    import warnings
+    import pandas as pd
+    from servicios.almacen_datos import nombre_dataset, obtener_almacen
+    from servicios.formato_modelos import ErrorFormatoModelo, cargar_nativo, nativo_vigente, ruta_nativa
+    from servicios.registro_modelos import CATALOGO_MODELOS, MODELOS_DIR
+    from servicios.motor_prediccion import MotorPrediccion
+
+    almacen = obtener_almacen()
+    almacen.asegurar(dataset)
+    nombre = nombre_dataset(dataset)
+    columnas = {str(c).strip(): c for c in almacen.columnas(nombre)}
+    ok, verificados = True, 0
+
+    for modelo_id, stem in CATALOGO_MODELOS.items():
+        # El .pkl se lee directo: el registro carga la versión nativa, que ya no es de sklearn
+        ruta_pkl = os.path.join(MODELOS_DIR, f"{stem}.pkl")
+        with open(ruta_pkl, 'rb') as f:
+            motor = MotorPrediccion.desde_modelo(modelo_id, pickle.load(f))
+        if not es_bosque_compilable(motor.estimador):
+            continue
+
+        # Solo las columnas del modelo, leídas del almacén Parquet
+        proyeccion = [columnas[f.strip()] for f in motor.features]
+        X = almacen.leer(nombre, proyeccion)[proyeccion].apply(pd.to_numeric, errors='coerce').dropna().to_numpy()
+        Xt = motor.transformar(X)
+        bosque = compilar_bosque(motor.estimador)
+
+        with warnings.catch_warnings():
+            # Los bosques ajustados con DataFrame avisan al recibir arrays sin nombres
+            warnings.simplefilter("ignore", UserWarning)
+            inicio = time.perf_counter()
+            esperado = motor.estimador.predict(Xt)
+            t_sklearn = time.perf_counter() - inicio
+            inicio = time.perf_counter()
+            for _ in range(20):
+                motor.estimador.predict(Xt[:1])
+            t_fila_sklearn = (time.perf_counter() - inicio) / 20
+        inicio = time.perf_counter()
+        obtenido = bosque.predecir(Xt)
+        t_compilado = time.perf_counter() - inicio
+
+        # Una sola fila, que es el caso de las pestañas
+        inicio = time.perf_counter()
+        for _ in range(20):
+            bosque.predecir(Xt[:1])
+        t_fila_compilado = (time.perf_counter() - inicio) / 20
+
+        diferencia = float(np.max(np.abs(obtenido - esperado)))
+        paridad = np.allclose(obtenido, esperado, rtol=tolerancia, atol=tolerancia)
+
+        # Versión nativa (la que carga la app), con su propio scaler y bosque en memory map
+        try:
+            if not nativo_vigente(modelo_id, ruta_pkl):
+                raise ErrorFormatoModelo("falta o no corresponde al .pkl actual")
+            nativo = MotorPrediccion.desde_modelo(modelo_id, cargar_nativo(ruta_nativa(modelo_id)))
+            obtenido_nativo = nativo.estimador.predict(nativo.transformar(X))
+            diferencia_nativa = float(np.max(np.abs(obtenido_nativo - esperado)))
+            paridad_nativa = np.allclose(obtenido_nativo, esperado, rtol=tolerancia, atol=tolerancia)
+            detalle_nativo = f"nativo dif. máx. {diferencia_nativa:.2e}"
+        except ErrorFormatoModelo as e:
+            paridad_nativa, detalle_nativo = False, f"nativo inválido: {e}"
+
+        ok = ok and paridad and paridad_nativa
+        verificados += 1
+        print(f"{'✅' if paridad and paridad_nativa else '❌'} {modelo_id}: {len(X)} filas, {bosque.n_arboles} árboles, "
+              f"{bosque.n_nodos} nodos ({bosque.memoria_bytes / 1024:.0f} KB), dif. máx. {diferencia:.2e}, "
+              f"{detalle_nativo} | lote {t_sklearn * 1000:.2f} → {t_compilado * 1000:.2f} ms | "
+              f"1 fila {t_fila_sklearn * 1000:.2f} → {t_fila_compilado * 1000:.3f} ms")
+
+        if directorio_exportacion:
+            os.makedirs(directorio_exportacion, exist_ok=True)
+            bosque.guardar(os.path.join(directorio_exportacion, f"{stem}.npz"))
+
+    if not verificados:
+        print("❌ No se verificó ningún bosque: ningún .pkl del catálogo tiene un bosque compilable")
+    return ok and verificados > 0
+
+
+if __name__ == "__main__":
+    import sys
+
+    destino = sys.argv[sys.argv.index("--exportar") + 1] if "--exportar" in sys.argv else None
+    sys.exit(0 if verificar_paridad(directorio_exportacion=destino) else 1)
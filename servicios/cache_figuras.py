@@ -0,0 +1,131 @@
+# Caché de figuras Plotly compartida entre reruns y sesiones.
+# Las figuras de la pestaña de datos solo cambian cuando cambian los CSV, así que se
+# arman una vez por huella de los datos (ruta, tamaño y fecha de modificación) y las
+# visitas siguientes reutilizan la figura ya validada. Cada figura declara de qué
+# datasets (y hasta qué fecha) depende, para que al agregar meses a un dataset
+# solo se descarten las figuras que los muestran.
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+# Figuras guardadas como máximo (unas pocas por cada versión de los datos)
+MAX_FIGURAS_CACHE = 32
+
+# Propiedades de las trazas que llevan los datos de la figura
+PROPIEDADES_DATOS = ("x", "y", "z", "text", "customdata", "values", "labels")
+
+
+@dataclass
+class FiguraCacheada:
+    """Figura armada con su tiempo de armado y el tamaño de los datos de sus trazas"""
+    figura: object
+    tiempo_armado_s: float
+    tamaño_datos: int
+    usos: int = 0
+    # {dataset: última fecha que muestra la figura (None = toda la historia)}
+    dependencias: dict = None
+
+    def depende_de(self, dataset, desde=None):
+        """True si la figura muestra datos del dataset a partir de 'desde'"""
+        if not self.dependencias or dataset not in self.dependencias:
+            return False
+        hasta = self.dependencias[dataset]
+        return desde is None or hasta is None or hasta >= desde
+
+
+def tamaño_trazas(figura):
+    """Bytes de los arrays de datos de las trazas (estimación del peso de la figura sin serializarla)"""
+    import numpy as np
+
+    total = 0
+    for traza in figura.data:
+        for propiedad in PROPIEDADES_DATOS:
+            valores = getattr(traza, propiedad, None)
+            if valores is not None and not isinstance(valores, str):
+                total += np.asarray(valores).nbytes
+    return total
+
+
+def huella_archivos(rutas):
+    """Huella barata de un conjunto de archivos (ruta, tamaño y mtime, sin leerlos)"""
+    h = hashlib.sha1()
+    for ruta in rutas:
+        try:
+            stat = os.stat(ruta)
+            h.update(f"{ruta}|{stat.st_size}|{stat.st_mtime_ns};".encode())
+        except OSError:
+            h.update(f"{ruta}|-;".encode())
+    return h.hexdigest()
+
+
+def huella_dataframes(*dfs):
+    """Huella del contenido de DataFrames (cuando no se conoce el archivo de origen)"""
+    import pandas as pd
+
+    h = hashlib.sha1()
+    for df in dfs:
+        h.update(",".join(map(str, df.columns)).encode())
+        h.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+    return h.hexdigest()
+
+
+class CacheFiguras:
+    """Figuras armadas por (nombre, huella de los datos), con desalojo LRU"""
+
+    def __init__(self, max_figuras=MAX_FIGURAS_CACHE):
+        self.max_figuras = max_figuras
+        self._figuras = OrderedDict()
+        self._lock = threading.Lock()
+
+    def obtener(self, nombre, huella, constructor, dependencias=None):
+        """Devuelve (FiguraCacheada, desde_cache); arma la figura solo si no está guardada"""
+        clave = (nombre, huella)
+        with self._lock:
+            cacheada = self._figuras.get(clave)
+            if cacheada is not None:
+                self._figuras.move_to_end(clave)
+                cacheada.usos += 1
+                return cacheada, True
+
+        # El armado se hace fuera del lock: dos sesiones pueden armar la misma figura
+        # a la vez la primera vez, pero ninguna espera por figuras de otros datos
+        inicio = time.perf_counter()
+        figura = constructor()
+        tiempo_armado_s = time.perf_counter() - inicio
+        tamaño_datos = tamaño_trazas(figura) if figura is not None else 0
+        cacheada = FiguraCacheada(figura, tiempo_armado_s, tamaño_datos, usos=1, dependencias=dependencias)
+
+        with self._lock:
+            self._figuras[clave] = cacheada
+            while len(self._figuras) > self.max_figuras:
+                self._figuras.popitem(last=False)
+        return cacheada, False
+
+    def invalidar(self):
+        with self._lock:
+            self._figuras.clear()
+
+    def invalidar_datos(self, dataset, desde=None, hasta=None):
+        """Descarta las figuras que muestran el rango modificado del dataset (devuelve cuántas)"""
+        with self._lock:
+            claves = [clave for clave, cacheada in self._figuras.items() if cacheada.depende_de(dataset, desde)]
+            for clave in claves:
+                del self._figuras[clave]
+        return len(claves)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def obtener_cache_figuras():
+    """Caché de figuras compartida por todo el proceso"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = CacheFiguras()
+    return _cache
@@ -0,0 +1,95 @@
+# Caché LRU con vencimiento para las predicciones de una sola fila.
+# Los reruns de Streamlit y los cambios de pestaña repiten la misma predicción con
+# las mismas entradas; la clave es (versión del modelo, tupla exacta de variables).
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+# Entradas como máximo y segundos de vida de cada una
+MAX_ENTRADAS_CACHE = 10000
+TTL_CACHE_S = 3600
+
+
+@dataclass
+class EstadisticasCache:
+    """Contadores de uso de la caché"""
+    aciertos: int = 0
+    fallos: int = 0
+    vencidas: int = 0
+    desalojadas: int = 0
+    entradas: int = 0
+    max_entradas: int = 0
+    ttl_s: float = 0.0
+
+    @property
+    def tasa_aciertos(self):
+        total = self.aciertos + self.fallos
+        return self.aciertos / total if total else 0.0
+
+
+class CachePredicciones:
+    """Caché LRU acotada en tamaño y en tiempo, segura entre hilos"""
+
+    def __init__(self, max_entradas=MAX_ENTRADAS_CACHE, ttl_s=TTL_CACHE_S, reloj=time.monotonic):
+        self.max_entradas = max_entradas
+        self.ttl_s = ttl_s
+        self._reloj = reloj
+        self._entradas = OrderedDict()
+        self._lock = threading.Lock()
+        self._aciertos = 0
+        self._fallos = 0
+        self._vencidas = 0
+        self._desalojadas = 0
+
+    def obtener(self, clave):
+        """Devuelve el valor guardado o None si no está o venció"""
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is not None:
+                valor, vence = entrada
+                if vence > self._reloj():
+                    self._entradas.move_to_end(clave)
+                    self._aciertos += 1
+                    return valor
+                del self._entradas[clave]
+                self._vencidas += 1
+            self._fallos += 1
+            return None
+
+    def guardar(self, clave, valor):
+        """Guarda un valor y desaloja el menos usado si se supera el tamaño"""
+        with self._lock:
+            self._entradas[clave] = (valor, self._reloj() + self.ttl_s)
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.max_entradas:
+                self._entradas.popitem(last=False)
+                self._desalojadas += 1
+
+    def invalidar(self, version=None):
+        """Elimina todas las entradas, o solo las de una versión de modelo"""
+        with self._lock:
+            if version is None:
+                self._entradas.clear()
+                return
+            for clave in [c for c in self._entradas if c[0] == version]:
+                del self._entradas[clave]
+
+    def estadisticas(self):
+        with self._lock:
+            return EstadisticasCache(self._aciertos, self._fallos, self._vencidas, self._desalojadas,
+                                     len(self._entradas), self.max_entradas, self.ttl_s)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def obtener_cache():
+    """Caché de predicciones compartida por todo el proceso"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = CachePredicciones()
+    return _cache
@@ -0,0 +1,244 @@
+# Preparación de artefactos (modelos y CSVs): descarga en paralelo los que faltan
+# y los verifica contra el manifiesto SHA-256 guardado en modelos/metadata.json.
+import hashlib
+import json
+import os
+import shutil
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from servicios.registro_modelos import MODELOS_DIR, verificar_cabecera_pkl
+
+# URLs de los modelos y archivos en Google Drive (usando el formato adecuado para gdown)
+# IMPORTANTE: Para que las descargas funcionen correctamente:
+# 1. Los archivos en Google Drive deben ser públicos (compartir con "cualquier persona con el enlace")
+# 2. Usar el formato: https://drive.google.com/file/d/ID_DEL_ARCHIVO
+# 3. Si hay errores de descarga, verificar permisos en Google Drive
+ARCHIVOS_A_DESCARGAR = {
+    # Modelos ya usados en la app
+    "https://drive.google.com/file/d/16ZqjF63HtFxV7fIVqJY-EQgIP0nGBgSA": "modelo_regresion-Precio-IPC-Dolar.pkl",
+    "https://drive.google.com/file/d/1lp3kmeGeTPVx8-QZu6HFcSPqJFbU2zya": "modelo_regresion-Precio-ComEnt-Queso-Yogur.pkl",
+
+    # Modelos OCLA
+    "https://drive.google.com/file/d/1HVDxaJpuWk3rUIPOlXBsIFyWW32syuRi": "modelo_A_rentabilidad.pkl",
+    "https://drive.google.com/file/d/1kRIzujwRxQzJ9b738D_oBPMJVNeU9DLZ": "modelo_B_costos.pkl",
+    "https://drive.google.com/file/d/1r5PDqxLNQOD2QKQXJd5XFfKg5K72V_Jm": "modelo_D_precio_queso.pkl",
+    "https://drive.google.com/file/d/1BjwGFe_djZ3c3W6XuedKQkorDB4cp4Yk": "modelo_E_precio_internacional.pkl",
+    "https://drive.google.com/file/d/1VprLKVHthzzGnt7MB14KyTPmL9qUsGvt": "modelo_F_precio_novillos.pkl",
+    "https://drive.google.com/file/d/1qcHUmGB9DKe9lrmzkfUZrvBPGQF7Sedh": "modelo_G_variables_macroeconomicas.pkl",
+    "https://drive.google.com/file/d/1plMbfsdqBAZAJxy9ziQdflrsD39_Fi13": "modelo_H_productos_lacteos.pkl",
+
+    # CSVs usados por la app
+    "https://drive.google.com/file/d/1oa0iGxqlGgOmWpfLWO7pMeYjGuv4AFzV": "archivo.csv",
+    "https://drive.google.com/file/d/1Xr7IbFcIdZvbrCsqKzv7fR-XW8zhdZ2I": "dataset_LIMPIO_original.csv",
+}
+
+# Manifiesto con los SHA-256 esperados (sección "artefactos" de metadata.json)
+ARCHIVO_MANIFIESTO = "metadata.json"
+# Sellos locales (tamaño, mtime, sha) de la última verificación exitosa: si el
+# archivo no cambió desde entonces no hace falta volver a calcular el hash
+ARCHIVO_SELLOS = ".verificacion.json"
+
+# Si está definida, los artefactos se descargan de este espejo HTTP
+# ({url_base}/{archivo}) en lugar de Google Drive. Sirve para probar la
+# descarga sin conexión, por ejemplo con `python -m http.server`.
+VARIABLE_ESPEJO = "MILKCAST_ESPEJO_ARTEFACTOS"
+
+# Descargas simultáneas como máximo
+MAX_DESCARGAS_PARALELAS = 4
+
+
+@dataclass
+class ResultadoArtefacto:
+    """Estado final de un artefacto después de la preparación"""
+    archivo: str
+    ok: bool
+    mensaje: str
+    descargado: bool = False
+    tiempo_s: float = 0.0
+
+
+def calcular_sha256(path, tamaño_bloque=1024 * 1024):
+    """SHA-256 de un archivo leyendo por bloques"""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for bloque in iter(lambda: f.read(tamaño_bloque), b''):
+            h.update(bloque)
+    return h.hexdigest()
+
+
+def leer_manifiesto(directorio=MODELOS_DIR):
+    """Lee metadata.json (devuelve un dict vacío si no existe o está corrupto)"""
+    try:
+        with open(os.path.join(directorio, ARCHIVO_MANIFIESTO), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def guardar_manifiesto(manifiesto, directorio=MODELOS_DIR):
+    """Escribe metadata.json de forma atómica"""
+    _guardar_json(manifiesto, os.path.join(directorio, ARCHIVO_MANIFIESTO))
+
+
+def actualizar_manifiesto(directorio=MODELOS_DIR, archivos_a_descargar=None):
+    """Registra en el manifiesto el SHA-256 y tamaño de los artefactos presentes"""
+    archivos_a_descargar = archivos_a_descargar or ARCHIVOS_A_DESCARGAR
+    manifiesto = leer_manifiesto(directorio)
+    artefactos = manifiesto.setdefault("artefactos", {})
+    for url, archivo in archivos_a_descargar.items():
+        path = os.path.join(directorio, archivo)
+        if os.path.exists(path):
+            artefactos[archivo] = {
+                "sha256": calcular_sha256(path),
+                "tamaño": os.path.getsize(path),
+                "url": url,
+            }
+    guardar_manifiesto(manifiesto, directorio)
+    return manifiesto
+
+
+def _guardar_json(datos, path):
+    temporal = f"{path}.tmp"
+    with open(temporal, 'w', encoding='utf-8') as f:
+        json.dump(datos, f, indent=2, ensure_ascii=False)
+    os.replace(temporal, path)
+
+
+def _leer_sellos(directorio):
+    try:
+        with open(os.path.join(directorio, ARCHIVO_SELLOS), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _sello(path, sha256):
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns, sha256]
+
+
+def sha256_sellado(path):
+    """SHA-256 de un artefacto ya verificado, si no cambió desde entonces (None si no hay sello vigente)"""
+    directorio, archivo = os.path.split(path)
+    sello = _leer_sellos(directorio).get(archivo)
+    try:
+        if sello and sello[:2] == _sello(path, None)[:2]:
+            return sello[2]
+    except OSError:
+        pass
+    return None
+
+
+def descargar_gdown(url, destino):
+    """Descarga desde Google Drive con gdown"""
+    # gdown acepta tanto URLs tipo /file/d/ID como /uc?id=ID
+    import gdown
+    resultado = gdown.download(url, destino, quiet=True, fuzzy=True)
+    if resultado is None:
+        raise OSError("gdown no pudo descargar el archivo (¿el enlace es público?)")
+
+
+def descargar_http(url, destino, timeout=60):
+    """Descarga directa por HTTP (espejos propios o servidor local de pruebas)"""
+    with urllib.request.urlopen(url, timeout=timeout) as respuesta, open(destino, 'wb') as f:
+        shutil.copyfileobj(respuesta, f)
+
+
+def _validar_contenido(path, archivo, sha_esperado):
+    """Devuelve (es_valido, mensaje, sha256 calculado)"""
+    if archivo.endswith('.pkl'):
+        es_valido, mensaje = verificar_cabecera_pkl(path)
+        if not es_valido:
+            return False, mensaje, None
+    sha = calcular_sha256(path)
+    if sha_esperado and sha != sha_esperado:
+        return False, f"SHA-256 no coincide con el manifiesto ({sha[:12]}… ≠ {sha_esperado[:12]}…)", sha
+    return True, "verificado con SHA-256" if sha_esperado else "sin checksum en el manifiesto", sha
+
+
+def _preparar_artefacto(url, archivo, directorio, esperado, sello, descargar, espejo):
+    inicio = time.perf_counter()
+    path = os.path.join(directorio, archivo)
+    sha_esperado = esperado.get("sha256")
+
+    def resultado(ok, mensaje, descargado=False, sello_nuevo=None):
+        return ResultadoArtefacto(archivo, ok, mensaje, descargado, time.perf_counter() - inicio), sello_nuevo
+
+    if os.path.exists(path):
+        # Camino rápido: el archivo no cambió desde la última verificación exitosa
+        if sha_esperado and sello and sello == _sello(path, sha_esperado):
+            return resultado(True, "sin cambios desde la última verificación")
+
+        es_valido, mensaje, sha = _validar_contenido(path, archivo, sha_esperado)
+        if es_valido:
+            return resultado(True, mensaje, sello_nuevo=_sello(path, sha))
+        print(f"⚠️ {archivo} existe pero no es válido: {mensaje}")
+
+    # Descargar a un archivo temporal y reemplazar solo si es válido
+    temporal = f"{path}.part"
+    origen = f"{espejo.rstrip('/')}/{archivo}" if espejo else url
+    print(f"📥 Descargando {archivo}...")
+    try:
+        descargar(origen, temporal)
+        es_valido, mensaje, sha = _validar_contenido(temporal, archivo, sha_esperado)
+        if not es_valido:
+            return resultado(False, f"descargado pero no es válido: {mensaje}")
+        os.replace(temporal, path)
+        print(f"✅ {archivo} descargado y validado correctamente.")
+        return resultado(True, mensaje, descargado=True, sello_nuevo=_sello(path, sha))
+    except Exception as e:
+        return resultado(False, f"error en la descarga: {str(e)}")
+    finally:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+
+
+def preparar_artefactos(directorio=MODELOS_DIR, archivos_a_descargar=None, descargar=None,
+                        max_workers=MAX_DESCARGAS_PARALELAS):
+    """Descarga en paralelo los artefactos faltantes o corruptos y verifica el resto"""
+    archivos_a_descargar = archivos_a_descargar or ARCHIVOS_A_DESCARGAR
+    os.makedirs(directorio, exist_ok=True)
+
+    espejo = os.environ.get(VARIABLE_ESPEJO)
+    if descargar is None:
+        descargar = descargar_http if espejo else descargar_gdown
+
+    esperados = leer_manifiesto(directorio).get("artefactos", {})
+    sellos = _leer_sellos(directorio)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futuros = [
+            executor.submit(_preparar_artefacto, url, archivo, directorio, esperados.get(archivo, {}),
+                            sellos.get(archivo), descargar, espejo)
+            for url, archivo in archivos_a_descargar.items()
+        ]
+        salidas = [futuro.result() for futuro in futuros]
+
+    # Guardar los sellos solo si cambió alguno
+    sellos_nuevos = dict(sellos)
+    for resultado, sello in salidas:
+        if sello is not None:
+            sellos_nuevos[resultado.archivo] = sello
+        elif not resultado.ok:
+            sellos_nuevos.pop(resultado.archivo, None)
+    if sellos_nuevos != sellos:
+        try:
+            _guardar_json(sellos_nuevos, os.path.join(directorio, ARCHIVO_SELLOS))
+        except OSError as e:
+            print(f"⚠️ No se pudieron guardar los sellos de verificación: {e}")
+
+    return [resultado for resultado, _ in salidas]
+
+
+if __name__ == "__main__":
+    import sys
+
+    if "--actualizar-manifiesto" in sys.argv:
+        manifiesto = actualizar_manifiesto()
+        print(f"✅ Manifiesto actualizado con {len(manifiesto['artefactos'])} artefactos")
+    else:
+        for r in preparar_artefactos():
+            print(f"{'✅' if r.ok else '❌'} {r.archivo}: {r.mensaje} ({r.tiempo_s * 1000:.1f} ms)")
@@ -0,0 +1,322 @@
+# Reentrenamiento reproducible de los modelos A a H a partir del dataset ampliado
+# (dataset_LIMPIO_original, leído del almacén Parquet igual que en el backtest).
+# Cada modelo se declara con su objetivo, tipo y escalado; las variables son las de
+# FEATURES_MODELOS (las que piden las pestañas, en el mismo orden). Los modelos se
+# entrenan en paralelo con joblib y cada .pkl se escribe con el mismo formato que
+# los publicados (dict con modelo, scaler, features, target, métricas, fecha de
+# entrenamiento...).
+#
+# Un modelo reentrenado solo reemplaza al .pkl actual si en la misma partición de
+# prueba su R² es al menos igual al del actual; si no, se conserva el actual (y se
+# registra la decisión para no volver a entrenarlo con las mismas entradas).
+# --aceptar-peores lo reemplaza igual.
+#
+# El entrenamiento es incremental: en modelos/metadata.json ("modelos") se guarda
+# una huella de las columnas de entrada de cada modelo (variables y objetivo, filas
+# completas) y de su receta; un modelo solo se reentrena si esa huella cambió o si
+# su .pkl ya no es el que se escribió. Junto a cada .pkl se escribe su versión en
+# formato nativo (servicios/formato_modelos.py), que es la que carga la app. El
+# SHA-256 y tamaño de cada .pkl nuevo se actualizan también en "artefactos", para
+# que la verificación del arranque no lo reemplace por la copia de Google Drive.
+#
+# Ejecutar desde la raíz del repositorio:
+#   python -m servicios.entrenamiento [--modelos A B ...] [--forzar] [--aceptar-peores] [--procesos N]
+import hashlib
+import json
+import os
+import pickle
+import time
+import warnings
+from dataclasses import dataclass
+from datetime import datetime
+
+from servicios.registro_modelos import CATALOGO_MODELOS, FEATURES_MODELOS, MODELOS_DIR
+
+# Hiperparámetros comunes de los bosques aleatorios
+PARAMETROS_BOSQUE = {'n_estimators': 50, 'max_depth': 10, 'random_state': 42}
+
+# Partición entrenamiento/prueba (las métricas se calculan sobre la prueba)
+PROPORCION_PRUEBA = 0.2
+SEMILLA_PARTICION = 42
+
+# Objetivo, algoritmo y escalado de cada modelo
+ESPECIFICACIONES = {
+    "A": {"objetivo": 'RENTABILIDAD', "tipo": "RandomForest", "escalado": True},
+    "B": {"objetivo": 'COSTO', "tipo": "RandomForest", "escalado": False},
+    "D": {"objetivo": 'QUESO TIPO CUARTIROLO $/kg', "tipo": "LinearRegression", "escalado": True},
+    "E": {"objetivo": 'LPE GDT dólares/ton.', "tipo": "RandomForest", "escalado": True},
+    "F": {"objetivo": 'Precio Promedio Novillitos', "tipo": "LinearRegression", "escalado": True},
+    "G": {"objetivo": 'Precio/litro Nacional - SIGLeA', "tipo": "RandomForest", "escalado": False},
+    "H": {"objetivo": 'Precio/litro Nacional - SIGLeA', "tipo": "RandomForest", "escalado": False},
+}
+
+
+class ErrorEntrenamiento(Exception):
+    """El dataset no tiene las columnas que necesita un modelo"""
+
+
+@dataclass
+class ResultadoEntrenamiento:
+    """Estado de un modelo después de una corrida"""
+    modelo_id: str
+    archivo: str
+    reentrenado: bool
+    motivo: str
+    sha256: str = None
+    metricas: dict = None
+    tiempo_s: float = 0.0
+    # Métricas del modelo que se conservó por tener mejor R² que el reentrenado
+    metricas_actual: dict = None
+
+
+def receta(modelo_id):
+    """Todo lo que, además de los datos, determina el modelo entrenado"""
+    especificacion = ESPECIFICACIONES[modelo_id]
+    return {
+        "features": FEATURES_MODELOS[modelo_id],
+        "objetivo": especificacion["objetivo"],
+        "tipo_modelo": especificacion["tipo"],
+        "escalado": especificacion["escalado"],
+        "parametros": PARAMETROS_BOSQUE if especificacion["tipo"] == "RandomForest" else {},
+        "prueba": PROPORCION_PRUEBA,
+        "semilla": SEMILLA_PARTICION,
+    }
+
+
+def tabla_modelo(datos, modelo_id):
+    """Variables y objetivo del modelo (nombres de FEATURES_MODELOS) con las filas completas"""
+    from servicios.backtest import normalizar
+
+    columnas = {normalizar(c): c for c in datos.columns}
+    nombres = FEATURES_MODELOS[modelo_id] + [ESPECIFICACIONES[modelo_id]["objetivo"]]
+    faltantes = [n for n in nombres if normalizar(n) not in columnas]
+    if faltantes:
+        raise ErrorEntrenamiento(f"{modelo_id}: faltan columnas en el dataset: {', '.join(faltantes)}")
+    tabla = datos[[columnas[normalizar(n)] for n in nombres]].astype("float64").dropna()
+    tabla.columns = nombres
+    return tabla
+
+
+def huella_entradas(tabla, modelo_id):
+    """SHA-256 de las columnas de entrada (nombres y valores en orden) y de la receta"""
+    h = hashlib.sha256(json.dumps(receta(modelo_id), sort_keys=True, ensure_ascii=False).encode("utf-8"))
+    h.update(tabla.index.astype("int64").to_numpy().tobytes())
+    h.update(tabla.to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def evaluar_actual(path, X_prueba, y_prueba):
+    """Métricas del .pkl actual sobre la partición de prueba (None si no existe o no se puede evaluar)"""
+    from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+
+    try:
+        with open(path, 'rb') as f:
+            actual = pickle.load(f)
+        X = X_prueba[actual['features']]
+        with warnings.catch_warnings():
+            # Los estimadores ajustados sin nombres de variables avisan al recibir un DataFrame
+            warnings.simplefilter("ignore", UserWarning)
+            if actual.get('scaler') is not None:
+                X = actual['scaler'].transform(X)
+            predichos = actual['modelo'].predict(X)
+    except Exception:
+        return None
+    return {
+        'mse': float(mean_squared_error(y_prueba, predichos)),
+        'mae': float(mean_absolute_error(y_prueba, predichos)),
+        'r2': float(r2_score(y_prueba, predichos)),
+    }
+
+
+def entrenar_modelo(modelo_id, tabla, path_actual=None):
+    """Entrena un modelo y devuelve (modelo_id, dict del .pkl, métricas del .pkl actual, segundos)"""
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.linear_model import LinearRegression
+    from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+    from sklearn.model_selection import train_test_split
+    from sklearn.preprocessing import StandardScaler
+
+    inicio = time.perf_counter()
+    especificacion = ESPECIFICACIONES[modelo_id]
+    features = FEATURES_MODELOS[modelo_id]
+    X, y = tabla[features], tabla[especificacion["objetivo"]]
+    X_entrenamiento, X_prueba, y_entrenamiento, y_prueba = train_test_split(
+        X, y, test_size=PROPORCION_PRUEBA, random_state=SEMILLA_PARTICION)
+    # El modelo actual se mide en la misma partición para decidir si se reemplaza
+    metricas_actual = evaluar_actual(path_actual, X_prueba, y_prueba) if path_actual else None
+
+    scaler = None
+    if especificacion["escalado"]:
+        scaler = StandardScaler().fit(X_entrenamiento)
+        X_entrenamiento, X_prueba = (
+            scaler.transform(X_entrenamiento), scaler.transform(X_prueba))
+    if especificacion["tipo"] == "RandomForest":
+        estimador = RandomForestRegressor(**PARAMETROS_BOSQUE)
+        parametros = dict(PARAMETROS_BOSQUE)
+    else:
+        estimador = LinearRegression()
+        parametros = {'algoritmo': f"Linear Regression{' con StandardScaler' if scaler is not None else ''}"}
+    # Sin scaler el estimador se ajusta con el DataFrame y guarda los nombres de las variables
+    estimador.fit(X_entrenamiento, y_entrenamiento)
+    predichos = estimador.predict(X_prueba)
+
+    modelo = {
+        'modelo': estimador,
+        'scaler': scaler,
+        'features': list(features),
+        'target': especificacion["objetivo"],
+        'metricas': {
+            'mse': float(mean_squared_error(y_prueba, predichos)),
+            'mae': float(mean_absolute_error(y_prueba, predichos)),
+            'r2': float(r2_score(y_prueba, predichos)),
+        },
+        'tipo_modelo': especificacion["tipo"],
+        'preprocesamiento': 'Estandarizado' if scaler is not None else 'Original',
+        'parametros': parametros,
+        'fecha_entrenamiento': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        'datos_hasta': f"{tabla.index.max():%Y-%m}",
+        'filas_entrenamiento': len(X_entrenamiento),
+        'filas_prueba': len(X_prueba),
+    }
+    return modelo_id, modelo, metricas_actual, time.perf_counter() - inicio
+
+
+def _escribir_pkl(modelo, path):
+    temporal = f"{path}.tmp"
+    with open(temporal, 'wb') as f:
+        pickle.dump(modelo, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporal, path)
+
+
+def pendientes(datos, modelos, manifiesto, directorio=MODELOS_DIR, forzar=False):
+    """{modelo_id: (tabla, huella, motivo)} de los modelos que hay que reentrenar, y los que no"""
+    from servicios.descargas import calcular_sha256
+
+    registrados = manifiesto.get("modelos", {})
+    a_entrenar, al_dia = {}, []
+    for modelo_id in modelos:
+        tabla = tabla_modelo(datos, modelo_id)
+        huella = huella_entradas(tabla, modelo_id)
+        registro = registrados.get(modelo_id, {})
+        path = os.path.join(directorio, f"{CATALOGO_MODELOS[modelo_id]}.pkl")
+        if forzar:
+            motivo = "reentrenamiento forzado"
+        elif not registro:
+            motivo = "sin entrenamiento registrado"
+        elif registro.get("huella_entradas") != huella:
+            motivo = "cambiaron las columnas de entrada"
+        elif not os.path.exists(path) or calcular_sha256(path) != registro.get("sha256"):
+            motivo = "el .pkl no es el que se entrenó"
+        else:
+            al_dia.append(modelo_id)
+            continue
+        a_entrenar[modelo_id] = (tabla, huella, motivo)
+    return a_entrenar, al_dia
+
+
+def entrenar(modelos=None, forzar=False, procesos=-1, directorio=MODELOS_DIR, aceptar_peores=False):
+    """Reentrena en paralelo los modelos cuyas entradas cambiaron y actualiza metadata.json
+
+    Un modelo reentrenado con menor R² de prueba que el actual no lo reemplaza
+    (salvo con aceptar_peores)
+    """
+    from joblib import Parallel, delayed
+    from servicios.backtest import cargar_datos
+    from servicios.descargas import calcular_sha256, guardar_manifiesto, leer_manifiesto
+    from servicios.formato_modelos import convertir_modelo
+
+    modelos = list(modelos or ESPECIFICACIONES)
+    desconocidos = [m for m in modelos if m not in ESPECIFICACIONES]
+    if desconocidos:
+        raise ErrorEntrenamiento(f"Modelos sin especificación de entrenamiento: {', '.join(desconocidos)}")
+
+    datos = cargar_datos()
+    manifiesto = leer_manifiesto(directorio)
+    a_entrenar, al_dia = pendientes(datos, modelos, manifiesto, directorio, forzar)
+
+    resultados = {m: ResultadoEntrenamiento(m, f"{CATALOGO_MODELOS[m]}.pkl", False, "entradas sin cambios",
+                                            manifiesto["modelos"][m]["sha256"], manifiesto["modelos"][m]["metricas"])
+                  for m in al_dia}
+    if a_entrenar:
+        entrenados = Parallel(n_jobs=procesos)(
+            delayed(entrenar_modelo)(modelo_id, tabla, os.path.join(directorio, f"{CATALOGO_MODELOS[modelo_id]}.pkl"))
+            for modelo_id, (tabla, _, _) in a_entrenar.items())
+
+        # Los .pkl y el manifiesto se escriben desde este proceso, uno por vez
+        registrados = manifiesto.setdefault("modelos", {})
+        artefactos = manifiesto.setdefault("artefactos", {})
+        for modelo_id, modelo, metricas_actual, tiempo_s in entrenados:
+            tabla, huella, motivo = a_entrenar[modelo_id]
+            archivo = f"{CATALOGO_MODELOS[modelo_id]}.pkl"
+            path = os.path.join(directorio, archivo)
+            if (not aceptar_peores and metricas_actual is not None
+                    and modelo['metricas']['r2'] < metricas_actual['r2']):
+                # El actual predice mejor la misma prueba: se conserva y se registra la decisión
+                sha256 = calcular_sha256(path)
+                registrados[modelo_id] = {
+                    "archivo": archivo,
+                    "sha256": sha256,
+                    "tamaño": os.path.getsize(path),
+                    "huella_entradas": huella,
+                    "conservado": True,
+                    "metricas": metricas_actual,
+                    "metricas_reentrenado": modelo['metricas'],
+                }
+                resultados[modelo_id] = ResultadoEntrenamiento(
+                    modelo_id, archivo, False,
+                    f"{motivo}; se conserva el actual (R² {metricas_actual['r2']:.4f} contra "
+                    f"{modelo['metricas']['r2']:.4f} del reentrenado)",
+                    sha256, modelo['metricas'], tiempo_s, metricas_actual)
+                continue
+            _escribir_pkl(modelo, path)
+            # La app lee la versión nativa (memory map, sin pickle), ligada a este .pkl
+            convertir_modelo(modelo_id, modelo, path, os.path.join(directorio, "nativos"))
+            sha256 = calcular_sha256(path)
+            registrados[modelo_id] = {
+                "archivo": archivo,
+                "sha256": sha256,
+                "tamaño": os.path.getsize(path),
+                "huella_entradas": huella,
+                "columnas": FEATURES_MODELOS[modelo_id] + [ESPECIFICACIONES[modelo_id]["objetivo"]],
+                "filas": len(tabla),
+                "desde": f"{tabla.index.min():%Y-%m}",
+                "hasta": f"{tabla.index.max():%Y-%m}",
+                "tipo_modelo": modelo['tipo_modelo'],
+                "parametros": modelo['parametros'],
+                "metricas": modelo['metricas'],
+                "fecha_entrenamiento": modelo['fecha_entrenamiento'],
+                "tiempo_s": round(tiempo_s, 3),
+            }
+            artefactos.setdefault(archivo, {}).update({"sha256": sha256, "tamaño": os.path.getsize(path)})
+            resultados[modelo_id] = ResultadoEntrenamiento(modelo_id, archivo, True, motivo, sha256,
+                                                           modelo['metricas'], tiempo_s)
+        manifiesto["total_modelos"] = len(registrados)
+        guardar_manifiesto(manifiesto, directorio)
+
+    return [resultados[m] for m in modelos]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Reentrenamiento incremental de los modelos A a H")
+    parser.add_argument("--modelos", nargs="+", choices=list(ESPECIFICACIONES), help="por defecto, todos")
+    parser.add_argument("--forzar", action="store_true", help="reentrena aunque las entradas no hayan cambiado")
+    parser.add_argument("--aceptar-peores", action="store_true",
+                        help="reemplaza el modelo actual aunque el reentrenado tenga menor R² de prueba")
+    parser.add_argument("--procesos", type=int, default=-1, help="procesos de joblib (por defecto, uno por CPU)")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    resultados = entrenar(args.modelos, args.forzar, args.procesos, aceptar_peores=args.aceptar_peores)
+    print(f"{'Modelo':<6} | {'Estado':<12} | {'R² prueba':>9} | {'SHA-256':<12} | Motivo")
+    print("-" * 80)
+    for r in resultados:
+        estado = "reentrenado" if r.reentrenado else ("conservado" if r.metricas_actual else "al día")
+        metricas = r.metricas_actual or r.metricas
+        print(f"{r.modelo_id:<6} | {estado:<12} | {metricas['r2']:>9.4f} | {r.sha256[:12]:<12} | {r.motivo}")
+    reentrenados = [r for r in resultados if r.reentrenado]
+    print(f"\n⏱️ {len(reentrenados)} de {len(resultados)} modelos reentrenados en {time.perf_counter() - inicio:.1f} s")
+    if reentrenados:
+        print("ℹ️ Los procesos de la app que ya cargaron estos modelos siguen usando la versión anterior hasta "
+              "reiniciarse. Suba los .pkl nuevos a Google Drive: el manifiesto ya tiene sus SHA-256.")
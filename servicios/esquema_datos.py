@@ -0,0 +1,121 @@
+# Tipos compactos de las columnas de cada dataset.
+# pandas lee todo número como float64 (o int64). Una columna decimal solo pasa a
+# float32 si todos sus valores, redondeados a los decimales que muestran las tablas,
+# quedan iguales (los usuarios copian esos valores a las entradas de predicción);
+# si no, queda en float64. Las fechas van como datetime64 y las banderas 0/1 como
+# int8. Las columnas que no se declaran usan el tipo por defecto según su tipo original.
+import sys
+from dataclasses import dataclass
+
+# Tipo por defecto de las columnas no declaradas (float32 solo si conserva los decimales visibles)
+TIPO_FLOTANTE = "float32"
+TIPO_ENTERO = "int32"
+
+# Decimales que muestran las tablas de la app
+DECIMALES_VISIBLES = 4
+
+# Columnas de texto con pocos valores distintos (proporción sobre el total de filas)
+PROPORCION_CATEGORICA = 0.5
+
+# Columnas de más de 100.000 unidades: float32 redondearía los centavos (se declaran
+# para no tener que verificarlas en cada carga)
+_MAGNITUDES_GRANDES = {
+    "EXPORTACIONES miles de US$/mes": "float64",
+    "ELABORACIÓN TOTAL": "float64",
+    "EXISTENCIAS TOTAL": "float64",
+    "VENTAS TOTALES": "float64",
+}
+
+ESQUEMAS = {
+    "archivo": {
+        "Mes": "datetime64[ns]",
+        **_MAGNITUDES_GRANDES,
+    },
+    "dataset_LIMPIO_original": {
+        "Fecha": "datetime64[ns]",
+        **_MAGNITUDES_GRANDES,
+        "Litros": "float64",
+        "Salario Tendencia de ciclo": "float64",
+        "Salario Desestacionalizado": "float64",
+        "Promedio del sector": "float64",
+        "Promedio general sector privado": "float64",
+        "Sequia": "int8",
+        "Inundacion": "int8",
+    },
+}
+
+
+@dataclass
+class MemoriaObjeto:
+    """Memoria ocupada por un objeto de la sesión"""
+    nombre: str
+    tipo: str
+    bytes: int
+    bytes_original: int = None
+
+
+def conserva_decimales(serie, tipo=TIPO_FLOTANTE, decimales=DECIMALES_VISIBLES):
+    """True si la columna pasa a `tipo` y vuelve sin cambiar ningún valor redondeado a `decimales`"""
+    import numpy as np
+
+    valores = serie.to_numpy(dtype="float64")
+    ida_y_vuelta = valores.astype(tipo).astype("float64")
+    return (np.allclose(ida_y_vuelta, valores, rtol=0, atol=0.5 * 10 ** -decimales, equal_nan=True)
+            and np.array_equal(np.round(ida_y_vuelta, decimales), np.round(valores, decimales), equal_nan=True))
+
+
+def _tipo_por_defecto(serie):
+    if serie.dtype.kind == "f":
+        return TIPO_FLOTANTE if conserva_decimales(serie) else None
+    if serie.dtype.kind in "iu":
+        return TIPO_ENTERO
+    if serie.dtype == object and len(serie) and serie.nunique() <= PROPORCION_CATEGORICA * len(serie):
+        return "category"
+    return None
+
+
+def esquema_compacto(nombre, df):
+    """Tipo de cada columna: el declarado para el dataset o el compacto por defecto"""
+    declarados = ESQUEMAS.get(nombre, {})
+    esquema = {}
+    for columna in df.columns:
+        # Los nombres se comparan sin espacios repetidos (algunos originales los tienen)
+        tipo = declarados.get(" ".join(str(columna).split())) or _tipo_por_defecto(df[columna])
+        if tipo and str(df[columna].dtype) != tipo:
+            esquema[columna] = tipo
+    return esquema
+
+
+def aplicar_esquema(nombre, df):
+    """Convierte el DataFrame a los tipos compactos y guarda en attrs la memoria original"""
+    import pandas as pd
+
+    memoria_original = int(df.memory_usage(deep=True).sum())
+    esquema = esquema_compacto(nombre, df)
+    fechas = [c for c, tipo in esquema.items() if tipo.startswith("datetime64")]
+    df = df.astype({c: tipo for c, tipo in esquema.items() if c not in fechas}, copy=False)
+    for columna in fechas:
+        df[columna] = pd.to_datetime(df[columna], errors="coerce")
+    df.attrs["memoria_original"] = memoria_original
+    return df
+
+
+def memoria_objeto(objeto):
+    """Bytes ocupados por un objeto (DataFrames y arrays con su contenido)"""
+    if hasattr(objeto, "memory_usage"):
+        uso = objeto.memory_usage(deep=True)
+        return int(uso.sum() if hasattr(uso, "sum") else uso)
+    if hasattr(objeto, "nbytes"):
+        return int(objeto.nbytes)
+    if isinstance(objeto, (list, tuple, set)):
+        return sys.getsizeof(objeto) + sum(memoria_objeto(o) for o in objeto)
+    if isinstance(objeto, dict):
+        return sys.getsizeof(objeto) + sum(memoria_objeto(k) + memoria_objeto(v) for k, v in objeto.items())
+    return sys.getsizeof(objeto)
+
+
+def reporte_memoria(objetos):
+    """Memoria de cada objeto de {nombre: objeto}, con la original de los DataFrames compactados"""
+    return [MemoriaObjeto(nombre, type(objeto).__name__, memoria_objeto(objeto),
+                          getattr(objeto, "attrs", {}).get("memoria_original"))
+            for nombre, objeto in objetos.items()]
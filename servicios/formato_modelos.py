@@ -0,0 +1,316 @@
+# Formato nativo de los modelos: una cabecera JSON (variables, parámetros del scaler,
+# métricas y metadatos) y los arrays del estimador como .npy sin comprimir, en un
+# directorio por modelo (modelos/nativos/<nombre>/). Se lee sin pickle ni sklearn:
+# los arrays se abren con np.load(mmap_mode='r'), así que la carga no copia datos y
+# todos los procesos que usan el mismo archivo comparten las páginas en memoria.
+#
+# Los .pkl siguen siendo el artefacto de entrenamiento y de descarga; la conversión
+# (que sí deserializa el .pkl) se hace una vez, offline:
+#   python -m servicios.formato_modelos [--modelos A B ...]
+import json
+import os
+
+import numpy as np
+
+from servicios.bosque_compilado import BosqueCompilado, compilar_bosque, es_bosque_compilable
+from servicios.registro_modelos import CATALOGO_MODELOS, MODELOS_DIR
+
+VERSION_FORMATO = 1
+DIRECTORIO_NATIVO = os.path.join(MODELOS_DIR, "nativos")
+ARCHIVO_CABECERA = "modelo.json"
+
+# Arrays de cada tipo de objeto: nombre -> (dtype, dimensiones)
+ARRAYS_BOSQUE = {
+    "variable": ("int64", 1), "umbral": ("float64", 1), "izquierdo": ("int64", 1),
+    "derecho": ("int64", 1), "valor": ("float64", 1), "raices": ("int64", 1),
+}
+ARRAYS_LINEAL = {"coef": ("float64", 1)}
+ARRAYS_ESCALADOR = {"media": ("float64", 1), "escala": ("float64", 1)}
+
+
+class ErrorFormatoModelo(Exception):
+    """El directorio no tiene un modelo en formato nativo válido"""
+
+
+class Escalador:
+    """StandardScaler ya ajustado, reconstruido a partir de su media y escala"""
+
+    def __init__(self, media, escala, with_mean=True, with_std=True, feature_names_in=None):
+        self.mean_ = media
+        self.scale_ = escala
+        self.with_mean = with_mean
+        self.with_std = with_std
+        self.n_features_in_ = len(media)
+        if feature_names_in is not None:
+            self.feature_names_in_ = np.array(feature_names_in, dtype=object)
+
+    def transform(self, X):
+        datos = np.asarray(X, dtype=np.float64)
+        if self.with_mean:
+            datos = datos - self.mean_
+        if self.with_std:
+            datos = datos / self.scale_
+        return datos
+
+    def sin_entrenar(self):
+        """StandardScaler de sklearn con los mismos parámetros, para reajustarlo"""
+        from sklearn.preprocessing import StandardScaler
+        return StandardScaler(with_mean=self.with_mean, with_std=self.with_std)
+
+
+class ModeloLineal:
+    """Regresión lineal ajustada: coeficientes e intercepto"""
+
+    def __init__(self, coef, intercepto, parametros, feature_names_in=None):
+        self.coef_ = coef
+        self.intercept_ = intercepto
+        self.parametros = parametros
+        self.n_features_in_ = len(coef)
+        if feature_names_in is not None:
+            self.feature_names_in_ = np.array(feature_names_in, dtype=object)
+
+    def predict(self, X):
+        return np.asarray(X, dtype=np.float64) @ self.coef_ + self.intercept_
+
+    def sin_entrenar(self):
+        from sklearn.linear_model import LinearRegression
+        return LinearRegression(**self.parametros)
+
+
+class BosqueNativo:
+    """Bosque aleatorio ya compilado a arrays planos (ver servicios/bosque_compilado.py)"""
+
+    def __init__(self, bosque, parametros, feature_names_in=None):
+        self.bosque = bosque
+        self.parametros = parametros
+        self.n_features_in_ = bosque.n_features
+        if feature_names_in is not None:
+            self.feature_names_in_ = np.array(feature_names_in, dtype=object)
+
+    def predict(self, X):
+        return self.bosque.predecir(X)
+
+    def sin_entrenar(self):
+        from sklearn.ensemble import RandomForestRegressor
+        return RandomForestRegressor(**self.parametros)
+
+
+def sin_entrenar(objeto):
+    """Copia sin ajustar de un estimador o scaler (de sklearn o del formato nativo)"""
+    if hasattr(objeto, "sin_entrenar"):
+        return objeto.sin_entrenar()
+    from sklearn.base import clone
+    return clone(objeto)
+
+
+def ruta_nativa(modelo_id, directorio=DIRECTORIO_NATIVO):
+    """Directorio del modelo en formato nativo"""
+    return os.path.join(directorio, CATALOGO_MODELOS[modelo_id])
+
+
+def _nombres(objeto):
+    nombres = getattr(objeto, "feature_names_in_", None)
+    return [str(n) for n in nombres] if nombres is not None else None
+
+
+def valor_json(valor):
+    """Convierte escalares de NumPy a tipos de JSON (los metadatos del .pkl los traen)"""
+    if isinstance(valor, dict):
+        return {str(k): valor_json(v) for k, v in valor.items()}
+    if isinstance(valor, (list, tuple)):
+        return [valor_json(v) for v in valor]
+    if isinstance(valor, np.generic):
+        return valor.item()
+    return valor
+
+
+def _describir_estimador(estimador, prefijo, arrays):
+    """Cabecera del estimador; agrega sus arrays a 'arrays'"""
+    nombre_clase = type(estimador).__name__
+    parametros = valor_json(estimador.get_params())
+    if es_bosque_compilable(estimador):
+        bosque = compilar_bosque(estimador)
+        for nombre in ARRAYS_BOSQUE:
+            arrays[f"{prefijo}_{nombre}"] = getattr(bosque, nombre)
+        return {"tipo": "bosque", "clase": nombre_clase, "parametros": parametros,
+                "profundidad": bosque.profundidad, "n_features": bosque.n_features,
+                "feature_names_in": _nombres(estimador)}
+    coef = np.asarray(getattr(estimador, "coef_", None), dtype=np.float64)
+    intercepto = np.asarray(getattr(estimador, "intercept_", None), dtype=np.float64)
+    if coef.ndim != 1 or intercepto.size != 1 or hasattr(estimador, "classes_"):
+        raise ErrorFormatoModelo(f"No se puede convertir un {nombre_clase}: solo bosques y regresiones lineales")
+    arrays[f"{prefijo}_coef"] = coef
+    return {"tipo": "lineal", "clase": nombre_clase, "parametros": parametros,
+            "intercepto": float(intercepto.reshape(-1)[0]), "feature_names_in": _nombres(estimador)}
+
+
+def guardar_nativo(modelo, destino, origen=None):
+    """Escribe el modelo (dict del .pkl o estimador legacy) en formato nativo"""
+    arrays = {}
+    if isinstance(modelo, dict) and "modelo" in modelo:
+        estimador, scaler = modelo["modelo"], modelo.get("scaler")
+        metadatos = {k: valor_json(v) for k, v in modelo.items() if k not in ("modelo", "scaler")}
+    else:
+        estimador, scaler, metadatos = modelo, None, None
+
+    cabecera = {
+        "formato": VERSION_FORMATO,
+        "origen": origen,
+        "estimador": _describir_estimador(estimador, "estimador", arrays),
+        "scaler": None,
+        "metadatos": metadatos,
+    }
+    if scaler is not None:
+        if not all(hasattr(scaler, a) for a in ("mean_", "scale_", "with_mean", "with_std")):
+            raise ErrorFormatoModelo(f"No se puede convertir un {type(scaler).__name__}: solo StandardScaler")
+        n = scaler.n_features_in_
+        arrays["scaler_media"] = np.asarray(scaler.mean_ if scaler.with_mean else np.zeros(n), dtype=np.float64)
+        arrays["scaler_escala"] = np.asarray(scaler.scale_ if scaler.with_std else np.ones(n), dtype=np.float64)
+        cabecera["scaler"] = {"clase": type(scaler).__name__, "with_mean": bool(scaler.with_mean),
+                              "with_std": bool(scaler.with_std), "feature_names_in": _nombres(scaler)}
+    cabecera["arrays"] = {nombre: {"dtype": str(a.dtype), "forma": list(a.shape)} for nombre, a in arrays.items()}
+
+    # Se escribe en un directorio temporal y se reemplaza entero
+    temporal = f"{destino}.tmp"
+    os.makedirs(temporal, exist_ok=True)
+    for archivo in os.listdir(temporal):
+        os.remove(os.path.join(temporal, archivo))
+    for nombre, array in arrays.items():
+        np.save(os.path.join(temporal, f"{nombre}.npy"), np.ascontiguousarray(array), allow_pickle=False)
+    with open(os.path.join(temporal, ARCHIVO_CABECERA), "w", encoding="utf-8") as f:
+        json.dump(cabecera, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+    if os.path.isdir(destino):
+        for archivo in os.listdir(destino):
+            os.remove(os.path.join(destino, archivo))
+        os.rmdir(destino)
+    os.replace(temporal, destino)
+    return cabecera
+
+
+def leer_cabecera(directorio):
+    """Cabecera JSON del modelo (sin abrir los arrays)"""
+    try:
+        with open(os.path.join(directorio, ARCHIVO_CABECERA), encoding="utf-8") as f:
+            cabecera = json.load(f)
+    except (OSError, ValueError) as e:
+        raise ErrorFormatoModelo(f"Cabecera ilegible en {directorio}: {e}") from e
+    if cabecera.get("formato") != VERSION_FORMATO:
+        raise ErrorFormatoModelo(f"Versión de formato {cabecera.get('formato')} no soportada en {directorio}")
+    return cabecera
+
+
+def _abrir_array(directorio, nombre, cabecera, esperado):
+    """Array en memory map, validado contra la cabecera (sin pickle ni copia)"""
+    dtype, dimensiones = esperado
+    descripcion = cabecera["arrays"].get(nombre)
+    if descripcion is None:
+        raise ErrorFormatoModelo(f"Falta el array '{nombre}' en la cabecera de {directorio}")
+    try:
+        array = np.load(os.path.join(directorio, f"{nombre}.npy"), mmap_mode="r", allow_pickle=False)
+    except (OSError, ValueError) as e:
+        raise ErrorFormatoModelo(f"No se pudo abrir {nombre}.npy en {directorio}: {e}") from e
+    if str(array.dtype) != dtype or array.ndim != dimensiones or list(array.shape) != descripcion["forma"]:
+        raise ErrorFormatoModelo(f"{nombre}.npy no coincide con la cabecera ({array.dtype}, {array.shape})")
+    # Vista ndarray sobre el mismo mapeo: sin la sobrecarga de np.memmap al indexar
+    return np.asarray(array)
+
+
+def cargar_nativo(directorio):
+    """Modelo en el mismo formato que el .pkl (dict o estimador legacy), leído en memory map"""
+    cabecera = leer_cabecera(directorio)
+    descripcion = cabecera["estimador"]
+
+    def array(nombre, esperado):
+        return _abrir_array(directorio, nombre, cabecera, esperado)
+
+    if descripcion["tipo"] == "bosque":
+        partes = {nombre: array(f"estimador_{nombre}", esperado) for nombre, esperado in ARRAYS_BOSQUE.items()}
+        bosque = BosqueCompilado(**partes, profundidad=int(descripcion["profundidad"]),
+                                 n_features=int(descripcion["n_features"]))
+        estimador = BosqueNativo(bosque, descripcion["parametros"], descripcion["feature_names_in"])
+    elif descripcion["tipo"] == "lineal":
+        estimador = ModeloLineal(array("estimador_coef", ARRAYS_LINEAL["coef"]), float(descripcion["intercepto"]),
+                                 descripcion["parametros"], descripcion["feature_names_in"])
+    else:
+        raise ErrorFormatoModelo(f"Tipo de estimador desconocido: {descripcion['tipo']}")
+
+    if cabecera["metadatos"] is None:
+        return estimador
+    scaler = None
+    if cabecera["scaler"] is not None:
+        scaler = Escalador(array("scaler_media", ARRAYS_ESCALADOR["media"]),
+                           array("scaler_escala", ARRAYS_ESCALADOR["escala"]),
+                           cabecera["scaler"]["with_mean"], cabecera["scaler"]["with_std"],
+                           cabecera["scaler"]["feature_names_in"])
+    return {"modelo": estimador, "scaler": scaler, **cabecera["metadatos"]}
+
+
+def nativo_vigente(modelo_id, ruta_pkl, directorio=DIRECTORIO_NATIVO):
+    """True si hay versión nativa y se convirtió desde el .pkl actual (o no hay .pkl)
+
+    El SHA-256 del .pkl se toma del sello de la verificación del arranque (tamaño y
+    mtime sin cambios); solo se recalcula si el .pkl cambió desde esa verificación
+    """
+    from servicios.descargas import calcular_sha256, sha256_sellado
+
+    destino = ruta_nativa(modelo_id, directorio)
+    try:
+        cabecera = leer_cabecera(destino)
+    except ErrorFormatoModelo:
+        return False
+    if not os.path.exists(ruta_pkl):
+        return True
+    origen = cabecera.get("origen") or {}
+    sha256 = sha256_sellado(ruta_pkl) or calcular_sha256(ruta_pkl)
+    return origen.get("sha256") == sha256
+
+
+def convertir_modelo(modelo_id, modelo, ruta_pkl, directorio=DIRECTORIO_NATIVO):
+    """Guarda la versión nativa de un modelo ya cargado, ligada al SHA-256 de su .pkl"""
+    from servicios.descargas import calcular_sha256
+
+    origen = {"archivo": os.path.basename(ruta_pkl), "sha256": calcular_sha256(ruta_pkl)}
+    os.makedirs(directorio, exist_ok=True)
+    return guardar_nativo(modelo, ruta_nativa(modelo_id, directorio), origen)
+
+
+if __name__ == "__main__":
+    import argparse
+    import pickle
+    import warnings
+
+    parser = argparse.ArgumentParser(description="Convierte los .pkl al formato nativo (JSON + .npy)")
+    parser.add_argument("--modelos", nargs="+", choices=list(CATALOGO_MODELOS), help="por defecto, todos")
+    parser.add_argument("--forzar", action="store_true", help="convierte aunque la versión nativa esté al día")
+    args = parser.parse_args()
+    # La paridad se mide con arrays sin nombres de columnas
+    warnings.filterwarnings("ignore", message="X does not have valid feature names", category=UserWarning)
+
+    print(f"{'Modelo':<10} | {'Estado':<11} | {'.pkl (KB)':>9} | {'Nativo (KB)':>11} | {'Dif. máx.':>9} | Paridad")
+    print("-" * 72)
+    for modelo_id, stem in CATALOGO_MODELOS.items():
+        if args.modelos and modelo_id not in args.modelos:
+            continue
+        ruta_pkl = os.path.join(MODELOS_DIR, f"{stem}.pkl")
+        destino = ruta_nativa(modelo_id)
+        with open(ruta_pkl, "rb") as f:
+            modelo = pickle.load(f)
+        convertido = args.forzar or not nativo_vigente(modelo_id, ruta_pkl)
+        if convertido:
+            convertir_modelo(modelo_id, modelo, ruta_pkl)
+        nativo = cargar_nativo(destino)
+
+        # Paridad sobre entradas al azar alrededor de la media del scaler (o de 1)
+        estimador, scaler = (modelo["modelo"], modelo.get("scaler")) if isinstance(modelo, dict) else (modelo, None)
+        estimador_n, scaler_n = (nativo["modelo"], nativo["scaler"]) if isinstance(nativo, dict) else (nativo, None)
+        centro = scaler.mean_ if scaler is not None else np.ones(estimador.n_features_in_)
+        X = centro * np.random.default_rng(0).uniform(0.5, 1.5, size=(200, len(centro)))
+        esperado = estimador.predict(scaler.transform(X) if scaler is not None else X)
+        obtenido = estimador_n.predict(scaler_n.transform(X) if scaler_n is not None else X)
+        diferencia = float(np.max(np.abs(esperado - obtenido)))
+        paridad = np.allclose(esperado, obtenido, rtol=1e-9, atol=1e-9)
+
+        tamaño_nativo = sum(e.stat().st_size for e in os.scandir(destino))
+        print(f"{modelo_id:<10} | {'convertido' if convertido else 'al día':<11} | {os.path.getsize(ruta_pkl) / 1024:>9.1f} | "
+              f"{tamaño_nativo / 1024:>11.1f} | {diferencia:>9.1e} | {'✅' if paridad else '❌'}")
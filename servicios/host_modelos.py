@@ -0,0 +1,209 @@
+# Host de modelos compartido por varias réplicas de la app en la misma máquina.
+# Un proceso carga cada modelo una sola vez y atiende predicciones por un socket
+# Unix local; las réplicas de Streamlit (con MILKCAST_HOST_MODELOS apuntando al
+# socket) no cargan estimadores: el registro les devuelve un ModeloRemoto con los
+# metadatos del modelo (variables, objetivo, métricas) que predice a través del host.
+#
+# Protocolo: una línea JSON por petición y una por respuesta, sobre una conexión
+# persistente por hilo.
+#   {"op": "describir", "modelo": "A"}                -> {"ok": true, "modelo": {...}}
+#   {"op": "predecir", "modelo": "A", "filas": [[...]]} -> {"ok": true, "predicciones": [...]}
+#   {"op": "estado"}                                   -> {"ok": true, "modelos": [...], "peticiones": N}
+#
+# Iniciar el host desde la raíz del repositorio:
+#   python -m servicios.host_modelos [--socket /tmp/milkcast-modelos.sock]
+import json
+import os
+import socket
+import socketserver
+import threading
+
+from servicios.registro_modelos import ErrorCargaModelo
+
+# Si está definida, el registro de la app usa el host escuchando en este socket
+VARIABLE_HOST = "MILKCAST_HOST_MODELOS"
+SOCKET_POR_DEFECTO = "/tmp/milkcast-modelos.sock"
+
+# Tiempo máximo de espera de una respuesta del host
+TIMEOUT_S = 10.0
+
+
+class ErrorHostModelos(ErrorCargaModelo):
+    """El host no está disponible o respondió con un error"""
+
+
+class ModeloRemoto(dict):
+    """Metadatos de un modelo servido por el host (se indexa como el dict del .pkl)"""
+
+    def __init__(self, cliente, modelo_id, descripcion):
+        super().__init__(descripcion.get("metadatos") or {})
+        self.cliente = cliente
+        self.modelo_id = modelo_id
+        self.features = list(descripcion["features"])
+        self.objetivo = descripcion["objetivo"]
+        self.escalado = bool(descripcion["escalado"])
+
+    def predict(self, X):
+        """Predicción en el host (escalado incluido) de las filas de X"""
+        import numpy as np
+        return np.asarray(self.cliente.predecir_lote(self.modelo_id, np.asarray(X, dtype=np.float64).tolist()),
+                          dtype=np.float64)
+
+
+class ClienteModelos:
+    """Conexiones al host (una por hilo, reutilizadas entre peticiones)"""
+
+    def __init__(self, ruta_socket=SOCKET_POR_DEFECTO, timeout=TIMEOUT_S):
+        self.ruta_socket = ruta_socket
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _conexion(self):
+        conexion = getattr(self._local, "conexion", None)
+        if conexion is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(self.ruta_socket)
+            except OSError as e:
+                sock.close()
+                raise ErrorHostModelos(f"No se pudo conectar al host de modelos en {self.ruta_socket}: {e}") from e
+            conexion = (sock, sock.makefile("rb"))
+            self._local.conexion = conexion
+        return conexion
+
+    def _cerrar(self):
+        conexion = getattr(self._local, "conexion", None)
+        self._local.conexion = None
+        if conexion is not None:
+            conexion[1].close()
+            conexion[0].close()
+
+    def pedir(self, peticion):
+        """Envía una petición y devuelve la respuesta (reintenta una vez si la conexión se cortó)"""
+        mensaje = (json.dumps(peticion) + "\n").encode("utf-8")
+        for intento in range(2):
+            sock, lector = self._conexion()
+            try:
+                sock.sendall(mensaje)
+                linea = lector.readline()
+                if not linea:
+                    raise ConnectionError("el host cerró la conexión")
+                break
+            except OSError as e:
+                self._cerrar()
+                if intento == 1:
+                    raise ErrorHostModelos(f"Error de comunicación con el host de modelos: {e}") from e
+        respuesta = json.loads(linea)
+        if not respuesta.get("ok"):
+            raise ErrorHostModelos(respuesta.get("error", "error desconocido en el host"))
+        return respuesta
+
+    def modelo(self, modelo_id):
+        """ModeloRemoto con los metadatos del modelo"""
+        return ModeloRemoto(self, modelo_id, self.pedir({"op": "describir", "modelo": modelo_id})["modelo"])
+
+    def predecir_lote(self, modelo_id, filas):
+        return self.pedir({"op": "predecir", "modelo": modelo_id, "filas": filas})["predicciones"]
+
+    def estado(self):
+        return self.pedir({"op": "estado"})
+
+
+_clientes = {}
+_clientes_lock = threading.Lock()
+
+
+def obtener_cliente(ruta_socket):
+    """Cliente compartido por el proceso para un socket"""
+    cliente = _clientes.get(ruta_socket)
+    if cliente is None:
+        with _clientes_lock:
+            cliente = _clientes.get(ruta_socket)
+            if cliente is None:
+                cliente = _clientes[ruta_socket] = ClienteModelos(ruta_socket)
+    return cliente
+
+
+class _ManejadorPeticiones(socketserver.StreamRequestHandler):
+    def handle(self):
+        for linea in self.rfile:
+            try:
+                respuesta = {"ok": True, **self.server.atender(json.loads(linea))}
+            except Exception as e:
+                respuesta = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+            self.wfile.write((json.dumps(respuesta) + "\n").encode("utf-8"))
+
+
+class ServidorModelos(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Carga los modelos una vez y atiende predicciones por el socket Unix"""
+    daemon_threads = True
+
+    def __init__(self, ruta_socket=SOCKET_POR_DEFECTO, registro=None):
+        from servicios.registro_modelos import RegistroModelos
+
+        # El host carga los modelos localmente (nunca a través de otro host)
+        self.registro = registro or RegistroModelos()
+        self.ruta_socket = ruta_socket
+        self.peticiones = 0
+        self._contador_lock = threading.Lock()
+        if os.path.exists(ruta_socket):
+            os.remove(ruta_socket)
+        super().__init__(ruta_socket, _ManejadorPeticiones)
+        # Solo el usuario que corre el host (y su grupo) pueden conectarse
+        os.chmod(ruta_socket, 0o660)
+
+    def motor(self, modelo_id):
+        from servicios.motor_prediccion import obtener_motor
+        return obtener_motor(modelo_id, self.registro.obtener(modelo_id))
+
+    def cargar_todos(self):
+        """Carga todos los modelos del catálogo antes de aceptar conexiones"""
+        for modelo_id in self.registro.catalogo:
+            self.motor(modelo_id)
+
+    def atender(self, peticion):
+        with self._contador_lock:
+            self.peticiones += 1
+        op = peticion.get("op")
+        if op == "predecir":
+            predicciones = self.motor(peticion["modelo"]).predecir_lote(peticion["filas"])
+            return {"predicciones": predicciones.tolist()}
+        if op == "describir":
+            motor = self.motor(peticion["modelo"])
+            metadatos = None
+            if isinstance(motor.modelo, dict):
+                from servicios.formato_modelos import valor_json
+                metadatos = {k: valor_json(v) for k, v in motor.modelo.items() if k not in ("modelo", "scaler")}
+            return {"modelo": {"features": motor.features, "objetivo": motor.objetivo,
+                               "escalado": motor.escalado, "metadatos": metadatos}}
+        if op == "estado":
+            return {"modelos": [e.modelo_id for e in self.registro.estadisticas()], "peticiones": self.peticiones,
+                    "pid": os.getpid()}
+        raise ValueError(f"Operación desconocida: {op}")
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.ruta_socket):
+            os.remove(self.ruta_socket)
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Host de modelos compartido por socket Unix")
+    parser.add_argument("--socket", default=os.environ.get(VARIABLE_HOST, SOCKET_POR_DEFECTO))
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    servidor = ServidorModelos(args.socket)
+    servidor.cargar_todos()
+    print(f"✅ {len(servidor.registro.estadisticas())} modelos cargados en {(time.perf_counter() - inicio) * 1000:.0f} ms; "
+          f"escuchando en {args.socket} (iniciar la app con {VARIABLE_HOST}={args.socket})")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
@@ -0,0 +1,119 @@
+# Lectura de CSV en una sola pasada.
+# El delimitador y las comillas se detectan en una muestra del principio del
+# archivo, y el archivo se parsea una sola vez con el motor C de pandas: las líneas
+# con campos de más no cortan la carga, se apartan (cuarentena) y se informan con
+# su número de línea, junto con el tiempo de parseo.
+#
+# Diagnóstico manual:
+#   python -m servicios.lector_csv archivo.csv
+import csv
+import re
+import time
+import warnings
+from dataclasses import dataclass, field
+
+# Bytes que se leen para detectar el formato
+BYTES_MUESTRA = 16 * 1024
+
+# Delimitadores que se prueban al detectar el formato
+DELIMITADORES = ",;\t|"
+
+# Mensaje del motor C por cada línea descartada
+PATRON_LINEA_DESCARTADA = re.compile(r"Skipping line (\d+): (.+)")
+
+
+class ErrorLecturaCSV(Exception):
+    """CSV que no se pudo parsear ni apartando las líneas problemáticas"""
+
+
+@dataclass
+class FormatoCSV:
+    """Delimitador y comillas detectados en la muestra"""
+    delimitador: str = ","
+    comillas: str = '"'
+    detectado: bool = False
+
+
+@dataclass
+class LineaDescartada:
+    """Línea apartada del CSV (numeración del archivo, empezando en 1)"""
+    linea: int
+    motivo: str
+
+
+@dataclass
+class ResultadoLectura:
+    """DataFrame leído con el formato usado y las líneas apartadas"""
+    df: object
+    formato: FormatoCSV
+    duracion_s: float
+    descartadas: list = field(default_factory=list)
+
+    @property
+    def tiene_descartadas(self):
+        return bool(self.descartadas)
+
+
+def _leer_muestra(origen, bytes_muestra):
+    """Principio del archivo como texto (ruta o archivo abierto, que vuelve a su posición)"""
+    if hasattr(origen, "read"):
+        posicion = origen.tell()
+        muestra = origen.read(bytes_muestra)
+        origen.seek(posicion)
+        return muestra.decode('utf-8', errors='replace') if isinstance(muestra, bytes) else muestra
+    with open(origen, encoding='utf-8', errors='replace', newline='') as f:
+        return f.read(bytes_muestra)
+
+
+def detectar_formato(origen, bytes_muestra=BYTES_MUESTRA):
+    """Detecta delimitador y comillas a partir del principio del archivo"""
+    muestra = _leer_muestra(origen, bytes_muestra)
+    # La última línea de la muestra puede estar cortada
+    if len(muestra) == bytes_muestra and "\n" in muestra:
+        muestra = muestra[:muestra.rindex("\n")]
+    try:
+        dialecto = csv.Sniffer().sniff(muestra, delimiters=DELIMITADORES)
+        return FormatoCSV(dialecto.delimiter, dialecto.quotechar or '"', detectado=True)
+    except csv.Error:
+        return FormatoCSV()
+
+
+def leer_csv(origen, formato=None, **kwargs):
+    """Lee el CSV en una pasada; las líneas con campos de más se apartan en lugar de cortar la carga"""
+    import pandas as pd
+
+    inicio = time.perf_counter()
+    formato = formato or detectar_formato(origen)
+    with warnings.catch_warnings(record=True) as avisos:
+        warnings.simplefilter("always", pd.errors.ParserWarning)
+        try:
+            df = pd.read_csv(origen, sep=formato.delimitador, quotechar=formato.comillas,
+                             engine='c', on_bad_lines='warn', **kwargs)
+        except (pd.errors.ParserError, UnicodeDecodeError) as e:
+            nombre = getattr(origen, "name", origen)
+            raise ErrorLecturaCSV(f"No se pudo parsear {nombre} (delimitador {formato.delimitador!r}): {e}") from e
+
+    descartadas = []
+    for aviso in avisos:
+        if not issubclass(aviso.category, pd.errors.ParserWarning):
+            continue
+        for linea in str(aviso.message).splitlines():
+            coincidencia = PATRON_LINEA_DESCARTADA.match(linea.strip())
+            if coincidencia:
+                descartadas.append(LineaDescartada(int(coincidencia.group(1)), coincidencia.group(2)))
+    return ResultadoLectura(df, formato, time.perf_counter() - inicio, descartadas)
+
+
+if __name__ == "__main__":
+    import sys
+
+    for ruta in sys.argv[1:]:
+        try:
+            resultado = leer_csv(ruta)
+        except ErrorLecturaCSV as e:
+            print(f"❌ {e}")
+            continue
+        print(f"✅ {ruta}: {resultado.df.shape[0]} filas, {resultado.df.shape[1]} columnas, "
+              f"delimitador {resultado.formato.delimitador!r}, {resultado.duracion_s * 1000:.1f} ms")
+        for descartada in resultado.descartadas:
+            print(f"   ⚠️ línea {descartada.linea}: {descartada.motivo}")
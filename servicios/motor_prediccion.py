@@ -0,0 +1,194 @@
+# Motor de predicción compartido por las pestañas, la predicción por lotes y la API.
+# Cada modelo se declara una sola vez con su especificación (variables, escalado y
+# objetivo) y la transformación + predicción se hace sobre arrays NumPy contiguos,
+# sin armar DataFrames intermedios.
+import itertools
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+
+from servicios.registro_modelos import FEATURES_MODELOS
+from servicios.bosque_compilado import compilar_bosque, es_bosque_compilable
+from servicios.cache_predicciones import obtener_cache
+from servicios.telemetria import obtener_telemetria
+
+# Variable objetivo de las regresiones originales (no guardan 'target' en el PKL)
+OBJETIVO_LEGACY = 'Precio/litro Nacional - SIGLeA'
+
+# Cada motor creado recibe una versión nueva: si el modelo se recarga, las
+# predicciones guardadas en la caché con la versión anterior dejan de usarse
+_versiones = itertools.count(1)
+
+
+@dataclass(frozen=True)
+class EspecificacionModelo:
+    """Variables de entrada (en orden), objetivo y si el modelo usa escalado"""
+    modelo_id: str
+    features: tuple
+    objetivo: str
+    escalado: bool = False
+
+
+def _con_nombres(objeto, datos):
+    """Entrada para un objeto de sklearn: DataFrame con sus nombres si se entrenó con ellos
+
+    El orden de las columnas ya se validó al crear el motor; con los nombres sklearn
+    no avisa de "X does not have valid feature names"
+    """
+    nombres = getattr(objeto, 'feature_names_in_', None)
+    if nombres is None:
+        return datos
+    import pandas as pd
+
+    return pd.DataFrame(datos, columns=nombres, copy=False)
+
+
+class MotorPrediccion:
+    """Transformación y predicción de un modelo sobre arrays NumPy"""
+
+    def __init__(self, especificacion, estimador, scaler=None, modelo=None):
+        self.especificacion = especificacion
+        self.estimador = estimador
+        self.scaler = scaler
+        # Objeto original (dict completo o estimador legacy), para metadatos
+        self.modelo = modelo
+        self.version = (especificacion.modelo_id, next(_versiones))
+        self._media, self._escala = self._parametros_scaler(scaler, len(especificacion.features))
+        # Los bosques aleatorios se evalúan con su versión compilada a arrays planos
+        # (los del formato nativo ya vienen compilados)
+        self.bosque = getattr(estimador, 'bosque', None)
+        if self.bosque is None and es_bosque_compilable(estimador):
+            self.bosque = compilar_bosque(estimador)
+        # Los modelos lineales se reducen a coeficientes con el escalado ya incorporado
+        self.coeficientes, self.intercepto = self._fusionar_lineal()
+
+        # Verificar una sola vez que el orden de columnas coincide con el entrenamiento
+        for objeto in (scaler, estimador):
+            nombres = getattr(objeto, 'feature_names_in_', None)
+            if nombres is not None and [str(n).strip() for n in nombres] != [f.strip() for f in especificacion.features]:
+                raise ValueError(f"{especificacion.modelo_id}: las variables no coinciden con las del entrenamiento")
+
+    @staticmethod
+    def _parametros_scaler(scaler, n_features):
+        """Media y escala de un StandardScaler como arrays contiguos (None para otros scalers)"""
+        if scaler is None or not hasattr(scaler, 'with_mean') or not hasattr(scaler, 'with_std'):
+            return None, None
+        media = scaler.mean_ if scaler.with_mean else np.zeros(n_features)
+        escala = scaler.scale_ if scaler.with_std else np.ones(n_features)
+        return (np.ascontiguousarray(media, dtype=np.float64),
+                np.ascontiguousarray(escala, dtype=np.float64))
+
+    def _fusionar_lineal(self):
+        """Coeficientes e intercepto con el StandardScaler incorporado (None si no es lineal)"""
+        coef = getattr(self.estimador, 'coef_', None)
+        intercepto = getattr(self.estimador, 'intercept_', None)
+        if coef is None or intercepto is None or hasattr(self.estimador, 'classes_'):
+            return None, None
+        coef = np.asarray(coef, dtype=np.float64)
+        intercepto = np.asarray(intercepto, dtype=np.float64)
+        if coef.size != len(self.especificacion.features) or intercepto.size != 1:
+            return None, None
+        if self.scaler is not None and self._media is None:
+            # Otro tipo de scaler: no se puede incorporar, se usa el camino general
+            return None, None
+
+        coef = coef.reshape(-1)
+        intercepto = float(intercepto.reshape(-1)[0])
+        if self._media is not None:
+            # w·((x - media) / escala) + b  =  (w / escala)·x + (b - w·(media / escala))
+            coef = coef / self._escala
+            intercepto -= float(coef @ self._media)
+        return np.ascontiguousarray(coef), intercepto
+
+    @classmethod
+    def desde_modelo(cls, modelo_id, modelo):
+        """Arma el motor a partir del dict completo del PKL o de un estimador legacy"""
+        from servicios.host_modelos import ModeloRemoto
+
+        if isinstance(modelo, ModeloRemoto):
+            # El host aplica el escalado y predice; acá solo quedan la especificación y la caché
+            especificacion = EspecificacionModelo(modelo_id, tuple(modelo.features), modelo.objetivo, modelo.escalado)
+            return cls(especificacion, modelo, None, modelo)
+        if isinstance(modelo, dict) and 'modelo' in modelo:
+            features = tuple(modelo.get('features') or FEATURES_MODELOS[modelo_id])
+            scaler = modelo.get('scaler')
+            especificacion = EspecificacionModelo(modelo_id, features, modelo.get('target', OBJETIVO_LEGACY), scaler is not None)
+            return cls(especificacion, modelo['modelo'], scaler, modelo)
+        especificacion = EspecificacionModelo(modelo_id, tuple(FEATURES_MODELOS[modelo_id]), OBJETIVO_LEGACY)
+        return cls(especificacion, modelo, None, modelo)
+
+    @property
+    def features(self):
+        return list(self.especificacion.features)
+
+    @property
+    def objetivo(self):
+        return self.especificacion.objetivo
+
+    @property
+    def escalado(self):
+        return self.especificacion.escalado
+
+    def _matriz(self, X):
+        datos = np.ascontiguousarray(X, dtype=np.float64)
+        if datos.ndim == 1:
+            datos = datos.reshape(1, -1)
+        if datos.ndim != 2 or datos.shape[1] != len(self.especificacion.features):
+            raise ValueError(f"Se esperaban {len(self.especificacion.features)} columnas: {', '.join(self.especificacion.features)}")
+        return datos
+
+    def transformar(self, X):
+        """Aplica el escalado del modelo (si tiene) a la matriz de entrada"""
+        datos = self._matriz(X)
+        if self._media is not None:
+            return (datos - self._media) / self._escala
+        if self.scaler is not None:
+            return np.asarray(self.scaler.transform(_con_nombres(self.scaler, datos)), dtype=np.float64)
+        return datos
+
+    def predecir_lote(self, X):
+        """Predice todas las filas de X (columnas en el orden de la especificación)"""
+        telemetria = obtener_telemetria()
+        modelo_id = self.especificacion.modelo_id
+        if self.coeficientes is not None:
+            # Un solo producto matricial, sin escalar por separado
+            with telemetria.medir("prediccion.estimador", modelo=modelo_id):
+                return self._matriz(X) @ self.coeficientes + self.intercepto
+        with telemetria.medir("prediccion.transformar", modelo=modelo_id):
+            datos = self.transformar(X)
+        with telemetria.medir("prediccion.estimador", modelo=modelo_id):
+            if self.bosque is not None:
+                return self.bosque.predecir(datos)
+            return np.asarray(self.estimador.predict(_con_nombres(self.estimador, datos)), dtype=np.float64)
+
+    def predecir(self, valores):
+        """Predice una sola fila y devuelve un float (con caché por versión y entradas)"""
+        fila = self._matriz(valores)
+        if len(fila) != 1:
+            raise ValueError("predecir() recibe una sola fila; use predecir_lote() para varias")
+        clave = (self.version, tuple(fila[0].tolist()))
+        cache = obtener_cache()
+        prediccion = cache.obtener(clave)
+        if prediccion is None:
+            prediccion = float(self.predecir_lote(fila)[0])
+            cache.guardar(clave, prediccion)
+        return prediccion
+
+
+_motores = {}
+_motores_lock = threading.Lock()
+
+
+def obtener_motor(modelo_id, modelo):
+    """Motor del modelo, creado una sola vez por proceso (se rehace si cambia el objeto)"""
+    motor = _motores.get(modelo_id)
+    if motor is None or motor.modelo is not modelo:
+        with _motores_lock:
+            motor = _motores.get(modelo_id)
+            if motor is None or motor.modelo is not modelo:
+                if motor is not None:
+                    obtener_cache().invalidar(motor.version)
+                motor = MotorPrediccion.desde_modelo(modelo_id, modelo)
+                _motores[modelo_id] = motor
+    return motor
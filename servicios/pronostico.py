@@ -0,0 +1,275 @@
+# Pronósticos a varios meses de las series de precios del dataset ampliado.
+# Tres modelos sobre el logaritmo de la serie mensual (los precios crecen con la
+# inflación, así que los errores son proporcionales al nivel):
+#   - SARIMAX (1,1,1)x(0,1,1,12) de statsmodels, con estacionalidad anual
+#   - ETS con tendencia amortiguada de statsmodels
+#   - Rezagos: regresión de la variación mensual de la serie, el dólar y el IPC
+#     sobre sus últimos meses, pronosticada paso a paso (cada mes pronosticado
+#     alimenta al siguiente) con intervalos por remuestreo de residuos
+# Los modelos ajustados se guardan por serie y huella del almacén, así que después
+# del primer ajuste un pronóstico tarda milisegundos; si se agregan meses al
+# dataset, la huella cambia y se vuelven a ajustar.
+#
+# Pronóstico desde la consola:
+#   python -m servicios.pronostico [--serie COLUMNA] [--horizonte 12]
+import threading
+import time
+import warnings
+from dataclasses import dataclass
+
+import numpy as np
+
+from servicios.almacen_datos import columna_fecha, obtener_almacen
+
+# Dataset con la historia mensual (columna 'Fecha')
+DATASET_PRONOSTICO = "dataset_LIMPIO_original"
+
+# Series que se pueden pronosticar: nombre visible -> columna del dataset
+SERIES_PRONOSTICO = {
+    "Precio leche SIGLeA ($/L)": "Precio/litro Nacional - SIGLeA",
+    "Queso cuartirolo ($/kg)": "QUESO TIPO CUARTIROLO $/kg",
+    "Costo ($/L)": "COSTO",
+    "Dólar oficial ($/US$)": "DOLAR OFICIAL $/US$",
+}
+
+# Series que acompañan a la pronosticada en el modelo de rezagos
+EXOGENAS_REZAGOS = ("DOLAR OFICIAL $/US$", "IPC - INDEC CoberNac")
+
+MODELOS_PRONOSTICO = ("SARIMAX", "ETS", "Rezagos")
+
+# Horizontes que se destacan en la interfaz (meses)
+HORIZONTES = (3, 6, 12)
+MAX_HORIZONTE = 24
+
+# Meses anteriores que usa el modelo de rezagos y trayectorias simuladas para sus intervalos
+REZAGOS = 3
+SIMULACIONES = 2000
+
+# Pronósticos guardados por modelo ajustado (horizonte y nivel de confianza)
+MAX_PRONOSTICOS_POR_MODELO = 16
+
+
+@dataclass
+class Pronostico:
+    """Pronóstico (mediana) con su intervalo de predicción, mes a mes"""
+    serie: str
+    modelo: str
+    fechas: object
+    media: np.ndarray
+    inferior: np.ndarray
+    superior: np.ndarray
+    nivel: float
+    historia: object
+    tiempo_ajuste_s: float
+    tiempo_pronostico_s: float
+    desde_cache: bool = False
+    aviso: str = None
+
+    def en(self, meses):
+        """(valor, inferior, superior) a 'meses' meses de la última observación"""
+        i = meses - 1
+        return self.media[i], self.inferior[i], self.superior[i]
+
+
+@dataclass
+class ModeloAjustado:
+    """Modelo ajustado a una versión de la serie, con sus pronósticos ya calculados"""
+    modelo: str
+    columna: str
+    huella: str
+    ajuste: object
+    ultima_fecha: object
+    historia: object
+    tiempo_ajuste_s: float
+    aviso: str = None
+    pronosticos: dict = None
+
+
+def _ajustar_sarimax(log_serie):
+    from statsmodels.tsa.statespace.sarimax import SARIMAX
+
+    return SARIMAX(log_serie, order=(1, 1, 1), seasonal_order=(0, 1, 1, 12)).fit(disp=False)
+
+
+def _pronosticar_sarimax(ajuste, horizonte, nivel):
+    prediccion = ajuste.get_forecast(horizonte)
+    intervalo = prediccion.conf_int(alpha=1 - nivel).to_numpy()
+    return prediccion.predicted_mean.to_numpy(), intervalo[:, 0], intervalo[:, 1]
+
+
+def _ajustar_ets(log_serie):
+    from statsmodels.tsa.exponential_smoothing.ets import ETSModel
+
+    return ETSModel(log_serie, error="add", trend="add", damped_trend=True).fit(disp=False)
+
+
+def _pronosticar_ets(ajuste, horizonte, nivel):
+    n = ajuste.nobs
+    tabla = ajuste.get_prediction(start=n, end=n + horizonte - 1).summary_frame(alpha=1 - nivel)
+    return tabla["mean"].to_numpy(), tabla["pi_lower"].to_numpy(), tabla["pi_upper"].to_numpy()
+
+
+def matriz_rezagos(variaciones, rezagos=REZAGOS):
+    """Filas [1, g(t-1), ..., g(t-p)] para cada mes t con p meses anteriores"""
+    n = len(variaciones)
+    bloques = [variaciones[rezagos - 1 - j:n - 1 - j] for j in range(rezagos)]
+    return np.hstack([np.ones((n - rezagos, 1))] + bloques)
+
+
+def _ajustar_rezagos(log_niveles, rezagos=REZAGOS):
+    """Regresión por mínimos cuadrados de la variación de cada serie sobre los rezagos de todas"""
+    variaciones = np.diff(log_niveles, axis=0)
+    X = matriz_rezagos(variaciones, rezagos)
+    Y = variaciones[rezagos:]
+    coeficientes, *_ = np.linalg.lstsq(X, Y, rcond=None)
+    return {
+        "coeficientes": coeficientes,
+        "residuos": Y - X @ coeficientes,
+        "ultimas_variaciones": variaciones[-rezagos:],
+        "ultimo_nivel": log_niveles[-1],
+    }
+
+
+def simular_rezagos(ajuste, horizonte, simulaciones, semilla=0):
+    """Trayectorias paso a paso del logaritmo de cada serie: (simulaciones, horizonte, series)"""
+    rng = np.random.default_rng(semilla)
+    coeficientes, residuos = ajuste["coeficientes"], ajuste["residuos"]
+    rezagos, series = ajuste["ultimas_variaciones"].shape
+    estado = np.broadcast_to(ajuste["ultimas_variaciones"], (simulaciones, rezagos, series)).copy()
+    nivel = np.broadcast_to(ajuste["ultimo_nivel"], (simulaciones, series)).copy()
+    trayectorias = np.empty((simulaciones, horizonte, series))
+    for h in range(horizonte):
+        # El mes más reciente primero, en el mismo orden que matriz_rezagos
+        X = np.hstack([np.ones((simulaciones, 1)), estado[:, ::-1].reshape(simulaciones, rezagos * series)])
+        # Filas completas de residuos: conserva la correlación entre las series
+        variacion = X @ coeficientes + (residuos[rng.integers(len(residuos), size=simulaciones)] if simulaciones > 1 else 0)
+        nivel += variacion
+        trayectorias[:, h] = nivel
+        estado = np.concatenate([estado[:, 1:], variacion[:, None]], axis=1)
+    return trayectorias
+
+
+def _pronosticar_rezagos(ajuste, horizonte, nivel):
+    central = simular_rezagos(ajuste, horizonte, 1)[0, :, 0]
+    simuladas = simular_rezagos(ajuste, horizonte, SIMULACIONES)[:, :, 0]
+    cola = (1 - nivel) / 2
+    inferior, superior = np.quantile(simuladas, [cola, 1 - cola], axis=0)
+    return central, inferior, superior
+
+
+class Pronosticador:
+    """Modelos de pronóstico ajustados por (serie, modelo, huella de los datos)"""
+
+    def __init__(self, almacen=None, nombre=DATASET_PRONOSTICO):
+        self.almacen = almacen or obtener_almacen()
+        self.nombre = nombre
+        self._modelos = {}
+        self._lock = threading.Lock()
+
+    def historia(self, columnas):
+        """Series mensuales (índice de fechas) de las columnas pedidas"""
+        fecha = columna_fecha(self.almacen.columnas(self.nombre))
+        datos = self.almacen.leer(self.nombre, [fecha] + list(columnas)).set_index(fecha).sort_index()
+        # Frecuencia mensual explícita; un mes faltante se interpola
+        return datos.asfreq("MS").interpolate(limit_direction="both")
+
+    def _ajustar(self, modelo, columna, huella):
+        columnas = [columna] + [c for c in EXOGENAS_REZAGOS if c != columna] if modelo == "Rezagos" else [columna]
+        datos = self.historia(columnas)
+        if (datos <= 0).to_numpy().any():
+            raise ValueError(f"'{columna}' tiene valores no positivos: no se puede modelar en logaritmos")
+        log_datos = np.log(datos)
+
+        inicio = time.perf_counter()
+        with warnings.catch_warnings(record=True) as avisos:
+            warnings.simplefilter("always")
+            if modelo == "SARIMAX":
+                ajuste = _ajustar_sarimax(log_datos[columna])
+            elif modelo == "ETS":
+                ajuste = _ajustar_ets(log_datos[columna])
+            elif modelo == "Rezagos":
+                ajuste = _ajustar_rezagos(log_datos.to_numpy())
+            else:
+                raise ValueError(f"Modelo de pronóstico desconocido: {modelo}")
+        tiempo_ajuste_s = time.perf_counter() - inicio
+
+        # statsmodels avisa cuando la optimización no converge del todo
+        aviso = next((str(a.message) for a in avisos if "converge" in str(a.message).lower()), None)
+        return ModeloAjustado(modelo, columna, huella, ajuste, datos.index[-1], datos[columna],
+                              tiempo_ajuste_s, aviso, pronosticos={})
+
+    def ajustado(self, modelo, columna):
+        """Modelo ajustado a la versión actual de los datos (lo ajusta la primera vez)"""
+        huella = self.almacen.huella(self.nombre)
+        clave = (modelo, columna)
+        existente = self._modelos.get(clave)
+        if existente is not None and existente.huella == huella:
+            return existente
+        with self._lock:
+            existente = self._modelos.get(clave)
+            if existente is None or existente.huella != huella:
+                existente = self._ajustar(modelo, columna, huella)
+                self._modelos[clave] = existente
+        return existente
+
+    def pronosticar(self, columna, modelo="SARIMAX", horizonte=max(HORIZONTES), nivel=0.8):
+        """Pronóstico de la serie a 'horizonte' meses con intervalo al 'nivel' de confianza"""
+        import pandas as pd
+
+        horizonte = int(min(max(1, horizonte), MAX_HORIZONTE))
+        ajustado = self.ajustado(modelo, columna)
+        clave = (horizonte, round(nivel, 4))
+        guardado = ajustado.pronosticos.get(clave)
+        if guardado is not None:
+            return Pronostico(**{**guardado.__dict__, "desde_cache": True})
+
+        inicio = time.perf_counter()
+        funcion = {"SARIMAX": _pronosticar_sarimax, "ETS": _pronosticar_ets, "Rezagos": _pronosticar_rezagos}[modelo]
+        media, inferior, superior = funcion(ajustado.ajuste, horizonte, nivel)
+        fechas = pd.date_range(ajustado.ultima_fecha, periods=horizonte + 1, freq="MS")[1:]
+        pronostico = Pronostico(columna, modelo, fechas, np.exp(media), np.exp(inferior), np.exp(superior), nivel,
+                                ajustado.historia, ajustado.tiempo_ajuste_s, time.perf_counter() - inicio,
+                                aviso=ajustado.aviso)
+        if len(ajustado.pronosticos) >= MAX_PRONOSTICOS_POR_MODELO:
+            ajustado.pronosticos.pop(next(iter(ajustado.pronosticos)))
+        ajustado.pronosticos[clave] = pronostico
+        return pronostico
+
+
+_pronosticador = None
+_pronosticador_lock = threading.Lock()
+
+
+def obtener_pronosticador():
+    """Pronosticador compartido por todo el proceso"""
+    global _pronosticador
+    if _pronosticador is None:
+        with _pronosticador_lock:
+            if _pronosticador is None:
+                _pronosticador = Pronosticador()
+    return _pronosticador
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Pronóstico de series de precios")
+    parser.add_argument("--serie", default=SERIES_PRONOSTICO["Precio leche SIGLeA ($/L)"])
+    parser.add_argument("--horizonte", type=int, default=max(HORIZONTES))
+    parser.add_argument("--nivel", type=float, default=0.8)
+    args = parser.parse_args()
+
+    pronosticador = obtener_pronosticador()
+    for modelo in MODELOS_PRONOSTICO:
+        pronostico = pronosticador.pronosticar(args.serie, modelo, args.horizonte, args.nivel)
+        repetido = pronosticador.pronosticar(args.serie, modelo, args.horizonte, args.nivel)
+        print(f"{modelo}: ajuste {pronostico.tiempo_ajuste_s * 1000:.0f} ms, "
+              f"pronóstico {pronostico.tiempo_pronostico_s * 1000:.1f} ms "
+              f"(repetido desde caché: {repetido.desde_cache})")
+        for meses in HORIZONTES:
+            if meses <= args.horizonte:
+                valor, inferior, superior = pronostico.en(meses)
+                print(f"  +{meses:>2} meses ({pronostico.fechas[meses - 1]:%Y-%m}): {valor:,.2f} "
+                      f"[{inferior:,.2f} – {superior:,.2f}]")
+        if pronostico.aviso:
+            print(f"  ⚠️ {pronostico.aviso}")
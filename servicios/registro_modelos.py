@@ -0,0 +1,260 @@
+# Registro único de modelos: cada modelo se carga como máximo una vez por proceso,
+# de forma perezosa (la primera vez que una pestaña lo pide) y el mismo objeto se
+# comparte entre todas las sesiones de Streamlit del proceso. Si el modelo tiene
+# versión en formato nativo (servicios/formato_modelos.py) convertida desde el .pkl
+# actual, se lee esa (memory map, sin pickle); si no, se deserializa el .pkl. Con
+# MILKCAST_HOST_MODELOS definida los modelos se piden al host compartido
+# (servicios/host_modelos.py) y el proceso solo guarda sus metadatos.
+import os
+import pickle
+import threading
+import time
+from dataclasses import dataclass
+
+# Directorio donde se guardan los modelos
+MODELOS_DIR = "modelos"
+
+# Identificador de cada modelo -> nombre del archivo (sin extensión)
+CATALOGO_MODELOS = {
+    "ipc_dolar": "modelo_regresion-Precio-IPC-Dolar",
+    "productos": "modelo_regresion-Precio-ComEnt-Queso-Yogur",
+    "A": "modelo_A_rentabilidad",
+    "B": "modelo_B_costos",
+    "D": "modelo_D_precio_queso",
+    "E": "modelo_E_precio_internacional",
+    "F": "modelo_F_precio_novillos",
+    "G": "modelo_G_variables_macroeconomicas",
+    "H": "modelo_H_productos_lacteos",
+}
+
+# Nombre para mostrar de cada modelo
+NOMBRES_MODELOS = {
+    "ipc_dolar": "IPC y Dólar (regresión original)",
+    "productos": "Productos Básicos (regresión original)",
+    "A": "Modelo A - Rentabilidad",
+    "B": "Modelo B - Costos",
+    "D": "Modelo D - Precio Queso",
+    "E": "Modelo E - Precio Internacional",
+    "F": "Modelo F - Precio Novillos",
+    "G": "Modelo G - Variables Macro",
+    "H": "Modelo H - Productos Lácteos",
+}
+
+# Variables de entrada de cada modelo, en el orden en que fueron entrenados
+FEATURES_MODELOS = {
+    "ipc_dolar": ['IPC - INDEC CoberNac', 'DOLAR OFICIAL $/US$'],
+    "productos": ['LECHE COMUN ENTERA $/litro', 'QUESO TIPO CUARTIROLO $/kg ', 'YOGUR para beber sachet $/1000 grs'],
+    "A": ['COSTO', 'Precio/litro Nacional - SIGLeA', 'DOLAR OFICIAL $/US$',
+          'IPC-Mensual', 'IPIM Nivel General - INDEC', 'Promedio del sector'],
+    "B": ['Promedio del sector', 'RELACION LECHE/MAIZ', 'IPIM Nivel General - INDEC',
+          'DOLAR OFICIAL $/US$', 'RELACION VAQUILLONA AL PARIR - LECHE', 'IPC - INDEC CoberNac'],
+    "D": ['Precio/litro Nacional - SIGLeA', 'IPC-Mensual', 'IPIM Lácteos - INDEC',
+          'ELABORACIÓN TOTAL', 'Promedio general sector privado'],
+    "E": ['Indice de Precios de los Lácteos FAO', 'DOLAR OFICIAL $/US$',
+          'EXPORTACIONES toneladas/mes', 'EXISTENCIAS TOTAL'],
+    "F": ['Cabezas Vaquillonas', 'DOLAR OFICIAL $/US$', 'IPC-Mensual', 'Precio Promedio Vaquillonas'],
+    "G": ['IPC-Mensual', 'DOLAR OFICIAL $/US$'],
+    "H": ['LECHE COMUN ENTERA $/litro', 'QUESO TIPO CUARTIROLO $/kg', 'YOGUR para beber sachet $/1000 grs'],
+}
+
+# Tamaño mínimo razonable de un .pkl (las regresiones originales pesan ~600 bytes,
+# algo más chico probablemente está corrupto)
+TAMAÑO_MINIMO_PKL = 500
+
+
+class ErrorCargaModelo(Exception):
+    """Error al validar o deserializar un modelo"""
+
+
+@dataclass
+class EstadisticaCarga:
+    """Tiempo y memoria consumidos al cargar un modelo"""
+    modelo_id: str
+    archivo: str
+    tiempo_s: float = 0.0
+    memoria_bytes: int = 0
+    tamaño_archivo: int = 0
+    formato: str = "pickle"
+    error: str = None
+    # Problema que no impidió la carga (por ejemplo, versión nativa dañada)
+    aviso: str = None
+
+
+def memoria_residente():
+    """Memoria residente del proceso en bytes (0 si el sistema no expone /proc)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def verificar_cabecera_pkl(path, tamaño_minimo=TAMAÑO_MINIMO_PKL):
+    """Verifica tamaño y primeros bytes de un PKL sin deserializarlo"""
+    try:
+        tamaño = os.path.getsize(path)
+        if tamaño < tamaño_minimo:
+            return False, f"Archivo muy pequeño ({tamaño} bytes), probablemente corrupto"
+
+        with open(path, 'rb') as f:
+            primeros_bytes = f.read(2)
+
+        # Si empieza con '<', probablemente es HTML (error de Google Drive)
+        if primeros_bytes.startswith(b'<'):
+            return False, "El archivo parece ser HTML en lugar de un modelo PKL"
+        # Los pickles de protocolo 2 o superior empiezan con el opcode PROTO (0x80)
+        if not primeros_bytes.startswith(b'\x80'):
+            return False, "El archivo no tiene cabecera de pickle"
+        return True, "Cabecera PKL válida"
+    except Exception as e:
+        return False, f"Error validando PKL: {str(e)}"
+
+
+class RegistroModelos:
+    """Carga perezosa y memoizada de los modelos del catálogo"""
+
+    def __init__(self, modelos_dir=MODELOS_DIR, catalogo=None, directorio_nativo=None, usar_nativo=True, host=None):
+        self.modelos_dir = modelos_dir
+        self.directorio_nativo = directorio_nativo or os.path.join(modelos_dir, "nativos")
+        self.usar_nativo = usar_nativo
+        # Socket del host de modelos compartido (None: se cargan en este proceso)
+        self.host = host
+        self.catalogo = dict(catalogo or CATALOGO_MODELOS)
+        self._modelos = {}
+        # Errores de carga memorizados: un modelo que falló no se vuelve a leer del
+        # disco en cada rerun, solo después de recargar()
+        self._errores = {}
+        self._estadisticas = {}
+        # Un único lock para las cargas: son pocas y así la diferencia de memoria
+        # residente no mezcla dos cargas simultáneas
+        self._lock = threading.Lock()
+
+    def ruta(self, modelo_id):
+        """Ruta del archivo .pkl de un modelo del catálogo"""
+        if modelo_id not in self.catalogo:
+            raise KeyError(f"Modelo desconocido: {modelo_id}")
+        return os.path.join(self.modelos_dir, f"{self.catalogo[modelo_id]}.pkl")
+
+    def obtener(self, modelo_id):
+        """Devuelve el modelo, cargándolo la primera vez que se pide"""
+        # Camino rápido: el modelo ya está en memoria
+        modelo = self._modelos.get(modelo_id)
+        if modelo is not None:
+            return modelo
+        error = self._errores.get(modelo_id)
+        if error is not None:
+            raise ErrorCargaModelo(error)
+
+        with self._lock:
+            # Otro hilo pudo haberlo cargado (o fallado) mientras esperábamos el lock
+            if modelo_id in self._modelos:
+                return self._modelos[modelo_id]
+            if modelo_id in self._errores:
+                raise ErrorCargaModelo(self._errores[modelo_id])
+            try:
+                modelo = self._cargar(modelo_id)
+            except ErrorCargaModelo as e:
+                # Los errores del host no se memorizan: pueden ser transitorios y no leen el disco
+                if not self.host:
+                    self._errores[modelo_id] = str(e)
+                raise
+            self._modelos[modelo_id] = modelo
+            return modelo
+
+    def recargar(self, modelo_id=None):
+        """Olvida el modelo (o todos) y su error: el próximo obtener() lo vuelve a cargar"""
+        with self._lock:
+            for m in [modelo_id] if modelo_id else list(self.catalogo):
+                self._modelos.pop(m, None)
+                self._errores.pop(m, None)
+                self._estadisticas.pop(m, None)
+
+    def _cargar(self, modelo_id):
+        ruta = self.ruta(modelo_id)
+        estadistica = EstadisticaCarga(modelo_id=modelo_id, archivo=os.path.basename(ruta))
+        self._estadisticas[modelo_id] = estadistica
+
+        if self.host:
+            from servicios.host_modelos import obtener_cliente
+
+            estadistica.archivo, estadistica.formato = self.host, "host"
+            try:
+                return self._medir(estadistica, lambda: obtener_cliente(self.host).modelo(modelo_id))
+            except ErrorCargaModelo as e:
+                estadistica.error = str(e)
+                raise
+
+        if self.usar_nativo:
+            from servicios.formato_modelos import ErrorFormatoModelo, cargar_nativo, nativo_vigente, ruta_nativa
+
+            if nativo_vigente(modelo_id, ruta, self.directorio_nativo):
+                destino = ruta_nativa(modelo_id, self.directorio_nativo)
+                estadistica.archivo = os.path.relpath(destino, self.modelos_dir)
+                estadistica.formato = "nativo"
+                estadistica.tamaño_archivo = sum(e.stat().st_size for e in os.scandir(destino))
+                try:
+                    return self._medir(estadistica, lambda: cargar_nativo(destino))
+                except ErrorFormatoModelo as e:
+                    # Versión nativa dañada: se usa el .pkl y queda registrado en la estadística
+                    estadistica.aviso = f"Versión nativa inválida, se cargó el .pkl: {e}"
+                    estadistica.archivo, estadistica.formato = os.path.basename(ruta), "pickle"
+
+        if not os.path.exists(ruta):
+            estadistica.error = f"No se encontró el modelo: {ruta}"
+            raise ErrorCargaModelo(estadistica.error)
+        estadistica.tamaño_archivo = os.path.getsize(ruta)
+
+        # Validación barata: solo cabecera, la deserialización se hace una sola vez abajo
+        es_valido, mensaje = verificar_cabecera_pkl(ruta)
+        if not es_valido:
+            estadistica.error = mensaje
+            raise ErrorCargaModelo(f"{modelo_id}: {mensaje}")
+
+        def deserializar():
+            with open(ruta, 'rb') as f:
+                return pickle.load(f)
+
+        try:
+            return self._medir(estadistica, deserializar)
+        except Exception as e:
+            estadistica.error = f"Error de deserialización - {str(e)}"
+            raise ErrorCargaModelo(f"{modelo_id}: {estadistica.error}") from e
+
+    @staticmethod
+    def _medir(estadistica, cargar):
+        """Ejecuta la carga registrando tiempo y crecimiento de la memoria residente"""
+        # Diferencia de RSS: aproximada (incluye lo que asignen otros hilos mientras tanto)
+        # pero sin el costo de trazar todas las asignaciones del proceso como tracemalloc
+        memoria_inicial = memoria_residente()
+        inicio = time.perf_counter()
+        try:
+            return cargar()
+        finally:
+            from servicios.telemetria import obtener_telemetria
+
+            estadistica.tiempo_s = time.perf_counter() - inicio
+            estadistica.memoria_bytes = max(memoria_residente() - memoria_inicial, 0)
+            obtener_telemetria().registrar("modelo.cargar", estadistica.tiempo_s,
+                                           modelo=estadistica.modelo_id, formato=estadistica.formato)
+
+    def cargado(self, modelo_id):
+        """Indica si el modelo ya está en memoria"""
+        return modelo_id in self._modelos
+
+    def estadisticas(self):
+        """Estadísticas de carga de los modelos que se intentaron cargar"""
+        return [self._estadisticas[m] for m in self.catalogo if m in self._estadisticas]
+
+
+_registro = None
+_registro_lock = threading.Lock()
+
+
+def obtener_registro():
+    """Registro compartido por todo el proceso (todas las sesiones de Streamlit)"""
+    global _registro
+    if _registro is None:
+        with _registro_lock:
+            if _registro is None:
+                _registro = RegistroModelos(host=os.environ.get("MILKCAST_HOST_MODELOS") or None)
+    return _registro
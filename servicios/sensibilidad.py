@@ -0,0 +1,52 @@
+# Análisis de sensibilidad: grilla cartesiana sobre una o dos variables alrededor
+# de los valores ingresados, evaluada con una sola llamada vectorizada al motor.
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+# Límite de puntos de la grilla (a partir de acá el gráfico deja de ser interactivo)
+MAX_PUNTOS_GRILLA = 250000
+
+
+@dataclass
+class ResultadoSensibilidad:
+    """Ejes de la grilla, predicciones con su misma forma y predicción en el punto base"""
+    variables: list
+    ejes: list
+    predicciones: np.ndarray
+    prediccion_base: float
+    tiempo_s: float
+
+    @property
+    def n_puntos(self):
+        return int(self.predicciones.size)
+
+
+def construir_grilla(base, indices, variacion=0.3, puntos=51):
+    """Ejes (±variación sobre cada valor base) y matriz con una fila por punto de la grilla"""
+    base = np.asarray(base, dtype=np.float64)
+    if not 1 <= len(indices) <= 2:
+        raise ValueError("La grilla se arma sobre una o dos variables")
+    if puntos ** len(indices) > MAX_PUNTOS_GRILLA:
+        raise ValueError(f"La grilla tendría {puntos ** len(indices):,} puntos (máximo {MAX_PUNTOS_GRILLA:,})")
+
+    ejes = [np.linspace(base[i] * (1 - variacion), base[i] * (1 + variacion), puntos) for i in indices]
+    mallas = np.meshgrid(*ejes, indexing='ij')
+    X = np.tile(base, (mallas[0].size, 1))
+    for i, malla in zip(indices, mallas):
+        X[:, i] = malla.ravel()
+    return ejes, X
+
+
+def evaluar_sensibilidad(motor, base, variables, variacion=0.3, puntos=51):
+    """Predice toda la grilla de una vez y devuelve las predicciones con forma (puntos,) o (puntos, puntos)"""
+    nombres = [f.strip() for f in motor.features]
+    indices = [nombres.index(v.strip()) for v in variables]
+    ejes, X = construir_grilla(base, indices, variacion, puntos)
+
+    inicio = time.perf_counter()
+    predicciones = motor.predecir_lote(X).reshape([len(eje) for eje in ejes])
+    tiempo_s = time.perf_counter() - inicio
+    return ResultadoSensibilidad([nombres[i] for i in indices], ejes, predicciones,
+                                 motor.predecir(base), tiempo_s)
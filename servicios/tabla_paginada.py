@@ -0,0 +1,82 @@
+# Consultas paginadas sobre tablas Arrow del almacén de datos.
+# El filtro y el orden se calculan en el servidor sobre las columnas necesarias y
+# solo se materializa la página visible con las columnas elegidas, que es lo
+# único que se envía al navegador.
+import math
+import time
+from dataclasses import dataclass
+
+# Tamaños de página ofrecidos en la interfaz
+FILAS_POR_PAGINA = (25, 50, 100)
+
+
+@dataclass
+class FiltroRango:
+    """Filas con la columna entre minimo y maximo (inclusive)"""
+    columna: str
+    minimo: object
+    maximo: object
+
+
+@dataclass
+class PaginaTabla:
+    """Página pedida con el total de filas antes y después del filtro"""
+    datos: object
+    pagina: int
+    paginas: int
+    filas_por_pagina: int
+    filas_totales: int
+    filas_filtradas: int
+    duracion_s: float
+
+    @property
+    def primera_fila(self):
+        return min((self.pagina - 1) * self.filas_por_pagina + 1, self.filas_filtradas)
+
+    @property
+    def ultima_fila(self):
+        return min(self.pagina * self.filas_por_pagina, self.filas_filtradas)
+
+
+def rango_columna(tabla, columna):
+    """(mínimo, máximo) de una columna, o None si está vacía"""
+    import pyarrow.compute as pc
+
+    extremos = pc.min_max(tabla.column(columna))
+    minimo, maximo = extremos["min"].as_py(), extremos["max"].as_py()
+    if minimo is None:
+        return None
+    # pandas devuelve Timestamp para las fechas; los widgets esperan datetime
+    if hasattr(minimo, "to_pydatetime"):
+        minimo, maximo = minimo.to_pydatetime(), maximo.to_pydatetime()
+    return minimo, maximo
+
+
+def consultar_pagina(tabla, columnas=None, orden=None, descendente=False, filtro=None,
+                     pagina=1, filas_por_pagina=FILAS_POR_PAGINA[0]):
+    """Filtra, ordena y devuelve una página de la tabla como DataFrame (solo las columnas pedidas)"""
+    import pyarrow.compute as pc
+
+    inicio = time.perf_counter()
+    filas_totales = tabla.num_rows
+    if filtro is not None:
+        valores = tabla.column(filtro.columna)
+        tabla = tabla.filter(pc.and_(pc.greater_equal(valores, filtro.minimo),
+                                     pc.less_equal(valores, filtro.maximo)))
+
+    paginas = max(1, math.ceil(tabla.num_rows / filas_por_pagina))
+    pagina = min(max(1, int(pagina)), paginas)
+    desde = (pagina - 1) * filas_por_pagina
+    visibles = tabla.select(columnas) if columnas else tabla
+
+    if orden:
+        # Solo se ordenan los índices; después se toman las filas de la página
+        indices = pc.sort_indices(tabla.select([orden]),
+                                  sort_keys=[(orden, "descending" if descendente else "ascending")],
+                                  null_placement="at_end")
+        visibles = visibles.take(indices[desde:desde + filas_por_pagina])
+    else:
+        visibles = visibles.slice(desde, filas_por_pagina)
+
+    return PaginaTabla(visibles.to_pandas(), pagina, paginas, filas_por_pagina,
+                       filas_totales, tabla.num_rows, time.perf_counter() - inicio)
@@ -0,0 +1,137 @@
+# Medición de tiempos por etapa (carga de CSV y modelos, transformación, predicción,
+# armado y envío de figuras...). Cada etapa, con sus etiquetas (modelo, figura),
+# guarda sus últimas duraciones en un buffer circular del que salen p50/p95/p99, y
+# lleva además la cuenta y la suma totales para exportarlas en formato de texto de
+# Prometheus (tipo summary). Es una por proceso y la comparten todas las sesiones.
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import wraps
+
+import numpy as np
+
+# Duraciones que se guardan por etapa (las más recientes)
+TAMAÑO_BUFFER = 2048
+
+CUANTILES = (0.5, 0.95, 0.99)
+
+PREFIJO_METRICAS = "milkcast"
+
+
+@dataclass
+class ResumenEtapa:
+    """Percentiles de las últimas mediciones de una etapa (en segundos)"""
+    etapa: str
+    etiquetas: dict
+    n: int
+    total: int
+    suma_s: float
+    p50: float
+    p95: float
+    p99: float
+    maximo: float
+
+
+class SerieTiempos:
+    """Buffer circular de duraciones más cuenta y suma desde el arranque"""
+
+    def __init__(self, tamaño=TAMAÑO_BUFFER):
+        self.duraciones = deque(maxlen=tamaño)
+        self.total = 0
+        self.suma_s = 0.0
+
+    def agregar(self, duracion_s):
+        self.duraciones.append(duracion_s)
+        self.total += 1
+        self.suma_s += duracion_s
+
+
+class Telemetria:
+    """Tiempos por etapa de este proceso"""
+
+    def __init__(self, tamaño_buffer=TAMAÑO_BUFFER):
+        self.tamaño_buffer = tamaño_buffer
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def registrar(self, etapa, duracion_s, **etiquetas):
+        """Agrega una duración a la etapa (las etiquetas distinguen series de la misma etapa)"""
+        clave = (etapa, tuple(sorted((k, str(v)) for k, v in etiquetas.items())))
+        with self._lock:
+            serie = self._series.get(clave)
+            if serie is None:
+                serie = self._series[clave] = SerieTiempos(self.tamaño_buffer)
+            serie.agregar(duracion_s)
+
+    @contextmanager
+    def medir(self, etapa, **etiquetas):
+        """Mide el bloque (también si termina con una excepción)"""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.registrar(etapa, time.perf_counter() - inicio, **etiquetas)
+
+    def resumen(self):
+        """ResumenEtapa de cada serie, ordenados por etapa"""
+        with self._lock:
+            copias = [(clave, list(serie.duraciones), serie.total, serie.suma_s)
+                      for clave, serie in self._series.items()]
+        resumenes = []
+        for (etapa, etiquetas), duraciones, total, suma_s in sorted(copias):
+            p50, p95, p99 = np.quantile(duraciones, CUANTILES)
+            resumenes.append(ResumenEtapa(etapa, dict(etiquetas), len(duraciones), total, suma_s,
+                                          float(p50), float(p95), float(p99), float(max(duraciones))))
+        return resumenes
+
+    def reiniciar(self):
+        with self._lock:
+            self._series.clear()
+
+    def prometheus(self):
+        """Texto de exposición de Prometheus: un summary con la etapa y sus etiquetas"""
+        nombre = f"{PREFIJO_METRICAS}_etapa_segundos"
+        lineas = [
+            f"# HELP {nombre} Duración de cada etapa (cuantiles sobre las últimas {self.tamaño_buffer} mediciones)",
+            f"# TYPE {nombre} summary",
+        ]
+        for r in self.resumen():
+            etiquetas = {"etapa": r.etapa, **r.etiquetas}
+            for cuantil, valor in zip(CUANTILES, (r.p50, r.p95, r.p99)):
+                lineas.append(f"{nombre}{_etiquetas({**etiquetas, 'quantile': cuantil})} {valor:.9g}")
+            lineas.append(f"{nombre}_sum{_etiquetas(etiquetas)} {r.suma_s:.9g}")
+            lineas.append(f"{nombre}_count{_etiquetas(etiquetas)} {r.total}")
+        return "\n".join(lineas) + "\n"
+
+
+def _etiquetas(etiquetas):
+    # Prometheus pide escapar barra invertida, comillas y saltos de línea
+    valores = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for v in etiquetas.values())
+    return "{" + ",".join(f'{k}="{v}"' for k, v in zip(etiquetas, valores)) + "}"
+
+
+_telemetria = None
+_telemetria_lock = threading.Lock()
+
+
+def obtener_telemetria():
+    """Telemetría compartida por todo el proceso (todas las sesiones de Streamlit)"""
+    global _telemetria
+    if _telemetria is None:
+        with _telemetria_lock:
+            if _telemetria is None:
+                _telemetria = Telemetria()
+    return _telemetria
+
+
+def medido(etapa, **etiquetas):
+    """Decorador: mide cada llamada a la función como la etapa indicada"""
+    def decorador(funcion):
+        @wraps(funcion)
+        def envoltura(*args, **kwargs):
+            with obtener_telemetria().medir(etapa, **etiquetas):
+                return funcion(*args, **kwargs)
+        return envoltura
+    return decorador
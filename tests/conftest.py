@@ -0,0 +1,50 @@
+import functools
+import http.server
+import threading
+import time
+
+import pytest
+
+
+class _ManejadorEspejo(http.server.SimpleHTTPRequestHandler):
+    """Sirve los archivos del espejo anotando las rutas pedidas y las descargas simultáneas"""
+
+    def do_GET(self):
+        servidor = self.server
+        with servidor.lock:
+            servidor.pedidos.append(self.path)
+            servidor.en_curso += 1
+            servidor.max_en_curso = max(servidor.max_en_curso, servidor.en_curso)
+        try:
+            time.sleep(servidor.demora_s)
+            super().do_GET()
+        finally:
+            with servidor.lock:
+                servidor.en_curso -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def espejo_artefactos(tmp_path, monkeypatch):
+    """Servidor HTTP local que reemplaza a Google Drive (MILKCAST_ESPEJO_ARTEFACTOS apunta a él)"""
+    from servicios.descargas import VARIABLE_ESPEJO
+
+    directorio = tmp_path / "espejo"
+    directorio.mkdir()
+    manejador = functools.partial(_ManejadorEspejo, directory=str(directorio))
+    servidor = http.server.ThreadingHTTPServer(("127.0.0.1", 0), manejador)
+    servidor.lock = threading.Lock()
+    servidor.pedidos, servidor.en_curso, servidor.max_en_curso = [], 0, 0
+    servidor.directorio = directorio
+    # Demora de cada respuesta (para ver descargas simultáneas)
+    servidor.demora_s = 0.0
+    hilo = threading.Thread(target=servidor.serve_forever, daemon=True)
+    hilo.start()
+    monkeypatch.setenv(VARIABLE_ESPEJO, f"http://127.0.0.1:{servidor.server_address[1]}")
+    try:
+        yield servidor
+    finally:
+        servidor.shutdown()
+        servidor.server_close()
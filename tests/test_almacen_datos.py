@@ -0,0 +1,63 @@
+import os
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from servicios.almacen_datos import DIRECTORIO_REEMPLAZADAS, AlmacenDatos
+
+
+def _meses(desde, cantidad):
+    fechas = pd.date_range(desde, periods=cantidad, freq="MS")
+    return pd.DataFrame({"Fecha": fechas.strftime("%Y-%m-%d"), "Precio": [float(i) for i in range(cantidad)]})
+
+
+@pytest.fixture
+def almacen(tmp_path):
+    """Almacén vacío con un CSV de 12 meses (2020) como origen"""
+    _meses("2020-01-01", 12).to_csv(tmp_path / "serie.csv", index=False)
+    almacen = AlmacenDatos(directorio=str(tmp_path / "datos"), origen_dir=str(tmp_path))
+    almacen.convertir("serie.csv")
+    return almacen
+
+
+def test_tocar_el_csv_no_reconvierte(almacen, tmp_path):
+    almacen.agregar("serie", _meses("2021-01-01", 2))
+    os.utime(tmp_path / "serie.csv", (0, 0))
+
+    assert almacen.asegurar("serie.csv") is False
+    assert len(almacen.leer("serie")) == 14
+
+
+def test_reconversion_conserva_los_meses_agregados(almacen, tmp_path):
+    almacen.agregar("serie", _meses("2021-01-01", 2))
+    # El CSV cambia (corrección de un valor) pero sigue terminando en 2020
+    df = _meses("2020-01-01", 12)
+    df.loc[0, "Precio"] = 99.0
+    df.to_csv(tmp_path / "serie.csv", index=False)
+
+    assert almacen.asegurar("serie.csv") is True
+    leido = almacen.leer("serie")
+    assert len(leido) == 14
+    assert leido["Precio"].iloc[0] == 99.0
+    assert leido["Fecha"].max() == pd.Timestamp("2021-02-01")
+
+
+def test_meses_incluidos_en_el_csv_se_apartan(almacen, tmp_path):
+    almacen.agregar("serie", _meses("2021-01-01", 2))
+    almacen.agregar("serie", _meses("2021-03-01", 1))
+    # El CSV nuevo ya trae enero y febrero de 2021: la primera parte agregada sobra
+    _meses("2020-01-01", 14).to_csv(tmp_path / "serie.csv", index=False)
+
+    almacen.convertir("serie.csv")
+
+    leido = almacen.leer("serie")
+    assert len(leido) == 15
+    assert not leido["Fecha"].duplicated().any()
+    assert os.listdir(os.path.join(almacen.ruta("serie"), DIRECTORIO_REEMPLAZADAS)) == ["parte-00001.parquet"]
+
+    # Con un hueco en la numeración, la parte siguiente no pisa a la existente
+    resultado = almacen.agregar("serie", _meses("2021-04-01", 1))
+    assert resultado.parte == "parte-00003.parquet"
+    assert len(almacen.leer("serie")) == 16
@@ -0,0 +1,45 @@
+import asyncio
+import json
+
+import servicios.api as api
+from servicios.api import app
+
+
+def _pedir(metodo, ruta, cuerpo=None):
+    """Llama a la aplicación ASGI y devuelve (estado, JSON de la respuesta)"""
+    mensajes = []
+
+    async def recibir():
+        return {"type": "http.request", "body": json.dumps(cuerpo).encode() if cuerpo is not None else b"",
+                "more_body": False}
+
+    async def enviar(mensaje):
+        mensajes.append(mensaje)
+
+    asyncio.run(app({"type": "http", "method": metodo, "path": ruta}, recibir, enviar))
+    return mensajes[0]["status"], json.loads(mensajes[1]["body"])
+
+
+def test_lista_vacia_devuelve_422_sin_cargar_el_modelo(monkeypatch):
+    def obtener_registro():
+        raise AssertionError("una petición vacía no debe buscar el modelo")
+
+    monkeypatch.setattr(api, "obtener_registro", obtener_registro)
+    estado, respuesta = _pedir("POST", "/predict/D", {"datos": []})
+    assert estado == 422
+    assert "vacía" in respuesta["error"]
+
+
+def test_prediccion_de_una_fila_y_de_un_lote():
+    fila = {"IPC - INDEC CoberNac": 101.5, "DOLAR OFICIAL $/US$": 15.9}
+    estado, respuesta = _pedir("POST", "/predict/ipc_dolar", {"datos": fila})
+    assert estado == 200 and isinstance(respuesta["prediccion"], float)
+
+    estado, respuesta = _pedir("POST", "/predict/ipc_dolar", {"datos": [fila, [110.0, 20.0]]})
+    assert estado == 200 and len(respuesta["predicciones"]) == 2
+
+
+def test_fila_incompleta_devuelve_400():
+    estado, respuesta = _pedir("POST", "/predict/ipc_dolar", {"datos": {"DOLAR OFICIAL $/US$": 15.9}})
+    assert estado == 400
+    assert "Faltan variables" in respuesta["error"]
@@ -0,0 +1,77 @@
+import os
+import pickle
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from servicios.bosque_compilado import compilar_bosque, es_bosque_compilable
+from servicios.formato_modelos import cargar_nativo, nativo_vigente, ruta_nativa
+from servicios.lector_csv import leer_csv
+from servicios.registro_modelos import CATALOGO_MODELOS, MODELOS_DIR
+
+# Modelos publicados como RandomForestRegressor
+BOSQUES = ["A", "B", "E", "G", "H"]
+
+pytest.importorskip("sklearn")
+
+
+@pytest.fixture(scope="module")
+def dataset():
+    """Filas de dataset_LIMPIO_original.csv con los nombres de columna sin espacios sobrantes"""
+    df = leer_csv(os.path.join(MODELOS_DIR, "dataset_LIMPIO_original.csv")).df
+    df.columns = [str(c).strip() for c in df.columns]
+    return df
+
+
+def _cargar_pkl(modelo_id):
+    with open(os.path.join(MODELOS_DIR, f"{CATALOGO_MODELOS[modelo_id]}.pkl"), "rb") as f:
+        return pickle.load(f)
+
+
+def _filas(modelo, dataset):
+    X = dataset[[f.strip() for f in modelo["features"]]].apply(pd.to_numeric, errors="coerce").dropna().to_numpy()
+    assert len(X) > 0
+    return X
+
+
+def _escalar(modelo, X):
+    scaler = modelo.get("scaler")
+    with warnings.catch_warnings():
+        # Los ajustados con DataFrame avisan al recibir un array sin nombres de columnas
+        warnings.simplefilter("ignore", UserWarning)
+        return scaler.transform(X) if scaler is not None else X
+
+
+def _predecir(modelo, X):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)
+        return modelo["modelo"].predict(_escalar(modelo, X))
+
+
+@pytest.mark.parametrize("modelo_id", BOSQUES)
+def test_paridad_con_predict(modelo_id, dataset):
+    modelo = _cargar_pkl(modelo_id)
+    estimador = modelo["modelo"]
+    assert es_bosque_compilable(estimador)
+
+    X = _filas(modelo, dataset)
+    esperado = _predecir(modelo, X)
+    X = _escalar(modelo, X)
+
+    bosque = compilar_bosque(estimador)
+    assert np.allclose(bosque.predecir(X), esperado, rtol=1e-9, atol=1e-9)
+    # Una fila por vez, como en las pestañas
+    assert np.allclose(bosque.predecir(X[:1]), esperado[:1], rtol=1e-9, atol=1e-9)
+
+
+@pytest.mark.parametrize("modelo_id", BOSQUES)
+def test_paridad_de_la_version_nativa(modelo_id, dataset):
+    ruta_pkl = os.path.join(MODELOS_DIR, f"{CATALOGO_MODELOS[modelo_id]}.pkl")
+    assert nativo_vigente(modelo_id, ruta_pkl)
+    modelo = _cargar_pkl(modelo_id)
+    nativo = cargar_nativo(ruta_nativa(modelo_id))
+
+    X = _filas(modelo, dataset)
+    assert np.allclose(_predecir(nativo, X), _predecir(modelo, X), rtol=1e-9, atol=1e-9)
@@ -0,0 +1,19 @@
+import numpy as np
+import pytest
+
+go = pytest.importorskip("plotly.graph_objects")
+
+from servicios.cache_figuras import CacheFiguras
+
+
+def test_guardar_no_serializa_la_figura(monkeypatch):
+    figura = go.Figure([go.Scatter(x=np.arange(100), y=np.ones(100)), go.Bar(x=["a", "b"], y=[1.0, 2.0])])
+    monkeypatch.setattr(go.Figure, "to_json", lambda self, *a, **k: pytest.fail("la caché no debe serializar"))
+    cache = CacheFiguras()
+
+    cacheada, desde_cache = cache.obtener("serie", "h1", lambda: figura)
+
+    assert not desde_cache
+    # int64 y float64 de la línea, dos textos y dos float64 de las barras
+    assert cacheada.tamaño_datos == 100 * 8 * 2 + np.asarray(["a", "b"]).nbytes + 2 * 8
+    assert cache.obtener("serie", "h1", lambda: None) == (cacheada, True)
@@ -0,0 +1,94 @@
+import hashlib
+import json
+import os
+import pickle
+
+import pytest
+
+import servicios.descargas as descargas
+
+ARTEFACTOS = {
+    f"https://drive.google.com/file/d/{i}": nombre
+    for i, nombre in enumerate(["modelo_prueba.pkl", "a.csv", "b.csv", "c.csv"])
+}
+
+
+def _contenido(nombre):
+    if nombre.endswith(".pkl"):
+        return pickle.dumps({"modelo": list(range(300))}, protocol=4)
+    return ("fecha,valor\n" + "".join(f"2020-{m:02d}-01,{m}\n" for m in range(1, 13)) + nombre).encode()
+
+
+@pytest.fixture
+def destino(tmp_path, espejo_artefactos):
+    """Directorio de modelos vacío con el manifiesto de los artefactos servidos por el espejo"""
+    directorio = tmp_path / "modelos"
+    directorio.mkdir()
+    artefactos = {}
+    for nombre in ARTEFACTOS.values():
+        datos = _contenido(nombre)
+        (espejo_artefactos.directorio / nombre).write_bytes(datos)
+        artefactos[nombre] = {"sha256": hashlib.sha256(datos).hexdigest(), "tamaño": len(datos)}
+    (directorio / descargas.ARCHIVO_MANIFIESTO).write_text(json.dumps({"artefactos": artefactos}), encoding="utf-8")
+    return directorio
+
+
+def test_descarga_en_paralelo(destino, espejo_artefactos):
+    espejo_artefactos.demora_s = 0.2
+
+    resultados = descargas.preparar_artefactos(str(destino), ARTEFACTOS, max_workers=4)
+
+    assert all(r.ok and r.descargado for r in resultados), resultados
+    assert espejo_artefactos.max_en_curso > 1
+    for nombre in ARTEFACTOS.values():
+        assert (destino / nombre).read_bytes() == _contenido(nombre)
+    assert not list(destino.glob("*.part"))
+    assert set(json.loads((destino / descargas.ARCHIVO_SELLOS).read_text(encoding="utf-8"))) == set(ARTEFACTOS.values())
+
+
+def test_sha_distinto_se_rechaza(destino, espejo_artefactos):
+    # El espejo sirve un a.csv distinto del registrado en el manifiesto
+    (espejo_artefactos.directorio / "a.csv").write_bytes(b"fecha,valor\n2020-01-01,999\n")
+
+    resultados = {r.archivo: r for r in descargas.preparar_artefactos(str(destino), ARTEFACTOS)}
+
+    assert not resultados["a.csv"].ok
+    assert "SHA-256 no coincide" in resultados["a.csv"].mensaje
+    assert not (destino / "a.csv").exists()
+    assert not list(destino.glob("*.part"))
+    assert all(r.ok for nombre, r in resultados.items() if nombre != "a.csv")
+    sellos = json.loads((destino / descargas.ARCHIVO_SELLOS).read_text(encoding="utf-8"))
+    assert "a.csv" not in sellos
+
+
+def test_archivo_local_alterado_se_vuelve_a_descargar(destino, espejo_artefactos):
+    descargas.preparar_artefactos(str(destino), ARTEFACTOS)
+    (destino / "b.csv").write_bytes(b"alterado")
+
+    resultados = {r.archivo: r for r in descargas.preparar_artefactos(str(destino), ARTEFACTOS)}
+
+    assert resultados["b.csv"].ok and resultados["b.csv"].descargado
+    assert (destino / "b.csv").read_bytes() == _contenido("b.csv")
+
+
+def test_sellos_evitan_recalcular_el_hash(destino, espejo_artefactos, monkeypatch):
+    descargas.preparar_artefactos(str(destino), ARTEFACTOS)
+    pedidos = len(espejo_artefactos.pedidos)
+
+    calculos = []
+    calcular = descargas.calcular_sha256
+    monkeypatch.setattr(descargas, "calcular_sha256", lambda path, *a: calculos.append(path) or calcular(path, *a))
+
+    resultados = descargas.preparar_artefactos(str(destino), ARTEFACTOS)
+    assert all(r.ok and not r.descargado for r in resultados)
+    assert all(r.mensaje == "sin cambios desde la última verificación" for r in resultados)
+    assert calculos == []
+    assert len(espejo_artefactos.pedidos) == pedidos
+
+    # Un archivo con otra fecha de modificación se vuelve a verificar (sin descargarlo)
+    stat = os.stat(destino / "c.csv")
+    os.utime(destino / "c.csv", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    resultados = {r.archivo: r for r in descargas.preparar_artefactos(str(destino), ARTEFACTOS)}
+    assert calculos == [os.path.join(str(destino), "c.csv")]
+    assert resultados["c.csv"].mensaje == "verificado con SHA-256"
+    assert len(espejo_artefactos.pedidos) == pedidos
@@ -0,0 +1,46 @@
+import hashlib
+import shutil
+
+import pytest
+
+pytest.importorskip("sklearn")
+pytest.importorskip("joblib")
+
+from servicios.entrenamiento import entrenar
+from servicios.registro_modelos import CATALOGO_MODELOS, MODELOS_DIR
+
+
+@pytest.fixture
+def directorio(tmp_path):
+    """Copia del modelo B publicado y del manifiesto (B predice mejor que su reentrenamiento)"""
+    shutil.copy(f"{MODELOS_DIR}/{CATALOGO_MODELOS['B']}.pkl", tmp_path)
+    shutil.copy(f"{MODELOS_DIR}/metadata.json", tmp_path)
+    return tmp_path
+
+
+def _sha(path):
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def test_reentrenado_peor_no_reemplaza_al_actual(directorio):
+    pkl = directorio / f"{CATALOGO_MODELOS['B']}.pkl"
+    antes = _sha(pkl)
+
+    resultado, = entrenar(["B"], procesos=1, directorio=str(directorio))
+
+    assert not resultado.reentrenado
+    assert resultado.metricas_actual["r2"] > resultado.metricas["r2"]
+    assert _sha(pkl) == antes
+    # La decisión queda registrada: con las mismas entradas no se vuelve a entrenar
+    resultado, = entrenar(["B"], procesos=1, directorio=str(directorio))
+    assert resultado.motivo == "entradas sin cambios"
+
+
+def test_aceptar_peores_reemplaza_al_actual(directorio):
+    pkl = directorio / f"{CATALOGO_MODELOS['B']}.pkl"
+    antes = _sha(pkl)
+
+    resultado, = entrenar(["B"], procesos=1, directorio=str(directorio), aceptar_peores=True)
+
+    assert resultado.reentrenado
+    assert _sha(pkl) != antes
@@ -0,0 +1,34 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from servicios.almacen_datos import DATASETS, nombre_dataset
+from servicios.esquema_datos import DECIMALES_VISIBLES, aplicar_esquema, conserva_decimales
+from servicios.lector_csv import leer_csv
+from servicios.registro_modelos import MODELOS_DIR
+
+
+@pytest.mark.parametrize("archivo", DATASETS)
+def test_tipos_compactos_conservan_los_decimales_del_csv(archivo):
+    original = leer_csv(os.path.join(MODELOS_DIR, archivo)).df
+    compacto = aplicar_esquema(nombre_dataset(archivo), original)
+
+    numericas = [c for c in original.columns if pd.api.types.is_numeric_dtype(original[c])]
+    assert numericas
+    for columna in numericas:
+        esperado = np.round(original[columna].to_numpy(dtype="float64"), DECIMALES_VISIBLES)
+        obtenido = np.round(compacto[columna].to_numpy(dtype="float64"), DECIMALES_VISIBLES)
+        assert np.array_equal(obtenido, esperado, equal_nan=True), columna
+
+
+def test_columna_que_pierde_decimales_queda_en_float64():
+    # float32 guarda 7864.1257 como 7864.12548828125
+    df = pd.DataFrame({"IPC - INDEC CoberNac": [7864.1257, 8353.3158], "Chica": [0.5, 1.25]})
+    assert not conserva_decimales(df["IPC - INDEC CoberNac"])
+
+    compacto = aplicar_esquema("sin_esquema", df)
+
+    assert compacto["IPC - INDEC CoberNac"].dtype == "float64"
+    assert compacto["Chica"].dtype == "float32"
@@ -0,0 +1,30 @@
+import os
+import pickle
+import warnings
+
+import numpy as np
+import pytest
+
+pytest.importorskip("sklearn")
+
+from servicios.motor_prediccion import MotorPrediccion
+from servicios.registro_modelos import CATALOGO_MODELOS, MODELOS_DIR
+
+
+def test_importar_el_motor_no_silencia_avisos_de_sklearn():
+    assert not any(getattr(f[1], "pattern", None) == "X does not have valid feature names" for f in warnings.filters)
+
+
+@pytest.mark.parametrize("modelo_id", ["A", "B", "D"])
+def test_camino_general_sin_aviso_de_nombres(modelo_id):
+    with open(os.path.join(MODELOS_DIR, f"{CATALOGO_MODELOS[modelo_id]}.pkl"), "rb") as f:
+        motor = MotorPrediccion.desde_modelo(modelo_id, pickle.load(f))
+    # Sin bosque compilado, coeficientes fusionados ni escalado propio: scaler y estimador de sklearn
+    motor.bosque = motor.coeficientes = motor._media = None
+    X = np.ones((3, len(motor.features)))
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", UserWarning)
+        predichos = motor.predecir_lote(X)
+
+    assert predichos.shape == (3,)